@@ -0,0 +1,80 @@
+"""Micro-benchmark: per-submission normalization vs. precompiled answer index.
+
+Run with ``python -m benchmarks.bench_answer_index``.
+"""
+
+import argparse
+import random
+import timeit
+
+from src.utils import (
+    build_answer_index,
+    fold_accents,
+    load_dictionary_from_file,
+    normalize_answer,
+    remove_accents,
+)
+
+
+def old_check(answers, player_answer):
+    """What submit_answer() used to do on every SUBMIT."""
+    player_answer = remove_accents(player_answer.lower().strip())
+    accepted_answers = [remove_accents(s.lower().strip()) for s in answers]
+    return player_answer in accepted_answers
+
+
+def new_check(answer_index, question, player_answer):
+    return normalize_answer(player_answer) in answer_index[question]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dictionary", default="fr-lexique_org-10percent_cutoff.json")
+    parser.add_argument("--submissions", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    spelling_dict = load_dictionary_from_file(args.dictionary)
+    build_s = min(timeit.repeat(lambda: build_answer_index(spelling_dict), number=1, repeat=3))
+    answer_index = build_answer_index(spelling_dict)
+
+    # Half right, half wrong answers, with the casing/whitespace players type.
+    rng = random.Random(args.seed)
+    questions = list(spelling_dict)
+    workload = []
+    for i in range(args.submissions):
+        question = rng.choice(questions)
+        if i % 2:
+            guess = rng.choice(spelling_dict[question])
+        else:
+            guess = rng.choice(spelling_dict[rng.choice(questions)])
+        workload.append((question, f" {guess.upper()} "))
+
+    def run_old():
+        for question, guess in workload:
+            old_check(spelling_dict[question], guess)
+
+    def run_new():
+        fold_accents.cache_clear()
+        for question, guess in workload:
+            new_check(answer_index, question, guess)
+
+    mismatches = sum(
+        old_check(spelling_dict[q], g) != new_check(answer_index, q, g) for q, g in workload
+    )
+
+    old_s = min(timeit.repeat(run_old, number=1, repeat=args.repeat))
+    new_s = min(timeit.repeat(run_new, number=1, repeat=args.repeat))
+    n = len(workload)
+
+    print(f"dictionary        {args.dictionary} ({len(spelling_dict)} questions)")
+    print(f"index build       {build_s * 1e3:8.1f} ms (once, at load)")
+    print(f"old per submit    {old_s / n * 1e6:8.2f} µs")
+    print(f"new per submit    {new_s / n * 1e6:8.2f} µs")
+    print(f"speedup           {old_s / new_s:8.1f}x")
+    print(f"mismatches        {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
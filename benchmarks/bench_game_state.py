@@ -0,0 +1,121 @@
+"""Micro-benchmarks of the GameState hot paths with many mock sockets.
+
+Run with ``python -m benchmarks.bench_game_state [--players 8 64 512] [-o out.json]``.
+
+Cases, each timed call by call under the game lock (as the servers do):
+
+* ``broadcast``      one state delta fanned out to every player;
+* ``start_turn``     draw a question and broadcast NEW_TURN;
+* ``submit_valid``   the active player answers right: Valid + next turn;
+* ``submit_invalid`` the active player answers wrong: one Invalid frame.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.report import summarize, write_results
+from src.config import AppConfig
+from src.dictionary import Dictionary
+from src.game_state import GameState
+from src.scheduler import Scheduler
+from src.utils import load_dictionary_from_file
+
+
+class CountingWS:
+    """Mock socket that only counts: the cost measured is the game's."""
+
+    __slots__ = ("frames", "bytes")
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    def send(self, frame):
+        self.frames += 1
+        self.bytes += len(frame)
+
+
+def make_game(dictionary, n_players, scheduler, seed):
+    game = GameState(dictionary, config=AppConfig(), scheduler=scheduler, rng=random.Random(seed))
+    sockets = [CountingWS() for _ in range(n_players)]
+    for i, ws in enumerate(sockets):
+        game.add_player(ws, f"bot{i}")
+    with game.lock:
+        game._start_game()
+    return game, sockets
+
+
+def timed(fn, iterations):
+    samples = []
+    clock = time.perf_counter
+    for _ in range(iterations):
+        t0 = clock()
+        fn()
+        samples.append(clock() - t0)
+    return samples
+
+
+def bench(dictionary, n_players, iterations, scheduler, seed):
+    game, sockets = make_game(dictionary, n_players, scheduler, seed)
+    results = {}
+
+    def broadcast():
+        with game.lock:
+            game._broadcast_state({"type": "VOTE", "id": 1})
+
+    def start_turn():
+        with game.lock:
+            game._start_turn()
+
+    def active_ws():
+        return game.player_order[game.current_turn % len(game.player_order)]
+
+    def submit_valid():
+        ws = active_ws()
+        game.submit_answer(ws, game.answers[0])
+
+    def submit_invalid():
+        game.submit_answer(active_ws(), "pas une réponse")
+
+    for name, fn in (
+        ("broadcast", broadcast),
+        ("start_turn", start_turn),
+        ("submit_valid", submit_valid),
+        ("submit_invalid", submit_invalid),
+    ):
+        frames_before = sum(ws.frames for ws in sockets)
+        samples = timed(fn, iterations)
+        frames = sum(ws.frames for ws in sockets) - frames_before
+        summary = summarize(samples)
+        summary["ops_per_s"] = round(len(samples) / sum(samples), 1)
+        summary["frames_per_op"] = round(frames / len(samples), 2)
+        results[f"{name}/{n_players}"] = summary
+
+    with game.lock:
+        game._end_game()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dictionary", default="fr-lexique_org-10percent_cutoff.json")
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 8, 64, 512])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    dictionary = Dictionary(load_dictionary_from_file(args.dictionary))
+    scheduler = Scheduler(name="bench-scheduler")  # fuses never fire within a run
+    results = {}
+    try:
+        for n_players in args.players:
+            results.update(bench(dictionary, n_players, args.iterations, scheduler, args.seed))
+    finally:
+        scheduler.stop()
+    write_results("game_state", results, params=vars(args), path=args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare two benchmark result files metric by metric.
+
+Run with ``python -m benchmarks.compare old.json new.json``.
+"""
+
+import argparse
+import json
+
+
+def flatten(results, prefix=""):
+    """{case: {metric: value}} → {"case.metric": value}, numbers only."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args(argv)
+
+    with open(args.old, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"{old['benchmark']}: {old['meta'].get('commit')} → {new['meta'].get('commit')}")
+    old_flat, new_flat = flatten(old["results"]), flatten(new["results"])
+    width = max((len(k) for k in old_flat.keys() | new_flat.keys()), default=10)
+    for key in sorted(old_flat.keys() | new_flat.keys()):
+        a, b = old_flat.get(key), new_flat.get(key)
+        if a is None or b is None:
+            print(f"{key:<{width}}  {a!s:>12}  {b!s:>12}")
+            continue
+        change = f"{(b - a) / a * 100:+7.1f}%" if a else ""
+        print(f"{key:<{width}}  {a:>12}  {b:>12}  {change}")
+
+
+if __name__ == "__main__":
+    main()
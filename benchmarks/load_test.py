@@ -0,0 +1,237 @@
+"""Load generator: hundreds of real WebSocket clients playing scripted games.
+
+Run against a server that is already up::
+
+    python -m benchmarks.load_test --url ws://127.0.0.1:8765/ws --rooms 100 --players 4
+
+or let it start one (``--spawn threaded`` runs ``src.app``, ``--spawn
+asyncio`` runs ``src.async_server``, both with src/config.json)::
+
+    python -m benchmarks.load_test --spawn threaded -o load.json
+
+Every room gets ``--players`` bots. They all vote to start, and the active
+bot answers right after ``--think-ms``, until the room has played
+``--turns`` turns. Reported, as JSON (see report.py):
+
+* ``turn_latency``  SUBMIT sent → next NEW_TURN received, at the submitter;
+* ``fanout``        first → last bot of a room receiving the same NEW_TURN;
+* ``connect``       WebSocket handshake time;
+* ``throughput``    frames received/sent per second over the whole run.
+
+Requires aiohttp (already a server dependency).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from benchmarks.report import summarize, write_results
+from src.utils import load_dictionary_from_file
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SERVER_MODULES = {"threaded": "src.app", "asyncio": "src.async_server"}
+
+
+class Stats:
+    def __init__(self):
+        self.connect = []
+        self.turn_latency = []
+        self.receipts = {}  # (room, seq) → [receive times]
+        self.received = 0
+        self.sent = 0
+        self.errors = 0
+
+
+class RoomScript:
+    """Shared by the bots of one room: how far the game went."""
+
+    def __init__(self, room_id, n_players, turns):
+        self.id = room_id
+        self.n_players = n_players
+        self.turns = turns
+        self.turns_played = 0
+        self.done = asyncio.Event()
+
+
+class Bot:
+    def __init__(self, name, room, stats, spellings, think_s, rng):
+        self.name = name
+        self.room = room
+        self.stats = stats
+        self.spellings = spellings
+        self.think_s = think_s
+        self.rng = rng
+        self.my_id = None
+        self.players = 0
+        self.voted = False
+        self.submitted_at = None
+
+    async def run(self, session, url, connect_gate):
+        async with connect_gate:
+            t0 = time.perf_counter()
+            try:
+                ws = await session.ws_connect(url, max_msg_size=0)
+            except (aiohttp.ClientError, OSError):
+                self.stats.errors += 1
+                return
+            self.stats.connect.append(time.perf_counter() - t0)
+
+        async with ws:
+            await self.send(ws, {"type": "JOIN", "room": self.room.id, "name": self.name})
+            reader = asyncio.ensure_future(self.read(ws))
+            done = asyncio.ensure_future(self.room.done.wait())
+            await asyncio.wait({reader, done}, return_when=asyncio.FIRST_COMPLETED)
+            reader.cancel()
+            done.cancel()
+
+    async def send(self, ws, message):
+        self.stats.sent += 1
+        await ws.send_str(json.dumps(message))
+
+    async def read(self, ws):
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                break
+            now = time.perf_counter()
+            self.stats.received += 1
+            data = json.loads(msg.data)
+            kind = data.get("type")
+
+            if kind == "PING":
+                await self.send(ws, {"type": "PONG"})  # or the heartbeat reaper drops us
+            elif kind == "SNAPSHOT":
+                self.my_id = data["you"]
+                self.players = len(data["players"])
+            elif kind == "PLAYER_JOINED":
+                self.players += 1
+            elif kind == "PLAYER_LEFT":
+                self.players -= 1
+            elif kind == "NEW_TURN":
+                await self.on_new_turn(ws, data, now)
+            elif kind == "GAME_OVER":
+                self.room.done.set()
+
+            if not self.voted and self.players >= self.room.n_players:
+                self.voted = True
+                await self.send(ws, {"type": "VOTE_START"})
+
+    async def on_new_turn(self, ws, data, now):
+        self.stats.receipts.setdefault((self.room.id, data["seq"]), []).append(now)
+        if self.submitted_at is not None:
+            self.stats.turn_latency.append(now - self.submitted_at)
+            self.submitted_at = None
+            self.room.turns_played += 1
+            if self.room.turns_played >= self.room.turns:
+                self.room.done.set()
+                return
+        if data["activePlayer"] == self.my_id:
+            await asyncio.sleep(self.think_s * self.rng.uniform(0.5, 1.5))
+            answer = self.rng.choice(self.spellings[data["question"]])
+            self.submitted_at = time.perf_counter()
+            await self.send(ws, {"type": "SUBMIT", "answer": answer})
+
+
+# ── Server process ────────────────────────────────────────────────
+
+def spawn_server(mode, url, timeout=60.0):
+    parsed = urlparse(url)
+    server = subprocess.Popen(
+        [sys.executable, "-m", _SERVER_MODULES[mode]],
+        cwd=_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"{_SERVER_MODULES[mode]} exited with code {server.returncode}")
+        try:
+            with socket.create_connection((parsed.hostname, parsed.port), timeout=1.0):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"server did not listen on {parsed.hostname}:{parsed.port}")
+
+
+# ── Main ──────────────────────────────────────────────────────────
+
+async def run_load(args, spellings):
+    stats = Stats()
+    run_id = f"{os.getpid():x}{int(time.time()) % 10000}"
+    rooms = [RoomScript(f"load-{run_id}-{i}", args.players, args.turns) for i in range(args.rooms)]
+    rng = random.Random(args.seed)
+    bots = [
+        Bot(f"bot{r}-{p}", room, stats, spellings, args.think_ms / 1000, random.Random(rng.random()))
+        for r, room in enumerate(rooms)
+        for p in range(args.players)
+    ]
+
+    connect_gate = asyncio.Semaphore(args.connect_concurrency)
+    timeout = aiohttp.ClientTimeout(total=None)
+    t0 = time.perf_counter()
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        tasks = [asyncio.ensure_future(bot.run(session, args.url, connect_gate)) for bot in bots]
+        _, pending = await asyncio.wait(tasks, timeout=args.timeout)
+        for task in pending:
+            task.cancel()
+    duration = time.perf_counter() - t0
+
+    fanout = [
+        max(times) - min(times) for times in stats.receipts.values() if len(times) == args.players
+    ]
+    return {
+        "turn_latency": summarize(stats.turn_latency),
+        "fanout": summarize(fanout),
+        "connect": summarize(stats.connect),
+        "throughput": {
+            "duration_s": round(duration, 3),
+            "clients": len(bots),
+            "connect_errors": stats.errors,
+            "rooms_finished": sum(room.turns_played >= args.turns for room in rooms),
+            "turns": sum(room.turns_played for room in rooms),
+            "frames_received": stats.received,
+            "frames_sent": stats.sent,
+            "received_per_s": round(stats.received / duration, 1),
+            "sent_per_s": round(stats.sent / duration, 1),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://127.0.0.1:8765/ws")
+    parser.add_argument("--spawn", choices=sorted(_SERVER_MODULES), help="start this server first")
+    parser.add_argument("--dictionary", default="fr-lexique_org-10percent_cutoff.json")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--players", type=int, default=4, help="bots per room")
+    parser.add_argument("--turns", type=int, default=20, help="turns per room")
+    parser.add_argument("--think-ms", type=float, default=100.0, help="mean delay before answering")
+    parser.add_argument("--connect-concurrency", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=300.0, help="give up after this many seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    spellings = load_dictionary_from_file(args.dictionary)
+    server = spawn_server(args.spawn, args.url) if args.spawn else None
+    try:
+        results = asyncio.run(run_load(args, spellings))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    write_results("load_test", results, params=vars(args), path=args.output)
+
+
+if __name__ == "__main__":
+    main()
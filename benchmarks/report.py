@@ -0,0 +1,67 @@
+"""Shared helpers for the benchmarks: latency summaries and JSON result files.
+
+Every benchmark writes the same document shape, so two runs (say, two
+releases) can be compared with ``python -m benchmarks.compare old.json new.json``::
+
+    {"benchmark": name, "meta": {commit, python, ...}, "params": {...},
+     "results": {case: {metric: number}}}
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+
+
+def percentile(sorted_samples, q):
+    """Nearest-rank percentile of an already sorted list (q in 0..100)."""
+    if not sorted_samples:
+        return None
+    rank = max(0, min(len(sorted_samples) - 1, round(q / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+def summarize(samples):
+    """Latency summary in microseconds of a list of durations in seconds."""
+    samples = sorted(samples)
+    n = len(samples)
+    if n == 0:
+        return {"n": 0}
+
+    def us(value):
+        return round(value * 1e6, 2)
+
+    return {
+        "n": n,
+        "mean_us": us(sum(samples) / n),
+        "p50_us": us(percentile(samples, 50)),
+        "p99_us": us(percentile(samples, 99)),
+        "max_us": us(samples[-1]),
+    }
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(name, results, params=None, path=None):
+    """Print the result document, and write it to path if given."""
+    document = {"benchmark": name, "meta": metadata(), "params": params or {}, "results": results}
+    text = json.dumps(document, indent=2, ensure_ascii=False)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return document
@@ -0,0 +1,36 @@
+"""Admin endpoints, shared by both servers.
+
+Disabled unless ``admin_token`` is set in config.json; requests must send
+``Authorization: Bearer <admin_token>``.
+
+    POST /admin/reload-dictionary   reload config.json's dictionary_file
+    GET  /admin/dictionary          version and reload state
+    GET  /admin/dictionaries        loaded dictionaries: rooms, footprint, load time
+"""
+
+import hmac
+
+from src.config import load_config
+
+
+def authorized(config, authorization):
+    if not config.admin_token:
+        return False
+    scheme, _, token = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(token.strip(), config.admin_token)
+
+
+def reload_dictionary(rooms):
+    """(status, body): 202 while the new version loads, 409 if a reload is not possible yet."""
+    filename = load_config().dictionary_file  # re-read: that is the point of reloading
+    if not rooms.reload_dictionary(filename):
+        return 409, {"status": "busy", **rooms.dictionary.status()}
+    return 202, {"status": "loading", "file": filename, **rooms.dictionary.status()}
+
+
+def dictionary_status(rooms):
+    return 200, rooms.dictionary.status()
+
+
+def dictionaries(rooms):
+    return 200, {"dictionaries": rooms.dictionary_stats()}
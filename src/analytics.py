@@ -0,0 +1,193 @@
+"""Gameplay event log and per-question difficulty scores.
+
+With ``analytics_file`` set, every GameState records what happens in its
+games: turn started, answer valid or invalid, pass, explosion, game over,
+with the seconds since the turn started. Recording appends a tuple to a
+deque: no lock and no I/O under the game lock. A writer thread drains the
+deque every ``analytics_flush_seconds`` and inserts the batch into an
+append-only SQLite table in WAL mode, in one transaction. If the writer
+falls behind by more than ``analytics_buffer_events``, the oldest events
+are dropped rather than slowing games down.
+
+Offline, ``python -m src.analytics`` (``make difficulty``) turns the log
+into a score per question (IPA key) in ``<dictionary>.difficulty.json``,
+next to the dictionary. The question bands (sampler.py) then rank
+questions by how often players actually failed them.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from collections import deque
+
+from src.config import load_config
+from src.dictionary import difficulty_path_for
+from src.utils import data_path
+
+TURN = "turn"
+VALID = "valid"
+INVALID = "invalid"
+PASS = "pass"
+EXPLODE = "explode"
+GAME_OVER = "game_over"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,        -- unix time
+    game TEXT NOT NULL,      -- one id per game played
+    kind TEXT NOT NULL,
+    question TEXT,           -- IPA key
+    player INTEGER,
+    seconds REAL,            -- since the turn started (game_over: since the game started)
+    detail TEXT              -- invalid: near-miss reason; explode: "eliminated"
+);
+CREATE INDEX IF NOT EXISTS events_question ON events (question, kind);
+"""
+_INSERT = "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+def connect(path):
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")  # WAL: a crash loses the last batch at most
+    db.executescript(_SCHEMA)
+    return db
+
+
+class AnalyticsLog:
+    """Buffer of events shared by every game, written in batches by one thread."""
+
+    def __init__(self, path, flush_seconds=1.0, buffer_events=100_000):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.buffer = deque(maxlen=buffer_events)  # append/popleft are atomic: no lock
+        self.written = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, game, kind, question=None, player=None, seconds=None, detail=None):
+        """Called by GameState under its lock: one deque append."""
+        self.buffer.append((time.time(), game, kind, question, player, seconds, detail))
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)  # the servers never call RoomManager.stop()
+
+    def stop(self):
+        """Write what is buffered and stop the writer."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    # ── Internal ──────────────────────────────────────────────────
+
+    def _run(self):
+        db = connect(self.path)
+        try:
+            while not self._stop.wait(self.flush_seconds):
+                self._flush(db)
+            self._flush(db)
+        finally:
+            db.close()
+
+    def _flush(self, db):
+        buffer = self.buffer
+        batch = []
+        try:
+            while True:
+                batch.append(buffer.popleft())
+        except IndexError:
+            pass
+        if not batch:
+            return
+        try:
+            with db:
+                db.executemany(_INSERT, batch)
+            self.written += len(batch)
+        except sqlite3.Error:
+            print(traceback.format_exc())
+
+
+# ── Difficulty scores ─────────────────────────────────────────────
+
+def question_stats(db):
+    """{question: {"turns", "solved", "failed", "invalid", "solveSeconds"}} from the log."""
+    rows = db.execute(
+        """
+        SELECT question,
+               SUM(kind = 'turn'),
+               SUM(kind = 'valid'),
+               SUM(kind IN ('explode', 'pass')),
+               SUM(kind = 'invalid'),
+               AVG(CASE WHEN kind = 'valid' THEN seconds END)
+        FROM events
+        WHERE question IS NOT NULL
+        GROUP BY question
+        """
+    )
+    return {
+        question: {
+            "turns": turns,
+            "solved": solved,
+            "failed": failed,
+            "invalid": invalid,
+            "solveSeconds": solve_seconds,
+        }
+        for question, turns, solved, failed, invalid, solve_seconds in rows
+        if turns
+    }
+
+
+def difficulty_scores(stats, prior_turns=5.0):
+    """Share of turns failed per question, in 0..1.
+
+    Smoothed towards the overall failure rate by ``prior_turns`` imaginary
+    turns, so that a question seen twice doesn't rank as the hardest.
+    """
+    turns = sum(s["turns"] for s in stats.values())
+    if not turns:
+        return {}
+    overall = sum(s["failed"] for s in stats.values()) / turns
+    return {
+        question: round((s["failed"] + prior_turns * overall) / (s["turns"] + prior_turns), 4)
+        for question, s in stats.items()
+    }
+
+
+def main(argv=None):
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Per-question difficulty scores from the analytics log")
+    parser.add_argument("--db", default=config.analytics_file or None, help="analytics log (analytics_file)")
+    parser.add_argument("--dictionary", default=config.dictionary_file, help="file in src/data")
+    parser.add_argument("--prior-turns", type=float, default=5.0)
+    parser.add_argument("-o", "--output", help="default: <dictionary>.difficulty.json next to it")
+    args = parser.parse_args(argv)
+    if not args.db or not os.path.exists(args.db):
+        parser.error("no analytics log: set analytics_file in config.json, or pass --db")
+
+    db = sqlite3.connect(args.db)
+    try:
+        stats = question_stats(db)
+    finally:
+        db.close()
+    scores = difficulty_scores(stats, args.prior_turns)
+    output = args.output or difficulty_path_for(data_path(args.dictionary))
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(scores, f, ensure_ascii=False, indent=0)
+    turns = sum(s["turns"] for s in stats.values())
+    print(f"Wrote {output}: {len(scores)} questions, {turns} turns")
+
+
+if __name__ == "__main__":
+    main()
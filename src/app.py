@@ -1,15 +1,19 @@
-"""BombParty server — Flask + flask-sock, threaded."""
+"""BombParty server — Flask + flask-sock, threaded (or asyncio, see server_mode)."""
 
 import traceback
-import json
 import os
+import socket
 
-from flask import Flask, render_template
+from flask import Flask, Response, abort, jsonify, render_template, request
 from flask_sock import Sock
 
+from src import admin, metrics
+from src.assets import Assets
 from src.config import load_config
-from src.game_state import GameState
-from src.utils import load_dictionary_from_file
+from src.dictionary_registry import DictionaryRegistry
+from src.outbound import ThreadedOutbound
+from src.protocol import Session
+from src.rooms import RoomManager
 
 
 # ── App setup ─────────────────────────────────────────────────────
@@ -22,56 +26,99 @@ app = Flask(
     static_folder=os.path.join(_base, "static"),
     template_folder=os.path.join(_base, "templates"),
 )
+# Bigger frames close the connection before they are buffered (see inbound.py)
+app.config["SOCK_SERVER_OPTIONS"] = {"max_message_size": config.inbound_max_frame_bytes}
 sock = Sock(app)
+assets = Assets()
 
-dictionary = load_dictionary_from_file(config.dictionary_file)
-game = GameState(dictionary, config=config)
+# Only the rooms hold the dictionaries, so a reloaded or evicted one can be freed
+rooms = RoomManager(DictionaryRegistry(config), config=config)
+rooms.start()
+metrics.track(rooms)
+metrics.REGISTRY.schedule_expiry(rooms.scheduler, config.metrics_idle_seconds)
 
 
 # ── Routes ────────────────────────────────────────────────────────
 
 @app.route("/")
 def index():
-    return render_template("index.html")
+    return render_template("index.html", assets=assets.urls())
+
+
+@app.route("/assets/<name>")
+def asset(name):
+    found = assets.response(
+        name, request.headers.get("Accept-Encoding", ""), request.headers.get("If-None-Match", "")
+    )
+    if found is None:
+        abort(404)
+    status, body, headers = found
+    return Response(body, status=status, headers=headers)
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
 
 
 @sock.route("/ws")
 def websocket(ws):
+    conn = ThreadedOutbound(ws, config)
+    session = Session(conn, rooms, config)
+    rooms.heartbeat.watch(session, lambda: _drop(ws))
+    metrics.connection_opened()
     try:
         while True:
             data = ws.receive()
-            if not data:
+            if not data or not session.handle_message(data):
                 break
 
-            msg = json.loads(data)
-            msg_type = msg.get("type")
+    except Exception:
+        # print(f"WS error: {e}")
+        print(traceback.format_exc())
+    finally:
+        rooms.heartbeat.forget(session)
+        session.close()
+        conn.close()
+        metrics.connection_closed()
+
 
-            if msg_type == "JOIN":
-                game.add_player(ws, msg.get("name", "Anonyme"))
+def _drop(ws):
+    """Heartbeat timeout: shut the TCP socket so that ws.receive() above gives up."""
+    try:
+        ws.sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
 
-            elif msg_type == "SUBMIT":
-                answer = msg.get("answer")
-                if answer:
-                    game.submit_answer(ws, answer)
 
-            elif msg_type == "PASS":
-                game.pass_turn(ws)
+@app.route("/admin/reload-dictionary", methods=["POST"])
+def admin_reload_dictionary():
+    return _admin(admin.reload_dictionary)
 
-            elif msg_type == "TYPING":
-                text = msg.get("text", "")
-                game.broadcast_typing(ws, text)
 
-            elif msg_type == "VOTE_START":
-                game.vote_start(ws)
+@app.route("/admin/dictionary")
+def admin_dictionary():
+    return _admin(admin.dictionary_status)
 
-    except Exception:
-        # print(f"WS error: {e}")
-        print(traceback.format_exc())
-    finally:
-        game.remove_player(ws)
+
+@app.route("/admin/dictionaries")
+def admin_dictionaries():
+    return _admin(admin.dictionaries)
+
+
+def _admin(handler):
+    if not admin.authorized(config, request.headers.get("Authorization")):
+        abort(403)
+    status, body = handler(rooms)
+    return jsonify(body), status
 
 
 # ── Entry point ───────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    app.run(host=config.host, port=config.port, threaded=True)
+    if config.server_mode == "asyncio":
+        from src.async_server import serve
+
+        serve(config, rooms)
+    else:
+        app.run(host=config.host, port=config.port, threaded=True)
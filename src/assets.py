@@ -0,0 +1,85 @@
+"""Serving the prebuilt frontend (build_frontend.py), for both servers.
+
+The bundle is small, so every file and its precompressed variants are read
+into memory at startup. Each response picks the best variant the client
+accepts and can be cached forever: the file name changes with its content.
+"""
+
+import json
+import logging
+import mimetypes
+import os
+
+from src.build_frontend import DIST_DIR, MANIFEST
+
+URL_PREFIX = "/assets/"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))  # by preference
+
+log = logging.getLogger(__name__)
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class Assets:
+    """The build in dist_dir; empty (urls() is None) when there is none."""
+
+    def __init__(self, dist_dir=DIST_DIR):
+        self.manifest = {}
+        self.files = {}  # (file name, encoding or None) → bytes
+        try:
+            with open(os.path.join(dist_dir, MANIFEST), "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            log.warning("No frontend build in %s: the page will only say so, run `make frontend`", dist_dir)
+            return
+        for hashed in self.manifest.values():
+            with open(os.path.join(dist_dir, hashed), "rb") as f:
+                self.files[hashed, None] = f.read()
+            for encoding, suffix in ENCODINGS:
+                path = os.path.join(dist_dir, hashed + suffix)
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        self.files[hashed, encoding] = f.read()
+
+    def urls(self):
+        """{"app.js": "/assets/app.<hash>.js", ...} for index.html, or None without a build."""
+        if not self.manifest:
+            return None
+        return {name: URL_PREFIX + hashed for name, hashed in self.manifest.items()}
+
+    def response(self, name, accept_encoding="", if_none_match=""):
+        """(status, body, headers) for GET /assets/<name>, or None if there is no such file."""
+        if (name, None) not in self.files:
+            return None
+        accepted = accepted_encodings(accept_encoding)
+        encoding = next(
+            (enc for enc, _ in ENCODINGS if enc in accepted and (name, enc) in self.files), None
+        )
+        etag = f'"{name}.{encoding}"' if encoding else f'"{name}"'
+        headers = {
+            "Content-Type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "Cache-Control": CACHE_CONTROL,
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        if etag in (tag.strip() for tag in (if_none_match or "").split(",")):
+            return 304, b"", headers
+        return 200, self.files[name, encoding], headers
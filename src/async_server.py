@@ -0,0 +1,162 @@
+"""BombParty server — aiohttp, one asyncio event loop for every socket.
+
+Alternative to the threaded Flask server (``server_mode: "asyncio"`` in
+config.json, or ``python -m src.async_server``). It speaks the same /ws
+protocol through protocol.Session and serves the same page and static files,
+but a connected player costs a coroutine instead of an OS thread.
+
+Requires aiohttp.
+"""
+
+import asyncio
+import os
+import traceback
+
+from aiohttp import WSMsgType, web
+from jinja2 import Environment, FileSystemLoader
+
+from src import admin, metrics
+from src.assets import Assets
+from src.config import AppConfig, load_config
+from src.dictionary_registry import DictionaryRegistry
+from src.outbound import OutboundQueue
+from src.protocol import Session
+from src.rooms import RoomManager
+
+_base = os.path.dirname(os.path.abspath(__file__))
+
+
+class AsyncOutbound(OutboundQueue):
+    """Outbound queue drained by a writer coroutine on the event loop.
+
+    Game logic runs on the loop, but timer callbacks run on their own
+    threads, so waking the writer always goes through the loop.
+    """
+
+    def __init__(self, ws: web.WebSocketResponse, loop: asyncio.AbstractEventLoop, config: AppConfig):
+        super().__init__(config)
+        self._ws = ws
+        self._loop = loop
+        self._ready = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        self._task = self._loop.create_task(self._writer())
+        return self._task
+
+    def close(self):
+        super().close()
+        # A writer stuck on a slow client's socket would never see the flag.
+        if self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    def _wake(self):
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def _writer(self):
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                for frame in self.take_all():
+                    await self._ws.send_str(frame)
+        except (ConnectionError, RuntimeError, asyncio.CancelledError):
+            self.closed = True
+        # Also reached when the queue was closed for overflow: hang up.
+        await self._ws.close()
+
+
+def create_app(config: AppConfig, rooms: RoomManager) -> web.Application:
+    templates = Environment(loader=FileSystemLoader(os.path.join(_base, "templates")))
+    assets = Assets()
+
+    async def index(request):
+        html = templates.get_template("index.html").render(assets=assets.urls())
+        return web.Response(text=html, content_type="text/html")
+
+    async def asset(request):
+        found = assets.response(
+            request.match_info["name"],
+            request.headers.get("Accept-Encoding", ""),
+            request.headers.get("If-None-Match", ""),
+        )
+        if found is None:
+            raise web.HTTPNotFound()
+        status, body, headers = found
+        return web.Response(body=body, status=status, headers=headers)
+
+    async def metrics_endpoint(request):
+        return web.Response(
+            text=metrics.REGISTRY.render(), headers={"Content-Type": metrics.CONTENT_TYPE}
+        )
+
+    def admin_route(handler):
+        async def route(request):
+            if not admin.authorized(config, request.headers.get("Authorization")):
+                raise web.HTTPForbidden()
+            status, body = handler(rooms)
+            return web.json_response(body, status=status)
+
+        return route
+
+    async def websocket(request):
+        # Bigger frames close the connection before they are buffered (see inbound.py)
+        ws = web.WebSocketResponse(max_msg_size=config.inbound_max_frame_bytes)
+        await ws.prepare(request)
+
+        loop = asyncio.get_running_loop()
+        conn = AsyncOutbound(ws, loop, config)
+        writer = conn.start()
+        session = Session(conn, rooms, config)
+        # Heartbeat timeout (scheduler thread): abort the transport, which ends the loop below
+        transport = request.transport
+        rooms.heartbeat.watch(session, lambda: loop.call_soon_threadsafe(transport.abort))
+        metrics.connection_opened()
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    break
+                if session.may_block(msg.data):
+                    # Awaited: this client's next frames wait for it, the others don't
+                    keep = await loop.run_in_executor(None, session.handle_message, msg.data)
+                else:
+                    keep = session.handle_message(msg.data)
+                if not keep:
+                    break
+        except Exception:
+            print(traceback.format_exc())
+        finally:
+            rooms.heartbeat.forget(session)
+            session.close()
+            conn.close()
+            metrics.connection_closed()
+            await writer
+            await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", index)
+    app.router.add_get("/ws", websocket)
+    app.router.add_get("/metrics", metrics_endpoint)
+    app.router.add_get("/assets/{name}", asset)
+    app.router.add_post("/admin/reload-dictionary", admin_route(admin.reload_dictionary))
+    app.router.add_get("/admin/dictionary", admin_route(admin.dictionary_status))
+    app.router.add_get("/admin/dictionaries", admin_route(admin.dictionaries))
+    app.router.add_static("/static", os.path.join(_base, "static"))
+    return app
+
+
+def serve(config: AppConfig, rooms: RoomManager, sockets=None):
+    """Run the server until interrupted; on ``sockets`` (bound, listening) instead of host:port if given."""
+    rooms.start()
+    metrics.track(rooms)
+    metrics.REGISTRY.schedule_expiry(rooms.scheduler, config.metrics_idle_seconds)
+    if sockets:
+        web.run_app(create_app(config, rooms), sock=sockets)
+    else:
+        web.run_app(create_app(config, rooms), host=config.host, port=config.port)
+
+
+if __name__ == "__main__":
+    config = load_config()
+    serve(config, RoomManager(DictionaryRegistry(config), config=config))
@@ -0,0 +1,123 @@
+"""Build the production frontend: ``make frontend`` (``python -m src.build_frontend``).
+
+The servers need it: static/app.js is JSX, and without a build
+templates/index.html only says that it is missing. The build writes to
+static/dist/:
+
+    app.<hash>.js      the vendored React and ReactDOM UMD builds
+                       (static/vendor/) followed by app.js, with its JSX
+                       transpiled by esbuild and minified
+    styles.<hash>.css  static/styles.css
+    *.gz, *.br         precompressed variants of each, served by assets.py
+    manifest.json      {"app.js": "app.<hash>.js", ...}, read by the servers
+
+File names change with their content, so browsers can cache them forever.
+Needs requirements-build.txt; brotli is optional (no .br files without it).
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+_base = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(_base, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST = "manifest.json"
+
+REACT_VERSION = "18.3.1"
+VENDOR_SCRIPTS = (
+    f"vendor/react-{REACT_VERSION}.production.min.js",
+    f"vendor/react-dom-{REACT_VERSION}.production.min.js",
+)
+
+
+def content_name(name, data):
+    """app.js + data → app.<first 12 hex digits of sha256>.js"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def compile_app(source):
+    """JSX → minified plain JS."""
+    import esbuild_py
+    import rjsmin
+
+    js = esbuild_py.transform(source)
+    if not js:
+        # esbuild_py returns an empty string instead of raising
+        raise ValueError("esbuild could not transpile app.js (syntax error?)")
+    return rjsmin.jsmin(js)
+
+
+def bundle_app(static_dir=STATIC_DIR):
+    parts = []
+    for script in VENDOR_SCRIPTS:
+        with open(os.path.join(static_dir, script), "r", encoding="utf-8") as f:
+            parts.append(f.read().strip())
+    with open(os.path.join(static_dir, "app.js"), "r", encoding="utf-8") as f:
+        parts.append(compile_app(f.read()))
+    return ";\n".join(parts).encode("utf-8") + b"\n"
+
+
+def _compressed(data):
+    """{suffix: bytes} of the precompressed variants."""
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        return variants
+    variants[".br"] = brotli.compress(data, quality=11)
+    return variants
+
+
+def build(static_dir=STATIC_DIR, out_dir=None):
+    """Write the bundle, its variants and the manifest; returns the manifest."""
+    out_dir = out_dir or os.path.join(static_dir, "dist")
+    with open(os.path.join(static_dir, "styles.css"), "rb") as f:
+        outputs = {"app.js": bundle_app(static_dir), "styles.css": f.read()}
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+    written = {MANIFEST}
+    for name, data in outputs.items():
+        hashed = content_name(name, data)
+        manifest[name] = hashed
+        files = {hashed: data}
+        files.update({hashed + suffix: body for suffix, body in _compressed(data).items()})
+        for filename, body in files.items():
+            with open(os.path.join(out_dir, filename), "wb") as f:
+                f.write(body)
+        written.update(files)
+
+    tmp_path = os.path.join(out_dir, MANIFEST + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST))
+
+    # Earlier builds
+    for filename in os.listdir(out_dir):
+        if filename not in written:
+            os.remove(os.path.join(out_dir, filename))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the precompressed frontend bundle")
+    parser.add_argument("-o", "--output", help=f"output directory (default: {DIST_DIR})")
+    args = parser.parse_args(argv)
+
+    out_dir = args.output or DIST_DIR
+    manifest = build(out_dir=out_dir)
+    for name, hashed in manifest.items():
+        sizes = [
+            f"{suffix or 'raw'} {os.path.getsize(os.path.join(out_dir, hashed + suffix)) / 1024:.0f} KiB"
+            for suffix in ("", ".gz", ".br")
+            if os.path.exists(os.path.join(out_dir, hashed + suffix))
+        ]
+        print(f"{name} → {hashed} ({', '.join(sizes)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Build the spelling dictionary from the Lexique4 TSV.
+
+Replaces the ``Lexique400/process_lexique.ipynb`` notebook::
+
+    python -m src.build_lexique Lexique400/Lexique4.tsv --threshold 0.1
+
+The TSV is read in chunks (only the three columns we need). A pronunciation
+becomes a question when at least one of its words has ``10_FreqMot`` above
+the threshold; its answers are every distinct spelling with that
+pronunciation, as in the notebook. Writes the JSON dictionary, its
+compiled ``.ptbd`` twin, a ``.freq.json`` sidecar (summed word frequency
+per pronunciation, for the question sampler) and the ``.near`` near-miss
+index, and skips the whole build when neither the TSV
+content nor the parameters changed since the last run.
+
+Requires pandas (``pip install pandas``), which the server itself does not.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from src.dictionary import compile_dictionary, compiled_path_for, frequencies_path_for
+from src.near_miss import near_miss_path_for, write_near_miss_index
+
+BUILD_VERSION = 3
+
+COL_WORD = "1_Mot"
+COL_IPA = "3_Phono_IPA"
+COL_FREQ = "10_FreqMot"
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TSV = os.path.join(_root, "Lexique400", "Lexique4.tsv")
+DEFAULT_OUTPUT = os.path.join(_root, "src", "data", "fr-lexique_org-10percent_cutoff.json")
+
+
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+def stamp_path_for(output):
+    return os.path.splitext(output)[0] + ".build.json"
+
+
+def build_spelling_dict(tsv_path, threshold, chunksize=50_000):
+    """Return ({ipa: [distinct spellings]}, {ipa: frequency}) for pronunciations above threshold.
+
+    The frequency of a pronunciation is the sum of ``10_FreqMot`` over its
+    distinct spellings.
+    """
+    import pandas as pd
+
+    frequent_keys = set()
+    # {ipa: {spelling: frequency}} in file order, folded in chunk by chunk
+    # so that the TSV is never held whole. Homographs share their word frequency.
+    spellings = {}
+    reader = pd.read_csv(
+        tsv_path,
+        sep="\t",
+        usecols=[COL_WORD, COL_IPA, COL_FREQ],
+        dtype={COL_WORD: "string", COL_IPA: "string"},
+        keep_default_na=False,
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunk = chunk[(chunk[COL_WORD] != "") & (chunk[COL_IPA] != "")]
+        freq = pd.to_numeric(chunk[COL_FREQ], errors="coerce").fillna(0.0)
+        frequent_keys.update(chunk.loc[freq > threshold, COL_IPA].unique())
+        pairs = chunk[[COL_IPA, COL_WORD]].assign(**{COL_FREQ: freq})
+        pairs = pairs.groupby([COL_IPA, COL_WORD], sort=False)[COL_FREQ].max()
+        for (ipa, word), f in pairs.items():
+            words = spellings.setdefault(str(ipa), {})
+            word = str(word)
+            words[word] = max(float(f), words.get(word, 0.0))
+
+    spelling_dict = {ipa: list(words) for ipa, words in spellings.items() if ipa in frequent_keys}
+    frequencies = {ipa: round(sum(spellings[ipa].values()), 4) for ipa in spelling_dict}
+    return spelling_dict, frequencies
+
+
+def build(tsv_path, output, threshold, force=False):
+    """Build output (+ .ptbd, .freq.json, .near) from tsv_path. Returns None when up to date."""
+    compiled = compiled_path_for(output)
+    frequencies_path = frequencies_path_for(output)
+    near_miss_path = near_miss_path_for(output)
+    stamp_path = stamp_path_for(output)
+    stamp = {
+        "builder": BUILD_VERSION,
+        "tsv_sha256": file_sha256(tsv_path),
+        "threshold": threshold,
+    }
+
+    if not force and all(
+        os.path.exists(p) for p in (output, compiled, frequencies_path, near_miss_path)
+    ):
+        try:
+            with open(stamp_path, "r", encoding="utf-8") as f:
+                if json.load(f) == stamp:
+                    return None
+        except (FileNotFoundError, ValueError):
+            pass
+
+    spelling_dict, frequencies = build_spelling_dict(tsv_path, threshold)
+
+    for path, data in ((output, spelling_dict), (frequencies_path, frequencies)):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    compile_dictionary(spelling_dict, compiled)
+    write_near_miss_index(spelling_dict, near_miss_path)
+
+    with open(stamp_path, "w", encoding="utf-8") as f:
+        json.dump(stamp, f, indent=2)
+    return spelling_dict
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the spelling dictionary from Lexique4")
+    parser.add_argument("tsv", nargs="?", default=DEFAULT_TSV, help="Lexique4 TSV file")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="JSON dictionary to write")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=0.1, help="minimum 10_FreqMot of a question"
+    )
+    parser.add_argument("-f", "--force", action="store_true", help="rebuild even if up to date")
+    args = parser.parse_args(argv)
+
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        sys.exit("build_lexique requires pandas: pip install pandas")
+
+    t0 = time.perf_counter()
+    spelling_dict = build(args.tsv, args.output, args.threshold, force=args.force)
+    if spelling_dict is None:
+        print(f"{args.output} is up to date")
+        return
+
+    n_spellings = sum(len(v) for v in spelling_dict.values())
+    print(
+        f"Wrote {args.output} and {compiled_path_for(args.output)}: "
+        f"{len(spelling_dict)} keys, {n_spellings} spellings in {time.perf_counter() - t0:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
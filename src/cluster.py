@@ -0,0 +1,179 @@
+"""Multi-process launcher: ``python -m src.cluster`` (``make run-cluster``).
+
+One server process is bound by the GIL; this runs ``workers`` of them
+(config.json, or -w) so that games use every core. Rooms are partitioned
+by a hash of their id: each room lives on exactly one worker. Worker i
+listens on its own port (port + 1 + i) and, with every other worker, on
+the public port through SO_REUSEPORT. A worker that gets a JOIN or RESUME
+for a room it does not own answers REDIRECT with the owner's port; the
+client reconnects there and sends it again.
+
+The lobby is global: every second each worker publishes its room list to
+a dict served by the launcher's multiprocessing manager and reads the
+others' back, so LIST_ROOMS never waits on another process.
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import zlib
+from multiprocessing.managers import SyncManager
+
+from src.config import AppConfig, load_config
+
+PUBLISH_INTERVAL_SECONDS = 1.0
+
+
+def room_owner(room_id, workers):
+    """Index of the worker that hosts room_id (stable across processes, unlike hash())."""
+    return zlib.crc32(room_id.encode("utf-8")) % workers
+
+
+def worker_port(config: AppConfig, index):
+    return config.port + 1 + index
+
+
+class ClusterWorker:
+    """One worker's view of the cluster, set as RoomManager.cluster."""
+
+    def __init__(self, index, workers, config: AppConfig, directory):
+        self.index = index
+        self.workers = workers
+        self.config = config
+        self.directory = directory  # worker index → its room list (manager dict proxy)
+        self._others = []  # room lists of the other workers, as of the last publish()
+
+    def owns(self, room_id):
+        return room_owner(room_id, self.workers) == self.index
+
+    def redirect(self, room_id):
+        """REDIRECT frame for a room hosted elsewhere, or None if it is ours."""
+        owner = room_owner(room_id, self.workers)
+        if owner == self.index:
+            return None
+        return {"type": "REDIRECT", "room": room_id, "port": worker_port(self.config, owner)}
+
+    def rooms(self, local):
+        """Global lobby: our current rooms and the others' last published ones."""
+        return self._others + local
+
+    def publish(self, local):
+        """Share our rooms and fetch the others' (on the scheduler thread, once a second)."""
+        try:
+            self.directory[self.index] = local
+            lists = dict(self.directory.items())
+        except Exception:
+            return  # launcher gone: keep the last known lobby
+        self._others = [room for index, rooms in sorted(lists.items()) if index != self.index for room in rooms]
+
+    def withdraw(self):
+        try:
+            self.directory.pop(self.index, None)
+        except Exception:
+            pass
+
+
+# ── Worker process ────────────────────────────────────────────────
+
+def _listen(host, port, reuse_port=False):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    return sock
+
+
+def run_worker(index, workers, directory):
+    config = load_config()
+    cluster = ClusterWorker(index, workers, config, directory)
+
+    sockets = [_listen(config.host, worker_port(config, index))]
+    if hasattr(socket, "SO_REUSEPORT"):
+        sockets.append(_listen(config.host, config.port, reuse_port=True))
+    elif index == 0:
+        sockets.append(_listen(config.host, config.port))  # no SO_REUSEPORT: worker 0 takes it alone
+
+    if config.server_mode == "asyncio":
+        from src.async_server import serve
+        from src.dictionary_registry import DictionaryRegistry
+        from src.rooms import RoomManager
+
+        rooms = RoomManager(DictionaryRegistry(config), config=config)
+        rooms.cluster = cluster
+        rooms.scheduler.call_every(PUBLISH_INTERVAL_SECONDS, rooms.publish)
+        try:
+            serve(config, rooms, sockets=sockets)
+        finally:
+            cluster.withdraw()
+        return
+
+    from werkzeug.serving import make_server
+
+    from src import app as server
+
+    server.rooms.cluster = cluster
+    server.rooms.scheduler.call_every(PUBLISH_INTERVAL_SECONDS, server.rooms.publish)
+    httpds = [make_server(config.host, 0, server.app, threaded=True, fd=sock.fileno()) for sock in sockets]
+    for httpd in httpds[1:]:
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        httpds[0].serve_forever()
+    finally:
+        cluster.withdraw()
+
+
+# ── Launcher ──────────────────────────────────────────────────────
+
+def main(argv=None):
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Run several server processes, rooms partitioned between them")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=config.workers or os.cpu_count(), help="worker processes"
+    )
+    args = parser.parse_args(argv)
+    workers = max(1, args.workers)
+
+    ctx = multiprocessing.get_context("spawn")
+    manager = SyncManager(ctx=ctx)
+    manager.start()
+    directory = manager.dict()
+
+    def spawn(index):
+        process = ctx.Process(target=run_worker, args=(index, workers, directory), name=f"worker-{index}")
+        process.start()
+        return process
+
+    processes = [spawn(i) for i in range(workers)]
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # stop the workers too
+    print(
+        f"{workers} workers on port {config.port} "
+        f"(own ports {worker_port(config, 0)}-{worker_port(config, workers - 1)})"
+    )
+    try:
+        while True:
+            time.sleep(1.0)
+            for i, process in enumerate(processes):
+                if not process.is_alive():
+                    # Its rooms are lost, but the hash sends them back to the same index.
+                    print(f"worker-{i} exited with code {process.exitcode}, restarting")
+                    directory.pop(i, None)
+                    processes[i] = spawn(i)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
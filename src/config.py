@@ -1,7 +1,22 @@
 import json
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, Literal
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Literal, Tuple
+
+# Inbound token buckets (inbound.py): message type → (per second, burst)
+DEFAULT_INBOUND_RATES = {
+    "SUBMIT": (5.0, 10.0),
+    "TYPING": (25.0, 25.0),
+    "PASS": (2.0, 4.0),
+    "VOTE_START": (2.0, 4.0),
+    "LIST_ROOMS": (2.0, 5.0),
+    "CREATE_ROOM": (1.0, 3.0),
+    "JOIN": (1.0, 5.0),
+    "RESUME": (1.0, 5.0),
+    "RESYNC": (2.0, 5.0),
+    "PONG": (1.0, 3.0),
+    "CLOCK": (1.0, 8.0),
+}
 
 
 @dataclass(frozen=True)
@@ -9,15 +24,59 @@ class AppConfig:
     # Server
     host: str = "0.0.0.0"
     port: int = 8765
+    # "threaded": Flask + flask-sock, one thread per socket
+    # "asyncio": aiohttp, every socket on one event loop
+    server_mode: Literal["threaded", "asyncio"] = "threaded"
+    # Processes started by the cluster launcher (python -m src.cluster),
+    # each hosting a share of the rooms; 0 = one per CPU
+    workers: int = 0
+
+    # "locked": handlers and timers call into GameState under its lock
+    # "actor": they post commands that game loop threads apply (game_loop.py)
+    game_mode: Literal["locked", "actor"] = "locked"
+    game_loops: int = 1
+    game_loop_batch: int = 64
+
+    # Rooms
+    default_room: str = "main"
+    max_rooms: int = 500
+    room_idle_timeout_seconds: float = 300.0
 
     # Dictionary
     dictionary_file: str = "spelling_dict_reduced.json"
+    # More dictionaries, {name: file in src/data}, that rooms can pick with
+    # CREATE_ROOM settings {"dictionary": name}; see dictionary_registry.py
+    dictionaries: Dict[str, str] = field(default_factory=dict)
+    # Unused dictionaries stay loaded until their estimated total exceeds this
+    dictionary_memory_budget_mb: float = 256.0
+
+    # Question sampling (see sampler.py); overridable per room, see room_config()
+    # "uniform", "frequency" (needs <dictionary>.freq.json) or "spellings"
+    question_sampler: Literal["uniform", "frequency", "spellings"] = "uniform"
+    # "all", or only the "easy"/"medium"/"hard" third of the questions
+    question_band: Literal["all", "easy", "medium", "hard"] = "all"
+    question_no_repeat: bool = True
 
     # Game rules
     lives_per_player: int = 3
     timer_min_seconds: int = 20
     timer_max_seconds: int = 30
     turn_transition_delay_seconds: float = 2.5
+    # Seconds taken off the fuse by a wrong answer (0 = no penalty)
+    wrong_answer_penalty_seconds: float = 0.0
+    # Latency compensation: a SUBMIT the client stamped before the deadline
+    # still counts if it arrives at most this late (0 = none); the bomb goes
+    # off this much after the deadline it shows
+    latency_grace_seconds: float = 0.25
+    # Tell the player why an answer was wrong (near_miss.py) and let the
+    # first near_miss_free_retries near misses of a turn go unpenalized
+    near_miss_feedback: bool = False
+    near_miss_free_retries: int = 1
+
+    # Reconnect: a dropped player's seat is kept this long (0 = removed at
+    # once) and the last resume_history deltas are kept to replay on RESUME
+    resume_grace_seconds: float = 30.0
+    resume_history: int = 256
 
     # Start behavior: "vote" or "auto"
     start_mode: Literal["vote", "auto"] = "vote"
@@ -25,8 +84,42 @@ class AppConfig:
 
     # UX / networking
     echo_typing_to_sender: bool = False
+    # TYPING relay: latest text per turn sent at most this many times per
+    # second (0 = relay every keystroke immediately)
+    typing_flush_hz: float = 20.0
+    # Spectators get everything batched into one frame this many times per second
+    spectator_flush_hz: float = 4.0
+    # Per-connection outbound queue (see outbound.py)
+    outbound_queue_frames: int = 256
+    outbound_max_lag_seconds: float = 10.0
+    outbound_drop_typing: bool = True
+    # Inbound flood protection (see inbound.py): bigger frames are refused,
+    # each type has a token bucket, and a client with inbound_max_violations
+    # rejected frames within inbound_violation_window_seconds is disconnected
+    inbound_max_frame_bytes: int = 4096
+    inbound_rates: Dict[str, Tuple[float, float]] = field(default_factory=lambda: dict(DEFAULT_INBOUND_RATES))
+    inbound_max_violations: int = 20
+    inbound_violation_window_seconds: float = 10.0
+    # Heartbeat (see heartbeat.py): a connection silent this long gets a PING
+    # (0 = never), and is closed if still silent heartbeat_timeout_seconds later
+    heartbeat_interval_seconds: float = 15.0
+    heartbeat_timeout_seconds: float = 10.0
     normalize_spellings: bool = True
 
+    # Admin endpoints (admin.py), disabled while empty
+    admin_token: str = ""
+
+    # Metrics (/metrics): timings are collected only while someone scrapes,
+    # and stop this long after the last scrape
+    metrics_idle_seconds: float = 300.0
+
+    # Gameplay events (analytics.py): SQLite file they are appended to
+    # (empty = not recorded), written in batches every analytics_flush_seconds;
+    # beyond analytics_buffer_events unwritten events, the oldest are dropped
+    analytics_file: str = ""
+    analytics_flush_seconds: float = 1.0
+    analytics_buffer_events: int = 100_000
+
 
 def _to_int(value: Any, default: int) -> int:
     try:
@@ -54,6 +147,31 @@ def _to_bool(value: Any, default: bool) -> bool:
     return default
 
 
+def _question_settings(data: Dict[str, Any], base: AppConfig) -> Dict[str, Any]:
+    question_sampler = data.get("question_sampler", base.question_sampler)
+    if question_sampler not in ("uniform", "frequency", "spellings"):
+        question_sampler = base.question_sampler
+    question_band = data.get("question_band", base.question_band)
+    if question_band not in ("all", "easy", "medium", "hard"):
+        question_band = base.question_band
+    question_no_repeat = _to_bool(data.get("question_no_repeat", base.question_no_repeat), base.question_no_repeat)
+    return {
+        "question_sampler": question_sampler,
+        "question_band": question_band,
+        "question_no_repeat": question_no_repeat,
+    }
+
+
+def room_config(config: AppConfig, settings: Dict[str, Any] | None) -> AppConfig:
+    """Config of one room: ``config`` with the client's per-room settings applied.
+
+    Only the question settings can be overridden; anything invalid is ignored.
+    """
+    if not isinstance(settings, dict) or not settings:
+        return config
+    return replace(config, **_question_settings(settings, config))
+
+
 def load_config(path: str | None = None) -> AppConfig:
     """Load configuration from JSON file. Uses defaults if file missing."""
     if path is None:
@@ -68,7 +186,40 @@ def load_config(path: str | None = None) -> AppConfig:
 
     host = str(data.get("host", AppConfig.host))
     port = _to_int(data.get("port", AppConfig.port), AppConfig.port)
+    server_mode = data.get("server_mode", AppConfig.server_mode)
+    if server_mode not in ("threaded", "asyncio"):
+        server_mode = AppConfig.server_mode
+    workers = max(0, _to_int(data.get("workers", AppConfig.workers), AppConfig.workers))
+    game_mode = data.get("game_mode", AppConfig.game_mode)
+    if game_mode not in ("locked", "actor"):
+        game_mode = AppConfig.game_mode
+    game_loops = max(1, _to_int(data.get("game_loops", AppConfig.game_loops), AppConfig.game_loops))
+    game_loop_batch = max(
+        1, _to_int(data.get("game_loop_batch", AppConfig.game_loop_batch), AppConfig.game_loop_batch)
+    )
+    default_room = str(data.get("default_room", AppConfig.default_room)).strip() or AppConfig.default_room
+    max_rooms = _to_int(data.get("max_rooms", AppConfig.max_rooms), AppConfig.max_rooms)
+    if max_rooms < 1:
+        max_rooms = 1
+    room_idle_timeout_seconds = _to_float(
+        data.get("room_idle_timeout_seconds", AppConfig.room_idle_timeout_seconds),
+        AppConfig.room_idle_timeout_seconds,
+    )
     dictionary_file = str(data.get("dictionary_file", AppConfig.dictionary_file))
+    dictionaries = data.get("dictionaries", {})
+    if not isinstance(dictionaries, dict):
+        dictionaries = {}
+    dictionaries = {
+        str(name): str(filename) for name, filename in dictionaries.items() if name and name != "default" and filename
+    }
+    dictionary_memory_budget_mb = max(
+        0.0,
+        _to_float(
+            data.get("dictionary_memory_budget_mb", AppConfig.dictionary_memory_budget_mb),
+            AppConfig.dictionary_memory_budget_mb,
+        ),
+    )
+    question_settings = _question_settings(data, AppConfig())
     lives_per_player = _to_int(data.get("lives_per_player", AppConfig.lives_per_player), AppConfig.lives_per_player)
     timer_min_seconds = _to_int(data.get("timer_min_seconds", AppConfig.timer_min_seconds), AppConfig.timer_min_seconds)
     timer_max_seconds = _to_int(data.get("timer_max_seconds", AppConfig.timer_max_seconds), AppConfig.timer_max_seconds)
@@ -76,6 +227,26 @@ def load_config(path: str | None = None) -> AppConfig:
         data.get("turn_transition_delay_seconds", AppConfig.turn_transition_delay_seconds),
         AppConfig.turn_transition_delay_seconds,
     )
+    wrong_answer_penalty_seconds = max(
+        0.0,
+        _to_float(
+            data.get("wrong_answer_penalty_seconds", AppConfig.wrong_answer_penalty_seconds),
+            AppConfig.wrong_answer_penalty_seconds,
+        ),
+    )
+    latency_grace_seconds = max(
+        0.0,
+        _to_float(data.get("latency_grace_seconds", AppConfig.latency_grace_seconds), AppConfig.latency_grace_seconds),
+    )
+    near_miss_feedback = _to_bool(data.get("near_miss_feedback", AppConfig.near_miss_feedback), AppConfig.near_miss_feedback)
+    near_miss_free_retries = max(
+        0, _to_int(data.get("near_miss_free_retries", AppConfig.near_miss_free_retries), AppConfig.near_miss_free_retries)
+    )
+    resume_grace_seconds = max(
+        0.0,
+        _to_float(data.get("resume_grace_seconds", AppConfig.resume_grace_seconds), AppConfig.resume_grace_seconds),
+    )
+    resume_history = max(0, _to_int(data.get("resume_history", AppConfig.resume_history), AppConfig.resume_history))
     start_mode = data.get("start_mode", AppConfig.start_mode)
     if start_mode not in ("vote", "auto"):
         start_mode = AppConfig.start_mode
@@ -83,7 +254,67 @@ def load_config(path: str | None = None) -> AppConfig:
     if min_players_to_start < 1:
         min_players_to_start = 1
     echo_typing_to_sender = _to_bool(data.get("echo_typing_to_sender", AppConfig.echo_typing_to_sender), AppConfig.echo_typing_to_sender)
+    typing_flush_hz = _to_float(data.get("typing_flush_hz", AppConfig.typing_flush_hz), AppConfig.typing_flush_hz)
+    spectator_flush_hz = _to_float(
+        data.get("spectator_flush_hz", AppConfig.spectator_flush_hz), AppConfig.spectator_flush_hz
+    )
+    if spectator_flush_hz <= 0:
+        spectator_flush_hz = AppConfig.spectator_flush_hz
+    outbound_queue_frames = _to_int(
+        data.get("outbound_queue_frames", AppConfig.outbound_queue_frames), AppConfig.outbound_queue_frames
+    )
+    if outbound_queue_frames < 1:
+        outbound_queue_frames = 1
+    outbound_max_lag_seconds = _to_float(
+        data.get("outbound_max_lag_seconds", AppConfig.outbound_max_lag_seconds),
+        AppConfig.outbound_max_lag_seconds,
+    )
+    outbound_drop_typing = _to_bool(data.get("outbound_drop_typing", AppConfig.outbound_drop_typing), AppConfig.outbound_drop_typing)
+    inbound_max_frame_bytes = max(
+        256, _to_int(data.get("inbound_max_frame_bytes", AppConfig.inbound_max_frame_bytes), AppConfig.inbound_max_frame_bytes)
+    )
+    inbound_rates = dict(DEFAULT_INBOUND_RATES)
+    rates = data.get("inbound_rates", {})
+    if isinstance(rates, dict):
+        for msg_type, value in rates.items():
+            if isinstance(value, (list, tuple)) and len(value) == 2:
+                rate, burst = _to_float(value[0], 0.0), _to_float(value[1], 0.0)
+                if rate > 0 and burst >= 1:
+                    inbound_rates[str(msg_type)] = (rate, burst)
+    inbound_max_violations = max(
+        1, _to_int(data.get("inbound_max_violations", AppConfig.inbound_max_violations), AppConfig.inbound_max_violations)
+    )
+    inbound_violation_window_seconds = _to_float(
+        data.get("inbound_violation_window_seconds", AppConfig.inbound_violation_window_seconds),
+        AppConfig.inbound_violation_window_seconds,
+    )
+    heartbeat_interval_seconds = max(
+        0.0,
+        _to_float(
+            data.get("heartbeat_interval_seconds", AppConfig.heartbeat_interval_seconds),
+            AppConfig.heartbeat_interval_seconds,
+        ),
+    )
+    heartbeat_timeout_seconds = _to_float(
+        data.get("heartbeat_timeout_seconds", AppConfig.heartbeat_timeout_seconds), AppConfig.heartbeat_timeout_seconds
+    )
+    if heartbeat_timeout_seconds <= 0:
+        heartbeat_timeout_seconds = AppConfig.heartbeat_timeout_seconds
     normalize_spellings = _to_bool(data.get("normalize_spellings", AppConfig.normalize_spellings), AppConfig.normalize_spellings)
+    admin_token = str(data.get("admin_token", AppConfig.admin_token) or "")
+    metrics_idle_seconds = _to_float(
+        data.get("metrics_idle_seconds", AppConfig.metrics_idle_seconds), AppConfig.metrics_idle_seconds
+    )
+    analytics_file = str(data.get("analytics_file", AppConfig.analytics_file) or "")
+    analytics_flush_seconds = _to_float(
+        data.get("analytics_flush_seconds", AppConfig.analytics_flush_seconds), AppConfig.analytics_flush_seconds
+    )
+    if analytics_flush_seconds <= 0:
+        analytics_flush_seconds = AppConfig.analytics_flush_seconds
+    analytics_buffer_events = max(
+        1,
+        _to_int(data.get("analytics_buffer_events", AppConfig.analytics_buffer_events), AppConfig.analytics_buffer_events),
+    )
 
     if timer_min_seconds < 1:
         timer_min_seconds = 1
@@ -93,13 +324,46 @@ def load_config(path: str | None = None) -> AppConfig:
     return AppConfig(
         host=host,
         port=port,
+        server_mode=server_mode,
+        workers=workers,
+        game_mode=game_mode,
+        game_loops=game_loops,
+        game_loop_batch=game_loop_batch,
+        default_room=default_room,
+        max_rooms=max_rooms,
+        room_idle_timeout_seconds=room_idle_timeout_seconds,
         dictionary_file=dictionary_file,
+        dictionaries=dictionaries,
+        dictionary_memory_budget_mb=dictionary_memory_budget_mb,
+        **question_settings,
         lives_per_player=lives_per_player,
         timer_min_seconds=timer_min_seconds,
         timer_max_seconds=timer_max_seconds,
         turn_transition_delay_seconds=turn_transition_delay_seconds,
+        wrong_answer_penalty_seconds=wrong_answer_penalty_seconds,
+        latency_grace_seconds=latency_grace_seconds,
+        near_miss_feedback=near_miss_feedback,
+        near_miss_free_retries=near_miss_free_retries,
+        resume_grace_seconds=resume_grace_seconds,
+        resume_history=resume_history,
         start_mode=start_mode,
         min_players_to_start=min_players_to_start,
         echo_typing_to_sender=echo_typing_to_sender,
+        typing_flush_hz=typing_flush_hz,
+        spectator_flush_hz=spectator_flush_hz,
+        outbound_queue_frames=outbound_queue_frames,
+        outbound_max_lag_seconds=outbound_max_lag_seconds,
+        outbound_drop_typing=outbound_drop_typing,
+        inbound_max_frame_bytes=inbound_max_frame_bytes,
+        inbound_rates=inbound_rates,
+        inbound_max_violations=inbound_max_violations,
+        inbound_violation_window_seconds=inbound_violation_window_seconds,
+        heartbeat_interval_seconds=heartbeat_interval_seconds,
+        heartbeat_timeout_seconds=heartbeat_timeout_seconds,
         normalize_spellings=normalize_spellings,
+        admin_token=admin_token,
+        metrics_idle_seconds=metrics_idle_seconds,
+        analytics_file=analytics_file,
+        analytics_flush_seconds=analytics_flush_seconds,
+        analytics_buffer_events=analytics_buffer_events,
     )
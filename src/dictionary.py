@@ -0,0 +1,560 @@
+"""Compiled, memory-mapped spelling dictionary.
+
+The JSON dictionaries ({ipa: [spellings]}) are parsed into Python dicts by
+every server process. A compiled ``.ptbd`` file holds the same data as a
+string pool plus offset tables, so it can be ``mmap``-ed read-only: opening
+it costs a few syscalls, and several processes share the same page cache.
+
+Layout (little-endian, every section 4-byte aligned)::
+
+    header      magic "PTBD", version, n_keys, n_strings, n_spellings,
+                n_answers, then the byte offset of each section below
+    str_offsets u32[n_strings + 1]   slices of str_pool
+    str_pool    utf-8 bytes          keys first (sorted), then other strings
+    spell_start u32[n_keys + 1]      slices of spell_ids, per key
+    spell_ids   u32[n_spellings]     string ids, original order
+    ans_start   u32[n_keys + 1]      slices of ans_ids, per key
+    ans_ids     u32[n_answers]       string ids of normalized spellings
+
+Convert a JSON dictionary with ``python -m src.dictionary <file.json>``.
+"""
+
+import argparse
+import bisect
+import gc
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import traceback
+import weakref
+from array import array
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+
+from src.near_miss import NearMissIndex, build_near_miss_index, near_miss_path_for
+from src.sampler import build_sampler_table
+from src.utils import (
+    build_answer_index,
+    data_path,
+    load_difficulties_from_file,
+    load_dictionary_from_file,
+    load_frequencies_from_file,
+    normalize_answer,
+)
+
+MAGIC = b"PTBD"
+VERSION = 1
+COMPILED_SUFFIX = ".ptbd"
+FREQUENCIES_SUFFIX = ".freq.json"
+DIFFICULTY_SUFFIX = ".difficulty.json"
+
+log = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<4sIIIII7Q")
+
+
+def compiled_path_for(json_path):
+    """Path of the compiled artifact that sits next to a JSON dictionary."""
+    return os.path.splitext(json_path)[0] + COMPILED_SUFFIX
+
+
+def frequencies_path_for(path):
+    """Path of the {ipa: frequency} sidecar of a JSON or compiled dictionary."""
+    return os.path.splitext(path)[0] + FREQUENCIES_SUFFIX
+
+
+def difficulty_path_for(path):
+    """Path of the {ipa: difficulty} sidecar written by analytics.py."""
+    return os.path.splitext(path)[0] + DIFFICULTY_SUFFIX
+
+
+# ── Writer ────────────────────────────────────────────────────────
+
+def compile_dictionary(spelling_dict, path):
+    """Write spelling_dict ({ipa: [spellings]}) to path in the .ptbd format."""
+    keys = sorted(spelling_dict, key=lambda k: k.encode("utf-8"))
+
+    strings = list(keys)
+    string_ids = {k: i for i, k in enumerate(keys)}
+
+    def intern(s):
+        sid = string_ids.get(s)
+        if sid is None:
+            sid = string_ids[s] = len(strings)
+            strings.append(s)
+        return sid
+
+    spell_start, spell_ids = [0], []
+    ans_start, ans_ids = [0], []
+    for key in keys:
+        spellings = spelling_dict[key]
+        spell_ids.extend(intern(s) for s in spellings)
+        spell_start.append(len(spell_ids))
+        answers = dict.fromkeys(normalize_answer(s) for s in spellings)
+        ans_ids.extend(intern(a) for a in answers)
+        ans_start.append(len(ans_ids))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    str_offsets = [0]
+    for b in encoded:
+        str_offsets.append(str_offsets[-1] + len(b))
+    str_pool = b"".join(encoded)
+
+    sections = [
+        _pack_u32(str_offsets),
+        str_pool,
+        _pack_u32(spell_start),
+        _pack_u32(spell_ids),
+        _pack_u32(ans_start),
+        _pack_u32(ans_ids),
+    ]
+
+    offsets = []
+    pos = _HEADER.size
+    for section in sections:
+        pos = _align(pos)
+        offsets.append(pos)
+        pos += len(section)
+    offsets.append(pos)  # end of file
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(keys), len(strings), len(spell_ids), len(ans_ids), *offsets
+    )
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for offset, section in zip(offsets, sections):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _pack_u32(values):
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def _align(pos):
+    return (pos + 3) & ~3
+
+
+# ── Reader ────────────────────────────────────────────────────────
+
+class CompiledDictionary(Mapping):
+    """Read-only {ipa: [spellings]} mapping backed by an mmap-ed .ptbd file.
+
+    Nothing is decoded up front: lookups binary-search the sorted key pool
+    and only decode the strings they return.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n_keys, n_strings, n_spellings, n_answers, *offsets = _HEADER.unpack_from(
+            self._mm, 0
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a compiled dictionary (version {VERSION})")
+
+        self._n_keys = n_keys
+        self.n_spellings = n_spellings
+        self._str_offsets = self._u32_array(offsets[0], n_strings + 1)
+        self._pool_base = offsets[1]
+        self._spell_start = self._u32_array(offsets[2], n_keys + 1)
+        self._spell_ids = self._u32_array(offsets[3], n_spellings)
+        self._ans_start = self._u32_array(offsets[4], n_keys + 1)
+        self._ans_ids = self._u32_array(offsets[5], n_answers)
+
+        self._find = lru_cache(maxsize=4096)(self._find_uncached)
+        self._answers_at = lru_cache(maxsize=4096)(self._answers_at_uncached)
+
+    def _u32_array(self, offset, count):
+        view = memoryview(self._mm)[offset : offset + 4 * count]
+        if sys.byteorder == "little":
+            return view.cast("I")
+        return struct.unpack(f"<{count}I", view)
+
+    # Strings
+
+    def _string_bytes(self, sid):
+        start = self._pool_base + self._str_offsets[sid]
+        end = self._pool_base + self._str_offsets[sid + 1]
+        return self._mm[start:end]
+
+    def _string(self, sid):
+        return self._string_bytes(sid).decode("utf-8")
+
+    # Keys
+
+    def _find_uncached(self, key):
+        """Index of key in the sorted key pool, or -1."""
+        target = key.encode("utf-8")
+        keys = _KeyBytes(self)
+        i = bisect.bisect_left(keys, target)
+        if i < self._n_keys and keys[i] == target:
+            return i
+        return -1
+
+    def key_at(self, index):
+        return self._string(index)
+
+    def spellings_at(self, index):
+        start, end = self._spell_start[index], self._spell_start[index + 1]
+        return [self._string(sid) for sid in self._spell_ids[start:end]]
+
+    def spelling_count(self, index):
+        return self._spell_start[index + 1] - self._spell_start[index]
+
+    def _answers_at_uncached(self, index):
+        start, end = self._ans_start[index], self._ans_start[index + 1]
+        return frozenset(self._string(sid) for sid in self._ans_ids[start:end])
+
+    # Mapping interface
+
+    def __getitem__(self, key):
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        return self.spellings_at(index)
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self._find(key) >= 0
+
+    def __len__(self):
+        return self._n_keys
+
+    def __iter__(self):
+        for i in range(self._n_keys):
+            yield self.key_at(i)
+
+    def key_sequence(self):
+        """Indexable view of the keys (for random.choice) without a list copy."""
+        return _KeySequence(self)
+
+    def answer_index(self, normalize_spellings=True):
+        """{ipa: frozenset(normalized spellings)} view, see build_answer_index()."""
+        return _CompiledAnswerIndex(self, normalize_spellings)
+
+    def close(self):
+        self._find.cache_clear()
+        self._answers_at.cache_clear()
+        for attr in ("_str_offsets", "_spell_start", "_spell_ids", "_ans_start", "_ans_ids"):
+            view = getattr(self, attr)
+            if isinstance(view, memoryview):
+                view.release()
+        self._mm.close()
+
+
+class _KeyBytes(Sequence):
+    """Keys as raw utf-8 bytes, for bisect (byte order == code point order)."""
+
+    def __init__(self, compiled):
+        self._compiled = compiled
+
+    def __len__(self):
+        return self._compiled._n_keys
+
+    def __getitem__(self, index):
+        return self._compiled._string_bytes(index)
+
+
+class _KeySequence(Sequence):
+    def __init__(self, compiled):
+        self._compiled = compiled
+
+    def __len__(self):
+        return len(self._compiled)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._compiled.key_at(index)
+
+
+class _CompiledAnswerIndex(Mapping):
+    def __init__(self, compiled, normalize_spellings):
+        self._compiled = compiled
+        self._normalize_spellings = normalize_spellings
+
+    def __getitem__(self, key):
+        index = self._compiled._find(key)
+        if index < 0:
+            raise KeyError(key)
+        if self._normalize_spellings:
+            return self._compiled._answers_at(index)
+        return frozenset(normalize_answer(s, False) for s in self._compiled.spellings_at(index))
+
+    def __len__(self):
+        return len(self._compiled)
+
+    def __iter__(self):
+        return iter(self._compiled)
+
+
+# ── Shared dictionary ─────────────────────────────────────────────
+
+class Dictionary:
+    """Read-only dictionary shared by every room of a server.
+
+    Wraps a plain {ipa: [spellings]} dict or a CompiledDictionary, and builds
+    the derived lookup structures once, however many GameStates use it.
+    ``frequencies`` ({ipa: word frequency}, optional) and ``difficulties``
+    ({ipa: share of turns failed}, optional, see analytics.py) feed the
+    question samplers, see sampler.py; ``near_miss_path`` is where the
+    near-miss index is looked for, see near_miss.py.
+    """
+
+    def __init__(self, spellings, frequencies=None, near_miss_path=None, difficulties=None):
+        self.spellings = spellings
+        self.keys = key_sequence(spellings)
+        self.frequencies = frequencies
+        self.difficulties = difficulties
+        self.near_miss_path = near_miss_path
+        self._near_miss = None
+        self._near_miss_lock = threading.Lock()  # held by the (slow) build only
+        self._near_miss_thread = None
+        self._answer_indexes = {}
+        self._sampler_tables = {}
+        self._frequencies_by_index = None
+        self._difficulties_by_index = None
+        self._spelling_counts = None
+        self._lock = threading.Lock()
+
+    def answer_index(self, normalize_spellings=True):
+        with self._lock:
+            index = self._answer_indexes.get(normalize_spellings)
+            if index is None:
+                index = answer_index(self.spellings, normalize_spellings)
+                self._answer_indexes[normalize_spellings] = index
+            return index
+
+    @classmethod
+    def from_file(cls, filename):
+        """Load src/data/<filename> along with its optional sidecar files."""
+        return cls(
+            load_dictionary_from_file(filename),
+            frequencies=load_frequencies_from_file(filename),
+            near_miss_path=near_miss_path_for(data_path(filename)),
+            difficulties=load_difficulties_from_file(filename),
+        )
+
+    def near_miss_index(self, wait=True):
+        """The NearMissIndex, opened on first use.
+
+        Built in memory (slow, seconds) when the offline file is missing,
+        under its own lock: answer_index() and sampler_table() never wait
+        for it. With ``wait=False``, None until it is ready; the build then
+        runs on a background thread.
+        """
+        if self._near_miss is not None:
+            return self._near_miss
+        if not wait:
+            with self._lock:
+                if self._near_miss_thread is None:
+                    self._near_miss_thread = threading.Thread(target=self.near_miss_index, daemon=True)
+                    self._near_miss_thread.start()
+            return self._near_miss
+        with self._near_miss_lock:
+            if self._near_miss is None:
+                if self.near_miss_path and os.path.exists(self.near_miss_path):
+                    self._near_miss = NearMissIndex.open(self.near_miss_path)
+                else:
+                    log.warning("No near-miss index at %s, building it in memory", self.near_miss_path)
+                    self._near_miss = NearMissIndex(build_near_miss_index(self.spellings))
+            return self._near_miss
+
+    def sampler_table(self, sampler="uniform", band="all"):
+        """Shared SamplerTable for one question_sampler/question_band pair."""
+        with self._lock:
+            table = self._sampler_tables.get((sampler, band))
+        if table is None:
+            # Built outside the lock: an O(n) pass, only ever done twice at worst.
+            table = build_sampler_table(self, sampler, band)
+            with self._lock:
+                table = self._sampler_tables.setdefault((sampler, band), table)
+        return table
+
+    def frequencies_by_index(self):
+        """Word frequency of keys[i], or None without frequency data."""
+        if self.frequencies is None:
+            return None
+        if self._frequencies_by_index is None:
+            get = self.frequencies.get
+            self._frequencies_by_index = array("d", (float(get(key, 0.0)) for key in self.keys))
+        return self._frequencies_by_index
+
+    def difficulties_by_index(self):
+        """Measured difficulty of keys[i] (unplayed questions: the mean), or None without data."""
+        if not self.difficulties:
+            return None
+        if self._difficulties_by_index is None:
+            mean = sum(self.difficulties.values()) / len(self.difficulties)
+            get = self.difficulties.get
+            self._difficulties_by_index = array("d", (float(get(key, mean)) for key in self.keys))
+        return self._difficulties_by_index
+
+    def spelling_counts(self):
+        """Number of accepted spellings of keys[i]."""
+        if self._spelling_counts is None:
+            if isinstance(self.spellings, CompiledDictionary):
+                counts = (self.spellings.spelling_count(i) for i in range(len(self.keys)))
+            else:
+                counts = (len(self.spellings[key]) for key in self.keys)
+            self._spelling_counts = array("I", counts)
+        return self._spelling_counts
+
+    def footprint(self):
+        """Estimated bytes held by this dictionary and the tables built from it so far.
+
+        Counts Python objects as sys.getsizeof sees them (a string used by two
+        structures is counted twice) and mapped files in full, though their
+        pages are shared with other processes.
+        """
+        if isinstance(self.spellings, CompiledDictionary):
+            total = len(self.spellings._mm)
+        else:
+            total = _deep_size(self.spellings) + sys.getsizeof(self.keys)
+        for index in self._answer_indexes.values():
+            if isinstance(index, dict):  # compiled ones are views
+                total += _deep_size(index)
+        for table in self._sampler_tables.values():
+            total += _deep_size(table.population) + _deep_size(table.weights) + _deep_size(table.alias)
+        total += _deep_size(self.frequencies) + _deep_size(self._frequencies_by_index)
+        total += _deep_size(self.difficulties) + _deep_size(self._difficulties_by_index)
+        total += _deep_size(self._spelling_counts)
+        if self._near_miss is not None:
+            total += len(self._near_miss._buffer)
+        return total
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _deep_size(obj):
+    """sys.getsizeof of obj and, for containers, of everything they hold."""
+    if obj is None:
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k) + _deep_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += _deep_size(vars(obj))
+    return size
+
+
+class DictionaryHandle:
+    """The current version of a Dictionary, replaceable while games run.
+
+    GameStates hold the handle and move to ``current`` between turns (see
+    GameState._refresh_dictionary). reload() loads the next version on a
+    background thread, then swaps it in. It is refused while the version
+    before ``current`` is still used by some game, or while another reload
+    is loading, so at most two versions are ever in memory.
+    """
+
+    def __init__(self, dictionary):
+        self.current = dictionary
+        self.version = 1
+        self._previous = None  # weakref to the version current replaced
+        self._loading = False
+        self._lock = threading.Lock()
+
+    def previous_in_use(self, collect=False):
+        """Whether the version before current is still alive.
+
+        Rooms that were dropped may still sit in reference cycles; only
+        ``collect=True`` (the reload path) runs gc.collect() to find out.
+        """
+        if self._previous is None or self._previous() is None:
+            return False
+        if collect:
+            gc.collect()
+        return self._previous() is not None
+
+    def reload(self, load, on_swap=None):
+        """Swap in load()'s Dictionary once it returns; runs on a new thread.
+
+        on_swap(dictionary) is called after the swap. Returns the thread, or
+        None if a reload is not possible right now.
+        """
+        with self._lock:
+            if self._loading or self.previous_in_use(collect=True):
+                return None
+            self._loading = True
+        thread = threading.Thread(target=self._reload, args=(load, on_swap), name="dictionary-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def swap(self, dictionary):
+        with self._lock:
+            self._previous = weakref.ref(self.current)
+            self.current = dictionary
+            self.version += 1
+
+    def status(self):
+        return {"version": self.version, "loading": self._loading, "previousInUse": self.previous_in_use()}
+
+    def _reload(self, load, on_swap):
+        try:
+            dictionary = load()
+        except Exception:
+            print(traceback.format_exc())
+            return
+        else:
+            self.swap(dictionary)
+        finally:
+            with self._lock:
+                self._loading = False
+        if on_swap is not None:
+            on_swap(dictionary)
+
+
+def key_sequence(spelling_dict):
+    """Sequence of questions suitable for random.choice()."""
+    if isinstance(spelling_dict, CompiledDictionary):
+        return spelling_dict.key_sequence()
+    return list(spelling_dict)
+
+
+def answer_index(spelling_dict, normalize_spellings=True):
+    """Normalized answer lookup for either a plain dict or a compiled one."""
+    if isinstance(spelling_dict, CompiledDictionary):
+        return spelling_dict.answer_index(normalize_spellings)
+    return build_answer_index(spelling_dict, normalize_spellings)
+
+
+# ── CLI ───────────────────────────────────────────────────────────
+
+def main(argv=None):
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Compile a JSON spelling dictionary to .ptbd")
+    parser.add_argument("json_file", help="dictionary in {ipa: [spellings]} JSON format")
+    parser.add_argument("-o", "--output", help="output path (default: next to the JSON file)")
+    args = parser.parse_args(argv)
+
+    output = args.output or compiled_path_for(args.json_file)
+    with open(args.json_file, "r", encoding="utf-8") as f:
+        spelling_dict = json.load(f)
+
+    t0 = time.perf_counter()
+    compile_dictionary(spelling_dict, output)
+    elapsed = time.perf_counter() - t0
+
+    size = os.path.getsize(output)
+    print(f"Wrote {output}: {len(spelling_dict)} keys, {size / 1024:.0f} KiB in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Named dictionaries that rooms pick at creation (CREATE_ROOM settings).
+
+config.json maps names to files of src/data (``dictionaries``); the one of
+``dictionary_file`` is always there as "default" and never evicted. A
+dictionary is loaded the first time a room asks for it and shared by every
+room using it. Once no room uses it, it stays cached until the estimated
+footprint of all loaded dictionaries exceeds dictionary_memory_budget_mb;
+the least recently used ones are dropped first.
+"""
+
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+from src.config import AppConfig
+from src.dictionary import Dictionary, DictionaryHandle
+
+DEFAULT = "default"
+
+
+class UnknownDictionary(KeyError):
+    """Raised when a room asks for a name that is not in config.dictionaries."""
+
+
+class DictionaryUnavailable(Exception):
+    """Raised when a dictionary failed to load (missing or invalid file)."""
+
+
+class _Entry:
+    def __init__(self, name, filename):
+        self.name = name
+        self.filename = filename
+        self.handle = None  # DictionaryHandle once loaded
+        self.rooms = 0  # rooms using it
+        self.load_seconds = None
+        self.error = None
+        self.ready = threading.Event()
+        self._footprint = None  # (handle version, bytes)
+
+    def footprint(self, refresh=False):
+        if self.handle is None:
+            return 0
+        version = self.handle.version
+        if refresh or self._footprint is None or self._footprint[0] != version:
+            self._footprint = (version, self.handle.current.footprint())
+        return self._footprint[1]
+
+
+class DictionaryRegistry:
+    """Loads, shares and evicts the dictionaries of config.dictionaries.
+
+    ``default`` (a Dictionary, or plain dict) skips loading dictionary_file,
+    e.g. in tests. ``prepare(dictionary)`` is called on every dictionary
+    loaded, before any room gets it; RoomManager uses it to build the
+    shared lookup tables.
+    """
+
+    def __init__(self, config: AppConfig | None = None, default=None, load=Dictionary.from_file):
+        if config is None:
+            config = AppConfig()
+        self.files = {DEFAULT: config.dictionary_file, **config.dictionaries}
+        self.budget_bytes = config.dictionary_memory_budget_mb * 1024 * 1024
+        self.prepare = None
+        self._load = load
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # name → _Entry, least recently used first
+
+        entry = _Entry(DEFAULT, self.files[DEFAULT])
+        if default is None:
+            t0 = time.perf_counter()
+            default = load(entry.filename)
+            entry.load_seconds = time.perf_counter() - t0
+        elif not isinstance(default, Dictionary):
+            default = Dictionary(default)
+        entry.handle = DictionaryHandle(default)
+        entry.rooms = 1  # pinned
+        entry.ready.set()
+        self._entries[DEFAULT] = entry
+
+    @property
+    def default(self):
+        """Handle of the default dictionary (the one reload-dictionary replaces)."""
+        return self._entries[DEFAULT].handle
+
+    def acquire(self, name=None):
+        """Handle of a dictionary for a new room, loading it if needed (may take seconds).
+
+        Every acquire() must be paired with a release() of the same name.
+        """
+        name = name or DEFAULT
+        if name not in self.files:
+            raise UnknownDictionary(name)
+        with self._lock:
+            entry = self._entries.get(name)
+            loading = entry is None
+            if loading:
+                entry = self._entries[name] = _Entry(name, self.files[name])
+            entry.rooms += 1
+            self._entries.move_to_end(name)
+
+        if loading:
+            self._load_entry(entry)
+        else:
+            entry.ready.wait()
+        if entry.error is not None:
+            raise entry.error
+        return entry.handle
+
+    def release(self, name=None):
+        name = name or DEFAULT
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            entry.rooms -= 1
+            self._entries.move_to_end(name)
+            self._evict()
+
+    def measure(self, name=DEFAULT):
+        """Re-estimate a dictionary's footprint (slow: walks every object), e.g. after a reload."""
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and entry.handle is not None:
+            entry.footprint(refresh=True)
+
+    def stats(self):
+        """Per dictionary: file, rooms using it, estimated bytes, load time."""
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if entry.handle is not None]
+        return [
+            {
+                "name": entry.name,
+                "file": entry.filename,
+                "rooms": entry.rooms - (entry.name == DEFAULT),
+                "bytes": entry.footprint(),
+                "loadSeconds": entry.load_seconds,
+            }
+            for entry in entries
+        ]
+
+    # ── Internal ──────────────────────────────────────────────────
+
+    def _load_entry(self, entry):
+        t0 = time.perf_counter()
+        try:
+            dictionary = self._load(entry.filename)
+            if self.prepare is not None:
+                self.prepare(dictionary)
+        except Exception as e:
+            print(traceback.format_exc())
+            entry.error = DictionaryUnavailable(f"{entry.name}: {e}")
+            with self._lock:
+                del self._entries[entry.name]  # next acquire tries again
+        else:
+            entry.handle = DictionaryHandle(dictionary)
+            entry.load_seconds = time.perf_counter() - t0
+            entry.footprint()  # measured here, not under the lock by _evict
+            with self._lock:
+                self._evict()
+        finally:
+            entry.ready.set()
+
+    def _evict(self):
+        """Drop unused dictionaries, least recently used first, until within budget (holds self._lock)."""
+        total = sum(entry.footprint() for entry in self._entries.values())
+        for name, entry in list(self._entries.items()):
+            if total <= self.budget_bytes:
+                break
+            if entry.rooms == 0 and entry.handle is not None and name != DEFAULT:
+                total -= entry.footprint()
+                del self._entries[name]
@@ -0,0 +1,173 @@
+"""Actor mode (``game_mode: "actor"``): games driven by command queues.
+
+In the default "locked" mode every socket handler and timer calls straight
+into GameState and they contend for its lock. In actor mode they only post
+commands instead: a GameActor queues them in its game's inbox, and a
+GameLoop thread drains the inboxes of its rooms in batches, applying each
+room's commands in arrival order. A game is only ever touched by its loop,
+so its lock is never contended, the order of events is exactly the order
+of the inbox, and one loop serves many rooms.
+
+Timers post too: GameState.executor routes fuse and transition callbacks
+through GameActor.post.
+"""
+
+import threading
+import time
+import traceback
+from collections import deque
+
+from src import metrics
+
+
+class GameActor:
+    """Posts commands to one GameState; same public API as GameState.
+
+    Outgoing frames need nothing special: GameState already hands them to
+    each connection's outbound queue.
+    """
+
+    def __init__(self, game, loop):
+        self.game = game
+        self.loop = loop
+        self.inbox = deque()  # (method, args, posted_at)
+        self.scheduled = False  # in loop's ready queue (guarded by loop's condition)
+        game.executor = self.post
+
+    def post(self, method, *args):
+        posted_at = time.perf_counter() if metrics.REGISTRY.enabled else None
+        self.inbox.append((method, args, posted_at))
+        self.loop.wake(self)
+
+    # Commands
+
+    def add_player(self, ws, name):  # JOIN
+        self.post(self.game.add_player, ws, name)
+
+    def remove_player(self, ws):  # LEAVE
+        self.post(self.game.remove_player, ws)
+
+    def disconnect_player(self, ws):  # socket closed
+        self.post(self.game.disconnect_player, ws)
+
+    def resume(self, ws, token, last_seq):  # RESUME
+        self.post(self.game.resume, ws, token, last_seq)
+
+    def submit_answer(self, ws, answer, sent_at=None):  # SUBMIT
+        self.post(self.game.submit_answer, ws, answer, sent_at)
+
+    def pass_turn(self, ws):  # PASS
+        self.post(self.game.pass_turn, ws)
+
+    def broadcast_typing(self, ws, text):  # TYPING
+        self.post(self.game.broadcast_typing, ws, text)
+
+    def vote_start(self, ws):  # VOTE_START
+        self.post(self.game.vote_start, ws)
+
+    def resync(self, ws):  # RESYNC
+        self.post(self.game.resync, ws)
+
+    def refresh_dictionary(self):  # dictionary reloaded
+        self.post(self.game.refresh_dictionary)
+
+    def add_spectator(self, ws):  # JOIN with "spectate"
+        self.post(self.game.add_spectator, ws)
+
+    def remove_spectator(self, ws):
+        self.post(self.game.remove_spectator, ws)
+
+    def flush_spectators(self):
+        # Only swaps buffers under the lock and sends outside it: no need to queue.
+        self.game.flush_spectators()
+
+    def flush_typing(self):
+        if self.game.pending_typing is not None:
+            self.post(self.game.flush_typing)
+
+    # Read-only state for room listings and metrics
+    def __getattr__(self, name):
+        return getattr(self.game, name)
+
+
+class GameLoop:
+    """One thread applying the commands of many games, batch by batch.
+
+    run_pending() does the same synchronously, for tests and simulations.
+    """
+
+    def __init__(self, name="game-loop", batch_size=64):
+        self.name = name
+        self.batch_size = max(1, batch_size)
+        self._ready = deque()  # actors with a non-empty inbox, round robin
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self.commands_applied = 0
+
+    def wake(self, actor):
+        with self._cond:
+            if not actor.scheduled:
+                actor.scheduled = True
+                self._ready.append(actor)
+                self._cond.notify()
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run_pending(self):
+        """Apply every queued command, including the ones they cause. Returns the count."""
+        applied = 0
+        while True:
+            with self._cond:
+                if not self._ready:
+                    return applied
+                actor = self._ready.popleft()
+            applied += self._drain(actor)
+
+    # ── Internal ──────────────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._ready and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                actor = self._ready.popleft()
+            self._drain(actor)
+
+    def _drain(self, actor):
+        """Apply up to batch_size commands of one actor, then requeue it if needed."""
+        inbox = actor.inbox
+        applied = 0
+        while inbox and applied < self.batch_size:
+            method, args, posted_at = inbox.popleft()
+            if posted_at is not None:
+                metrics.GAME_COMMAND_WAIT_SECONDS.observe(time.perf_counter() - posted_at)
+            try:
+                method(*args)
+            except Exception:
+                print(traceback.format_exc())
+            applied += 1
+        self.commands_applied += applied
+
+        with self._cond:
+            if inbox:
+                self._ready.append(actor)  # more to do: go to the back, after other rooms
+            else:
+                actor.scheduled = False
+        return applied
@@ -1,23 +1,53 @@
 import json
 import random
-import threading
+import secrets
 import time
+from collections import deque
+
+from src import metrics
+from src.analytics import EXPLODE, GAME_OVER, INVALID, PASS, TURN, VALID
 from src.config import AppConfig
-from src.utils import remove_accents
+from src.dictionary import Dictionary, DictionaryHandle
+from src.near_miss import NEAR, OTHER_SOUND
+from src.sampler import QuestionDeck
+from src.scheduler import Scheduler, get_scheduler
+from src.utils import normalize_answer
 
 
 class GameState:
     """Thread-safe, turn-based game state manager."""
 
-    def __init__(self, spelling_dict: dict, config: AppConfig | None = None):
+    def __init__(
+        self,
+        spelling_dict,
+        config: AppConfig | None = None,
+        scheduler: Scheduler | None = None,
+        rng: random.Random | None = None,
+        analytics=None,
+        encode=json.dumps,
+    ):
         if config is None:
             config = AppConfig()
-
-        self.lock = threading.Lock()
+        if scheduler is None:
+            scheduler = get_scheduler()
+        # A DictionaryHandle can be reloaded while the game runs: see _refresh_dictionary
+        self.dictionary_handle = None
+        if isinstance(spelling_dict, DictionaryHandle):
+            self.dictionary_handle = spelling_dict
+            spelling_dict = spelling_dict.current
+        elif not isinstance(spelling_dict, Dictionary):
+            spelling_dict = Dictionary(spelling_dict)
+
+        self.lock = metrics.InstrumentedLock()
         self.player_order = []  # ordered list of ws for turn rotation
-        self.players = {}  # ws → {"name": str, "lives": int}
-        self.spelling_dict = spelling_dict
-        self.spelling_dict_keys = list(spelling_dict)
+        self.players = {}  # ws → {"id": int, "name": str, "lives": int}
+        self.next_player_id = 1
+        self.rng = rng or random.Random()
+        self.question_sampler = config.question_sampler
+        self.question_band = config.question_band
+        self.question_no_repeat = config.question_no_repeat
+        self.normalize_spellings = config.normalize_spellings
+        self._use_dictionary(spelling_dict)
 
         # Configurable rules / behavior
         self.lives_per_player = config.lives_per_player
@@ -26,35 +56,80 @@ class GameState:
         self.turn_transition_delay_seconds = config.turn_transition_delay_seconds
         self.start_mode = config.start_mode
         self.min_players_to_start = config.min_players_to_start
-        self.normalize_spellings = config.normalize_spellings
+        self.typing_flush_hz = config.typing_flush_hz
+        self.wrong_answer_penalty_seconds = config.wrong_answer_penalty_seconds
+        self.latency_grace_seconds = config.latency_grace_seconds
+        self.near_miss_feedback = config.near_miss_feedback
+        self.near_miss_free_retries = config.near_miss_free_retries
+        self.free_retries_left = 0  # near misses the active player may still make this turn
 
         self.question = ""
         self.answers = []
         self.previous_question = ""
         self.previous_answers = []
 
-        self.timer = None
-        self.timer_ends_at = None  # when current turn timer expires (for -1s on wrong)
-        
+        self.scheduler = scheduler
+        self.timer = None  # bomb fuse (TimerHandle)
+        self.timer_ends_at = None  # scheduler.time() at which the fuse expires: penalties, client deadline
+        self.fuse_seconds = None  # length of the current fuse when it was (re)lit (client animation)
+        self.fuse_id = 0  # bumped on every new fuse, so a stale callback is ignored
+        self.transition_timer = None  # pending _safe_next_turn after an explosion
+        # Actor mode (game_loop.py): callable(method, *args) that queues timer
+        # callbacks on the game's loop instead of running them on the timer thread.
+        self.executor = None
+
+        # Gameplay events (analytics.py), None when analytics_file is unset
+        self.analytics = analytics
+        # Players' frames. The simulation's bots take the messages as they are;
+        # spectator batches and typing frames are always JSON.
+        self.encode = encode
+        self.game_id = None
+        self.game_started_at = None
+        self.turn_started_at = None
+
         self.is_running = False
         self.current_turn = 0  # index into player_order
         self.start_votes = set()  # ws that voted to start
+        self.seq = 0  # sequence number of the last state delta broadcast
+
+        # Coalesced TYPING relay (see flush_typing)
+        self.pending_typing = None  # latest unsent text of the active player
+        self.last_typing_text = ""  # last text actually sent this turn
+        self.typing_stats = {"received": 0, "flushed": 0, "frames_sent": 0, "frames_saved": 0}
+
+        # Reconnect (see resume): a seat outlives its socket for resume_grace_seconds
+        self.resume_grace_seconds = config.resume_grace_seconds
+        self.tokens = {}  # session token → ws currently holding the seat
+        self.seat_tokens = {}  # ws → its session token
+        self.disconnected = {}  # ws of a dropped seat → TimerHandle that frees it
+        self.history = deque(maxlen=config.resume_history)  # (seq, frame) of recent deltas
+
+        # Spectators: out of the rotation, fed one BATCH frame per tick (see flush_spectators)
+        self.spectators = set()
+        self.spectator_events = []  # serialized frames since the last batch
+        self.spectator_typing = None  # latest {"player", "text"} of this turn not yet batched
 
     # ── Public API ────────────────────────────────────────────────
 
     def add_player(self, ws, name):
         with self.lock:
-            self.players[ws] = {"name": name, "lives": self.lives_per_player}
+            player = {"id": self.next_player_id, "name": name, "lives": self.lives_per_player}
+            self.next_player_id += 1
+            # Others get the delta; the joiner gets a snapshot that already includes it.
+            self._broadcast_state({"type": "PLAYER_JOINED", "player": player})
+            self.players[ws] = player
             self.player_order.append(ws)
-            self._broadcast_lobby()
+            token = secrets.token_urlsafe(16)
+            self.tokens[token] = ws
+            self.seat_tokens[ws] = token
+            self._send(ws, {"type": "WELCOME", "id": player["id"], "token": token})
+            self._send_snapshot(ws)
             if (
                 not self.is_running
                 and self.start_mode == "auto"
                 and len(self.players) >= self.min_players_to_start
             ):
                 self._start_game()
-            
-            print("DEBUG", self.player_order)
 
     def remove_player(self, ws):
         with self.lock:
@@ -67,8 +142,9 @@ class GameState:
                 and self.player_order[self.current_turn % len(self.player_order)] == ws
             )
 
-            self.players.pop(ws, None)
+            player = self.players.pop(ws, None)
             self.start_votes.discard(ws)
+            self._forget_seat(ws)
             if ws in self.player_order:
                 idx = self.player_order.index(ws)
                 self.player_order.remove(ws)
@@ -78,17 +154,63 @@ class GameState:
                 elif idx == self.current_turn and self.player_order:
                     self.current_turn = self.current_turn % len(self.player_order)
 
+            self._broadcast_state({"type": "PLAYER_LEFT", "id": player["id"]})
+
             if len(self.players) < 1 and self.is_running:
                 self._end_game()
             elif was_current and self.is_running:
                 self._start_turn()
 
-            if self.players:
-                self._broadcast_lobby()
+    def disconnect_player(self, ws):
+        """The socket dropped: keep the seat for resume_grace_seconds, then remove it."""
+        if self.resume_grace_seconds <= 0:
+            self.remove_player(ws)
+            return
+        with self.lock:
+            if ws in self.players:
+                self._hold_seat(ws)
+
+    def resume(self, ws, token, last_seq):
+        """Reattach a reconnecting socket to its seat and replay what it missed.
 
-    def submit_answer(self, ws, player_answer):
+        The new socket takes the old one's place in players, player_order and
+        start_votes, so current_turn is untouched and the other players are
+        not told anything. Deltas after last_seq come from the history ring
+        buffer, or as a SNAPSHOT if they are no longer all there.
+        """
         with self.lock:
-            if not self.is_running or not self.player_order:
+            old_ws = self.tokens.get(token)
+            if old_ws is None:
+                self._send(ws, {"type": "RESUME_FAILED"})
+                return
+            timer = self.disconnected.pop(old_ws, None)
+            if timer is not None:
+                timer.cancel()
+
+            self.players = {(ws if w is old_ws else w): p for w, p in self.players.items()}
+            self.player_order[self.player_order.index(old_ws)] = ws
+            if old_ws in self.start_votes:
+                self.start_votes.discard(old_ws)
+                self.start_votes.add(ws)
+            self.tokens[token] = ws
+            del self.seat_tokens[old_ws]
+            self.seat_tokens[ws] = token
+
+            self._send(ws, {"type": "RESUMED", "you": self.players[ws]["id"]})
+            missed = self._missed_since(last_seq)
+            if missed is None:
+                self._send_snapshot(ws)
+                return
+            try:
+                for frame in missed:
+                    ws.send(frame)
+            except Exception:
+                self._connection_lost(ws)
+
+    def submit_answer(self, ws, player_answer, sent_at=None):
+        """``sent_at``: when the client sent it, on the scheduler's clock (see CLOCK), if known."""
+        with self.lock:
+            if not self.is_running or not self.player_order or self.transition_timer:
                 return
 
             # Only the current player can submit
@@ -96,44 +218,56 @@ class GameState:
             if ws != active_ws:
                 return
 
-            if (self.normalize_spellings):
-                player_answer = remove_accents(player_answer.lower().strip())
-                accepted_answers = [remove_accents(s.lower().strip()) for s in self.answers]
-            else:
-                player_answer = player_answer.lower().strip()
-                accepted_answers = self.answers
+            # Past the deadline, the explosion waits latency_grace_seconds for
+            # answers that were sent in time: only those count.
+            late = self._past_deadline()
+            if late and (
+                sent_at is None or not self.scheduler.time() - self.latency_grace_seconds <= sent_at <= self.timer_ends_at
+            ):
+                metrics.LATE_ANSWERS.labels("refused").inc()
+                return
 
-            if player_answer in accepted_answers:
-                self._broadcast({"type": "Valid", "answer": player_answer})
+            normalized = normalize_answer(player_answer, self.normalize_spellings)
+
+            if normalized in self.answer_index[self.question]:
+                self._record(VALID, ws)
+                self._broadcast({"type": "Valid", "answer": normalized})
                 self._advance_turn()
+                if late:
+                    # The next player gets what was left when it was sent (at least a second, as for penalties)
+                    metrics.LATE_ANSWERS.labels("accepted").inc()
+                    self._light_fuse(max(1.0, self.timer_ends_at - sent_at))
                 self._start_turn()
             else:
-                # self._reduce_timer_by_seconds(1)
-                try:
-                    ws.send(json.dumps({"type": "Invalid"}))
-                except Exception:
-                    pass
+                self._reject_answer(ws, player_answer)
 
 
     def pass_turn(self, ws):
         with self.lock:
-            if not self.is_running or not self.player_order:
+            if not self.is_running or not self.player_order or self.transition_timer:
                 return
 
             # Only the current player can submit
             active_ws = self.player_order[self.current_turn % len(self.player_order)]
-            if ws != active_ws:
+            if ws != active_ws or self._past_deadline():
                 return
 
-            self.players[active_ws]["lives"] -= 1
+            player = self.players[active_ws]
+            player["lives"] -= 1
+            self._record(PASS, active_ws)
 
             self._broadcast({"type": "Invalid"})
+            self._broadcast_state({"type": "LIVES", "id": player["id"], "lives": player["lives"]})
             self._advance_turn()
             self._start_turn()
 
 
     def broadcast_typing(self, ws, text: str):
-        """Broadcast the active player's current input to all players."""
+        """Relay the active player's current input to the other players.
+
+        With typing_flush_hz > 0 only the latest text is kept and
+        flush_typing() sends it on the next tick.
+        """
         with self.lock:
             if not self.is_running or not self.player_order:
                 return
@@ -142,25 +276,71 @@ class GameState:
             if ws != active_ws:
                 return
 
-            # Don't echo typing back to the sender (fixes solo self-echo).
-            msg_json = json.dumps(
-                {
-                    "type": "TYPING",
-                    "player": self.players[ws]["name"],
-                    "text": text,
-                }
-            )
+            self.typing_stats["received"] += 1
+            if self.typing_flush_hz <= 0:
+                self._send_typing(ws, text)
+                return
+
+            recipients = len(self.player_order) - 1
+            if self.pending_typing is not None or text == self.last_typing_text:
+                # Superseded before it was sent, or nothing changed.
+                self.typing_stats["frames_saved"] += recipients
+            self.pending_typing = None if text == self.last_typing_text else text
+
+    def flush_typing(self):
+        """Send the pending typing text, if any. Called typing_flush_hz times per second."""
+        if self.pending_typing is None:
+            return
+        with self.lock:
+            text = self.pending_typing
+            self.pending_typing = None
+            if text is None or not self.is_running or not self.player_order:
+                return
+            active_ws = self.player_order[self.current_turn % len(self.player_order)]
+            self._send_typing(active_ws, text)
+
+    def refresh_dictionary(self):
+        """Move to a reloaded dictionary now if no game is running; otherwise the next turn does."""
+        with self.lock:
+            if not self.is_running:
+                self._refresh_dictionary()
+
+    def add_spectator(self, ws):
+        """Watch the game: a snapshot now, then batches (never part of the rotation)."""
+        with self.lock:
+            self.spectators.add(ws)
+            self._send_snapshot(ws)
+
+    def remove_spectator(self, ws):
+        with self.lock:
+            self.spectators.discard(ws)
 
-            dead = []
-            for other_ws in self.player_order:
-                if other_ws is ws:
-                    continue
-                try:
-                    other_ws.send(msg_json)
-                except Exception:
-                    dead.append(other_ws)
-            for other_ws in dead:
-                self.remove_player_internal(other_ws)
+    def flush_spectators(self):
+        """Send spectators what happened since the last call, as one shared frame.
+
+        Called spectator_flush_hz times per second. Players' frames were
+        already serialized by _broadcast, so the batch is just their
+        concatenation; it is sent outside the lock, so hundreds of
+        spectators never hold up a turn.
+        """
+        if not self.spectator_events and self.spectator_typing is None:
+            return
+        with self.lock:
+            events, self.spectator_events = self.spectator_events, []
+            typing, self.spectator_typing = self.spectator_typing, None
+            spectators = list(self.spectators)
+        if not spectators:
+            return
+        frame = '{"type": "BATCH", "events": [%s], "typing": %s}' % (",".join(events), json.dumps(typing))
+        dead = []
+        for ws in spectators:
+            try:
+                ws.send(frame)
+            except Exception:
+                dead.append(ws)
+        if dead:
+            with self.lock:
+                self.spectators.difference_update(dead)
 
     def vote_start(self, ws):
         """Record that this player voted to start. Start game when all have voted."""
@@ -173,131 +353,347 @@ class GameState:
             ):
                 return
             self.start_votes.add(ws)
-            self._broadcast_lobby()
+            self._broadcast_state({"type": "VOTE", "id": self.players[ws]["id"]})
             if len(self.start_votes) == len(self.player_order):
                 self._start_game()
 
     # ── Internal (must hold self.lock) ────────────────────────────
 
-    def _broadcast_lobby(self):
-        voted_names = [self.players[ws]["name"] for ws in self.player_order if ws in self.start_votes]
-        self._broadcast(
+    def _use_dictionary(self, dictionary):
+        self.dictionary = dictionary
+        self.spelling_dict = dictionary.spellings
+        self.spelling_dict_keys = dictionary.keys
+        self.answer_index = dictionary.answer_index(self.normalize_spellings)
+        self.questions = QuestionDeck(
+            dictionary.sampler_table(self.question_sampler, self.question_band),
+            no_repeat=self.question_no_repeat,
+            rng=self.rng,
+        )
+
+    def _refresh_dictionary(self):
+        """Between turns: follow the handle to its current version, if it changed.
+
+        The turn in flight keeps checking answers against the version its
+        question came from; once no game uses the old version it is freed.
+        """
+        handle = self.dictionary_handle
+        if handle is not None and handle.current is not self.dictionary:
+            self._use_dictionary(handle.current)
+
+    def _record(self, kind, ws, detail=None):
+        """Log a turn event for analytics.py (an append, see AnalyticsLog.record)."""
+        if self.analytics is None or self.game_id is None:
+            return
+        self.analytics.record(
+            self.game_id,
+            kind,
+            self.question,
+            self.players[ws]["id"] if ws in self.players else None,
+            self.scheduler.time() - self.turn_started_at,
+            detail,
+        )
+
+    def _send(self, ws, message):
+        try:
+            ws.send(self.encode(message))
+        except Exception:
+            pass
+
+    def _hold_seat(self, ws):
+        if ws not in self.disconnected:
+            self.disconnected[ws] = self._call_later(self.resume_grace_seconds, self._expire_seat, ws)
+            if self.is_running and self.player_order[self.current_turn % len(self.player_order)] is ws:
+                # Not from here: this may run in the middle of a broadcast
+                self._call_later(0, self._pass_held_turn, ws)
+
+    def _pass_held_turn(self, ws):
+        """The active player dropped: the bomb (and its fuse) moves on, no life lost."""
+        with self.lock:
+            if (
+                not self.is_running
+                or self.transition_timer
+                or ws not in self.disconnected
+                or self.player_order[self.current_turn % len(self.player_order)] is not ws
+            ):
+                return
+            self._advance_turn()
+            self._start_turn()
+
+    def _skip_held_seats(self):
+        """Move current_turn to the first seat not waiting for a RESUME (unchanged if all are)."""
+        count = len(self.player_order)
+        for step in range(count):
+            if self.player_order[(self.current_turn + step) % count] not in self.disconnected:
+                self.current_turn = (self.current_turn + step) % count
+                return
+
+    def _expire_seat(self, ws):
+        with self.lock:
+            if self.disconnected.pop(ws, None) is None:
+                return  # resumed in the meantime
+        self.remove_player(ws)
+
+    def _forget_seat(self, ws):
+        token = self.seat_tokens.pop(ws, None)
+        if token is not None:
+            del self.tokens[token]
+        timer = self.disconnected.pop(ws, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _connection_lost(self, ws):
+        """A send to a player failed: hold the seat if reconnecting is allowed."""
+        if self.resume_grace_seconds > 0 and ws in self.players:
+            self._hold_seat(ws)
+        else:
+            self.remove_player_internal(ws)
+
+    def _missed_since(self, last_seq):
+        """Frames of the deltas after last_seq, or None if history can't cover them."""
+        if not isinstance(last_seq, int) or last_seq > self.seq:
+            return None
+        if last_seq == self.seq:
+            return []
+        if not self.history or self.history[0][0] > last_seq + 1:
+            return None
+        return [frame for seq, frame in self.history if seq > last_seq]
+
+    def _reject_answer(self, ws, player_answer):
+        """Wrong answer: tell the player why, and burn the fuse unless it was a near miss."""
+        message = {"type": "Invalid"}
+        penalty = self.wrong_answer_penalty_seconds
+        # Not waited for under the game lock: no feedback until it is built.
+        index = self.dictionary.near_miss_index(wait=False) if self.near_miss_feedback else None
+        if index is not None:
+            # The index holds accent-folded spellings, whatever normalize_spellings says.
+            reason, detail = index.classify(
+                normalize_answer(player_answer), self.dictionary.answer_index(True)[self.question]
+            )
+            message["reason"] = reason
+            if reason == OTHER_SOUND:
+                message["sound"] = detail  # never the accepted spelling of a near miss
+            elif reason == NEAR and self.free_retries_left > 0:
+                self.free_retries_left -= 1
+                penalty = 0.0
+        if penalty > 0 and self._reduce_timer_by_seconds(penalty):
+            message["penalty"] = penalty
+        self._record(INVALID, ws, message.get("reason"))
+        self._send(ws, message)
+
+    def _send_typing(self, ws, text):
+        # Don't echo typing back to the sender (fixes solo self-echo).
+        msg_json = json.dumps(
             {
-                "type": "LOBBY",
-                "count": len(self.players),
-                "players": [self.players[ws]["name"] for ws in self.player_order],
-                "startVotes": voted_names,
+                "type": "TYPING",
+                "player": self.players[ws]["id"],
+                "text": text,
             }
         )
+        self.last_typing_text = text
+        self.typing_stats["flushed"] += 1
+        if self.spectators:
+            self.spectator_typing = {"player": self.players[ws]["id"], "text": text}
+
+        dead = []
+        disconnected = self.disconnected
+        for other_ws in self.player_order:
+            if other_ws is ws or (disconnected and other_ws in disconnected):
+                continue
+            try:
+                other_ws.send(msg_json)
+                self.typing_stats["frames_sent"] += 1
+            except Exception:
+                dead.append(other_ws)
+        for other_ws in dead:
+            self._connection_lost(other_ws)
+
+    def _snapshot(self):
+        """Full state, sent on JOIN and on RESYNC; deltas follow from seq + 1."""
+        active = None
+        if self.is_running and self.player_order:
+            active_ws = self.player_order[self.current_turn % len(self.player_order)]
+            active = self.players[active_ws]["id"]
+        return {
+            "type": "SNAPSHOT",
+            "seq": self.seq,
+            "running": self.is_running,
+            "players": [self.players[ws] for ws in self.player_order],
+            "startVotes": [self.players[ws]["id"] for ws in self.player_order if ws in self.start_votes],
+            "activePlayer": active,
+            "question": self.question if self.is_running else "",
+            "previousQuestion": self.previous_question,
+            "previousQuestionAnswers": self.previous_answers,
+            **self._fuse(),
+        }
+
+    def _send_snapshot(self, ws):
+        snapshot = self._snapshot()
+        snapshot["you"] = self.players[ws]["id"] if ws in self.players else None
+        if ws in self.spectators:
+            snapshot["spectator"] = True
+        try:
+            ws.send(self.encode(snapshot))
+        except Exception:
+            pass
 
     def _start_game(self):
+        if self.analytics is not None:
+            self.game_id = secrets.token_hex(8)
+            self.game_started_at = self.scheduler.time()
         self.is_running = True
         self.start_votes.clear()
         self.current_turn = 0
+        self.questions.reset()  # no question repeats within a game
         self._start_turn()
 
     def _end_game(self):
         if self.timer:
             self.timer.cancel()
             self.timer = None
+        if self.transition_timer:
+            self.transition_timer.cancel()
+            self.transition_timer = None
         self.timer_ends_at = None
         self.is_running = False
 
+        if self.analytics is not None and self.game_id is not None:
+            winner_id = next(iter(self.players.values()))["id"] if self.players else None
+            self.analytics.record(
+                self.game_id, GAME_OVER, player=winner_id, seconds=self.scheduler.time() - self.game_started_at
+            )
+            self.game_id = None
+
         if self.players:
             winner = list(self.players.values())[0]["name"]
-            self._broadcast({"type": "GAME_OVER", "winner": winner})
+            self._broadcast_state({"type": "GAME_OVER", "winner": winner})
 
     def _advance_turn(self):
         if self.player_order:
             self.current_turn = (self.current_turn + 1) % len(self.player_order)
 
     def _reduce_timer_by_seconds(self, seconds: float):
-        """Shorten the current turn timer by the given seconds. Caller must hold lock."""
-        if not self.timer or self.timer_ends_at is None:
-            return
-        self.timer.cancel()
-        self.timer = None
-        remaining = self.timer_ends_at - time.time() - seconds
-        remaining = max(1.0, remaining)
-        self.timer_ends_at = time.time() + remaining
-        self.timer = threading.Timer(remaining, self._handle_timeout)
-        self.timer.daemon = True
-        self.timer.start()
+        """Shorten the current turn timer by the given seconds; False if there was none. Caller must hold lock."""
+        if not self.timer or self.timer_ends_at is None or self._past_deadline():
+            return False
+        remaining = self.timer_ends_at - self.scheduler.time() - seconds
+        self._light_fuse(max(1.0, remaining))
+        self._broadcast_state({"type": "FUSE", **self._fuse()})
+        return True
+
+    def _light_fuse(self, duration):
+        """(Re)start the bomb fuse. Caller must hold lock."""
+        if self.timer:
+            self.timer.cancel()
+        self.fuse_id += 1
+        self.fuse_seconds = duration
+        self.timer_ends_at = self.scheduler.time() + duration
+        self.timer = self._call_later(duration + self.latency_grace_seconds, self._handle_timeout, self.fuse_id)
+
+    def _past_deadline(self):
+        """In the latency grace window: the fuse has burnt out, the explosion is pending."""
+        return self.timer is not None and self.scheduler.time() > self.timer_ends_at
+
+    def _fuse(self):
+        """Deadline (scheduler clock) and length of the fuse, in ms, for NEW_TURN, FUSE and SNAPSHOT."""
+        if self.timer is None:
+            return {"deadline": None, "fuse": None}
+        return {"deadline": round(self.timer_ends_at * 1000), "fuse": round(self.fuse_seconds * 1000)}
 
     def _start_turn(self):
         if not self.player_order:
             return
 
+        if self.transition_timer:
+            self.transition_timer.cancel()
+            self.transition_timer = None
+
+        # Players waiting to resume don't hold everyone up for a whole fuse
+        if self.disconnected:
+            self._skip_held_seats()
+
         # Save previous question before selecting new one
         if self.question:  # Only save if we had a previous question
             self.previous_question = self.question
             self.previous_answers = self.answers.copy()
 
-        self.question = random.choice(self.spelling_dict_keys)
+        self.pending_typing = None
+        self.last_typing_text = ""
+        self.spectator_typing = None
+        self.free_retries_left = self.near_miss_free_retries
+
+        self._refresh_dictionary()
+        self.question = self.spelling_dict_keys[self.questions.draw()]
         self.answers = self.spelling_dict[self.question]
 
         active_ws = self.player_order[self.current_turn % len(self.player_order)]
-        active_name = self.players[active_ws]["name"]
-        
-        print(self.answers)
-        self._broadcast(
+        self.turn_started_at = self.scheduler.time()
+        self._record(TURN, active_ws)
+
+        # Only start a new timer when there isn't one running (game start or after timeout).
+        # On valid answer we advance turn but keep the same bomb timer.
+        if self.timer is None:
+            self._light_fuse(self.rng.randint(self.timer_min_seconds, self.timer_max_seconds))
+
+        # Deltas only: the previous question is the one clients already show,
+        # the reveal is its answers.
+        self._broadcast_state(
             {
                 "type": "NEW_TURN",
                 "question": self.question,
-                "activePlayer": active_name,
-                "players": [
-                    {"name": self.players[ws]["name"], "lives": self.players[ws]["lives"]}
-                    for ws in self.player_order
-                ],
-                "previousAnswers": self.answers,
-                "previousQuestion": self.previous_question,
-                "previousQuestionAnswers": self.previous_answers,
+                "activePlayer": self.players[active_ws]["id"],
+                "reveal": self.previous_answers,
+                **self._fuse(),
             }
         )
 
-        # Only start a new timer when there isn't one running (game start or after timeout).
-        # On valid answer we advance turn but keep the same bomb timer.
-        # if self.timer is None:
-        #     duration = random.randint(self.timer_min_seconds, self.timer_max_seconds)
-        #     self.timer_ends_at = time.time() + duration
-        #     self.timer = threading.Timer(duration, self._handle_timeout)
-        #     self.timer.daemon = True
-        #     self.timer.start()
-
-    def _handle_timeout(self):
+    def _handle_timeout(self, fuse_id=None):
         with self.lock:
             if not self.is_running or not self.player_order:
                 return
+            if fuse_id is not None and fuse_id != self.fuse_id:
+                return  # fuse was replaced while this callback waited for the lock
 
             self.timer = None  # So next _start_turn() will start a fresh timer
 
             active_ws = self.player_order[self.current_turn % len(self.player_order)]
-            self.players[active_ws]["lives"] -= 1
+            player = self.players[active_ws]
+            player["lives"] -= 1
+            self._record(EXPLODE, active_ws, "eliminated" if player["lives"] <= 0 else None)
 
-            if self.players[active_ws]["lives"] <= 0:
-                dead_name = self.players[active_ws]["name"]
-                self._broadcast(
+            if player["lives"] <= 0:
+                self._broadcast_state(
                     {"type": "EXPLODE",
-                     "player": dead_name,
+                     "player": player["id"],
+                     "lives": player["lives"],
                      "eliminated": True
                 })
                 self.remove_player_internal(active_ws)
             else:
-                self._broadcast({
+                self._broadcast_state({
                     "type": "EXPLODE",
-                    "player": self.players[active_ws]["name"],
+                    "player": player["id"],
+                    "lives": player["lives"],
                     "eliminated": False,
                 })
                 self._advance_turn()
 
             if self.is_running:
-                t = threading.Timer(self.turn_transition_delay_seconds, self._safe_next_turn)
-                t.daemon = True
-                t.start()
+                self.transition_timer = self._call_later(
+                    self.turn_transition_delay_seconds, self._safe_next_turn
+                )
+
+    def resync(self, ws):
+        """Client detected a gap in seq: send it a fresh snapshot."""
+        with self.lock:
+            self._send_snapshot(ws)
 
     def remove_player_internal(self, ws):
         """Remove a player without re-acquiring the lock (already held)."""
-        self.players.pop(ws, None)
+        player = self.players.pop(ws, None)
+        if player is None:
+            return
+        self.start_votes.discard(ws)
+        self._forget_seat(ws)
         if ws in self.player_order:
             idx = self.player_order.index(ws)
             self.player_order.remove(ws)
@@ -306,21 +702,48 @@ class GameState:
             elif self.player_order:
                 self.current_turn = self.current_turn % len(self.player_order)
 
+        self._broadcast_state({"type": "PLAYER_LEFT", "id": player["id"]})
+
         if len(self.players) < 1:
             self._end_game()
 
     def _safe_next_turn(self):
         with self.lock:
+            if self.transition_timer is None:
+                return  # cancelled: a turn was started in the meantime
+            self.transition_timer = None
             if self.is_running:
                 self._start_turn()
 
+    def _call_later(self, delay, callback, *args):
+        if self.executor is not None:
+            return self.scheduler.call_later(delay, self.executor, callback, *args)
+        return self.scheduler.call_later(delay, callback, *args)
+
+    def _broadcast_state(self, message):
+        """Broadcast a state delta, tagged with the next sequence number."""
+        self.seq += 1
+        message["seq"] = self.seq
+        self.history.append((self.seq, self._broadcast(message)))
+
     def _broadcast(self, message):
-        msg_json = json.dumps(message)
+        t0 = time.perf_counter() if metrics.REGISTRY.enabled else None
+        msg_json = self.encode(message)
         dead = []
+        disconnected = self.disconnected
         for ws in self.player_order:
+            if disconnected and ws in disconnected:
+                continue  # seat held for a reconnect: it will replay from history
             try:
                 ws.send(msg_json)
             except Exception:
                 dead.append(ws)
+        if self.spectators:
+            self.spectator_events.append(msg_json)
+        if t0 is not None:
+            metrics.BROADCAST_SECONDS.observe(time.perf_counter() - t0)
+        if dead:
+            metrics.BROADCAST_FAILED_SENDS.inc(len(dead))
         for ws in dead:
-            self.remove_player_internal(ws)
+            self._connection_lost(ws)
+        return msg_json
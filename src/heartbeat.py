@@ -0,0 +1,135 @@
+"""Server-driven heartbeat: find dead connections without waiting for a send to fail.
+
+A client that vanishes without closing its socket (lost Wi-Fi, sleeping
+phone) is otherwise only noticed when a broadcast to it fails; until then
+it keeps its seat, its turn and, in threaded mode, a thread blocked in
+receive(). Every connection that has been silent for
+``heartbeat_interval_seconds`` gets a PING, which app.js answers with
+PONG. If nothing at all arrives within ``heartbeat_timeout_seconds`` after
+that, the connection is closed and the player removed from the game at
+once: no seat is held for a client that stopped answering, so the others
+don't wait out its turns.
+
+One reaper on the shared scheduler handles every connection. Connections
+sit in a timing wheel, in the slot of the tick at which they next need
+looking at. A tick only visits its own slot, so the cost per tick depends
+on how many connections are due, not on how many are open. Incoming
+frames only update Session.last_seen: they never touch the wheel.
+"""
+
+import math
+import threading
+import time
+import traceback
+
+from src import metrics
+from src.config import AppConfig
+
+PING = '{"type": "PING"}'
+
+
+class _Watched:
+    __slots__ = ("session", "close", "pinged_at", "slot")
+
+    def __init__(self, session, close):
+        self.session = session
+        self.close = close  # drops the transport; the server loop then cleans up
+        self.pinged_at = None
+        self.slot = None
+
+
+class Heartbeat:
+    """Pings silent connections and closes the ones that stay silent (timing wheel)."""
+
+    def __init__(self, config: AppConfig, scheduler, tick=1.0, clock=time.monotonic):
+        self.interval = config.heartbeat_interval_seconds
+        self.timeout = config.heartbeat_timeout_seconds
+        self.tick = tick
+        self.scheduler = scheduler
+        self.clock = clock
+        # A connection is never due more than interval + timeout ahead
+        self._slots = [set() for _ in range(math.ceil((self.interval + self.timeout) / tick) + 2)]
+        self._cursor = math.floor(clock() / tick)  # next tick to visit
+        self._watched = {}  # session → _Watched
+        self._lock = threading.Lock()
+        self._periodic = None
+        self.reaped = 0
+
+    @property
+    def enabled(self):
+        return self.interval > 0
+
+    def start(self):
+        if self.enabled and self._periodic is None:
+            self._periodic = self.scheduler.call_every(self.tick, self.sweep)
+
+    def stop(self):
+        if self._periodic is not None:
+            self._periodic.cancel()
+            self._periodic = None
+
+    def watch(self, session, close):
+        """Start watching a connection; ``close()`` (any thread) drops its transport."""
+        if not self.enabled:
+            return
+        entry = _Watched(session, close)
+        with self._lock:
+            self._watched[session] = entry
+            self._schedule(entry, session.last_seen + self.interval)
+
+    def forget(self, session):
+        with self._lock:
+            entry = self._watched.pop(session, None)
+            if entry is not None:
+                self._slots[entry.slot].discard(entry)
+
+    def __len__(self):
+        return len(self._watched)
+
+    def sweep(self, now=None):
+        """Visit the slots due by ``now``: ping, reschedule or close their connections."""
+        if now is None:
+            now = self.clock()
+        due = math.floor(now / self.tick)
+        pings, stale = [], []
+        with self._lock:
+            while self._cursor <= due:
+                index = self._cursor % len(self._slots)
+                entries, self._slots[index] = self._slots[index], set()
+                self._cursor += 1
+                for entry in entries:
+                    last_seen = entry.session.last_seen
+                    if entry.pinged_at is not None and entry.pinged_at >= last_seen:
+                        # Pinged, nothing back yet
+                        if now - entry.pinged_at >= self.timeout:
+                            del self._watched[entry.session]
+                            entry.session.reaped = True  # Session.close() removes the player
+                            stale.append(entry)
+                        else:
+                            self._schedule(entry, entry.pinged_at + self.timeout)
+                    elif now - last_seen >= self.interval:
+                        entry.pinged_at = now
+                        pings.append(entry)
+                        self._schedule(entry, now + self.timeout)
+                    else:
+                        self._schedule(entry, last_seen + self.interval)
+
+        # Outside the lock: sends only enqueue (outbound.py), closes may touch sockets.
+        for entry in pings:
+            try:
+                entry.session.ws.send(PING)
+            except Exception:
+                pass  # already closing
+        for entry in stale:
+            self.reaped += 1
+            metrics.HEARTBEAT_REAPED.inc()
+            try:
+                entry.close()
+            except Exception:
+                print(traceback.format_exc())
+
+    def _schedule(self, entry, when):
+        """File entry under the first tick at or after ``when`` still to be visited (holds self._lock)."""
+        tick = max(math.ceil(when / self.tick), self._cursor)
+        entry.slot = tick % len(self._slots)
+        self._slots[entry.slot].add(entry)
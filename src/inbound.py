@@ -0,0 +1,84 @@
+"""Per-connection inbound limits: frame size, message type, rate.
+
+Every frame a client sends ends up decoded and, for most types, handled
+under a game lock. Before any of that, InboundLimiter.check() looks at the
+raw frame:
+
+* longer than ``inbound_max_frame_bytes``: rejected (the servers also
+  refuse to buffer much more than that);
+* binary (flask-sock hands those over as bytes): rejected;
+* not starting with ``{"type": "<known type>"``: rejected, without
+  decoding the JSON (the client always sends the type first);
+* over its type's token bucket (``inbound_rates``: per second and burst):
+  dropped.
+
+Each rejection is a violation. A client with ``inbound_max_violations``
+of them within ``inbound_violation_window_seconds`` is disconnected. A
+legitimate client never comes close: app.js throttles TYPING and sends
+the rest on clicks and key presses.
+"""
+
+import re
+import time
+from collections import deque
+
+from src.config import AppConfig
+
+_TYPE_RE = re.compile(r'\s*\{\s*"type"\s*:\s*"([A-Z_]{1,32})"')
+
+TOO_LARGE = "too_large"
+MALFORMED = "malformed"
+RATE_LIMITED = "rate_limited"
+
+
+def message_type(data):
+    """The type a frame starts with, or None; the JSON is not decoded."""
+    match = _TYPE_RE.match(data, 0, 64)
+    return match.group(1) if match is not None else None
+
+
+class InboundLimiter:
+    """Token buckets per message type and a violation count, for one connection."""
+
+    def __init__(self, config: AppConfig, message_types, clock=time.monotonic):
+        self.max_frame_bytes = config.inbound_max_frame_bytes
+        self.max_violations = config.inbound_max_violations
+        self.violation_window = config.inbound_violation_window_seconds
+        self.message_types = message_types
+        self._clock = clock
+        now = clock()
+        # type → [tokens, last refill, rate, burst]; all start full
+        self._buckets = {
+            msg_type: [float(burst), now, float(rate), float(burst)]
+            for msg_type, (rate, burst) in config.inbound_rates.items()
+        }
+        self._violations = deque()  # clock() of recent violations
+
+    def check(self, data):
+        """(message type, None) if the frame may be handled, else (type or None, reason)."""
+        if len(data) > self.max_frame_bytes:
+            return None, TOO_LARGE
+        if not isinstance(data, str):
+            return None, MALFORMED
+        msg_type = message_type(data)
+        if msg_type not in self.message_types:
+            return None, MALFORMED
+        bucket = self._buckets.get(msg_type)
+        if bucket is not None:
+            now = self._clock()
+            tokens = min(bucket[3], bucket[0] + (now - bucket[1]) * bucket[2])
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                return msg_type, RATE_LIMITED
+            bucket[0] = tokens - 1.0
+        return msg_type, None
+
+    def violation(self):
+        """Count a rejected frame; True once the client should be disconnected."""
+        now = self._clock()
+        violations = self._violations
+        violations.append(now)
+        while violations and violations[0] <= now - self.violation_window:
+            violations.popleft()
+        return len(violations) >= self.max_violations
@@ -0,0 +1,314 @@
+"""Prometheus-text metrics, served at /metrics by both servers.
+
+Counters, gauges and histograms live in one process-wide REGISTRY. Timing
+instrumentation (handler latency, lock wait/hold, broadcast fan-out,
+scheduler lag) only runs while ``REGISTRY.enabled`` is set: the first
+scrape turns it on, and it turns itself off again once nobody has scraped
+for ``metrics_idle_seconds``. Until then a hot path pays one attribute
+check. Gauges are callbacks, evaluated at scrape time only.
+"""
+
+import bisect
+import threading
+import time
+
+# Seconds; spans lock waits (µs) to slow fan-outs (s).
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.label_names, values))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, label_names, values):
+        return [f"{name}{_format_labels(label_names, values)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def render(self, name, label_names, values):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = ("le", _format_value(bound))
+            lines.append(f"{name}_bucket{_format_labels(label_names, values, le)} {cumulative}")
+        labels = _format_labels(label_names, values)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+
+class Gauge(_Metric):
+    """Value computed at scrape time by a callback (or a dict of label → value)."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._callback = None
+
+    def set_function(self, callback):
+        self._callback = callback
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if self._callback is None:
+            return lines
+        try:
+            value = self._callback()
+        except Exception:
+            return lines
+        items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        for values, v in items:
+            values = values if isinstance(values, tuple) else (values,)
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {_format_value(v)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.enabled = False
+        self.idle_seconds = 300.0
+        self.last_scrape = None
+        self._metrics = []
+        self._expiry = None
+
+    def counter(self, name, help_text, labels=()):
+        return self._add(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._add(Gauge(name, help_text, labels))
+
+    def render(self):
+        """Prometheus text exposition; also (re)enables instrumentation."""
+        self.last_scrape = time.monotonic()
+        self.enabled = True
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def schedule_expiry(self, scheduler, idle_seconds):
+        """Turn instrumentation off after idle_seconds without a scrape."""
+        self.idle_seconds = idle_seconds
+        if self._expiry is None:
+            self._expiry = scheduler.call_every(max(1.0, idle_seconds / 4), self.expire)
+
+    def expire(self):
+        if self.last_scrape is not None and time.monotonic() - self.last_scrape > self.idle_seconds:
+            self.enabled = False
+
+    def _add(self, metric):
+        if not metric.label_names and not isinstance(metric, Gauge):
+            metric.labels()  # unlabeled series are exported from the start, at 0
+        self._metrics.append(metric)
+        return metric
+
+
+REGISTRY = Registry()
+
+
+# ── Metrics ───────────────────────────────────────────────────────
+
+HANDLER_SECONDS = REGISTRY.histogram(
+    "bomb_ws_handler_seconds", "Time to handle one client message, by message type.", ("type",)
+)
+LOCK_WAIT_SECONDS = REGISTRY.histogram("bomb_game_lock_wait_seconds", "Time spent waiting for a GameState lock.")
+LOCK_HOLD_SECONDS = REGISTRY.histogram("bomb_game_lock_hold_seconds", "Time a GameState lock was held.")
+BROADCAST_SECONDS = REGISTRY.histogram("bomb_broadcast_seconds", "Time to fan one frame out to a room.")
+BROADCAST_FAILED_SENDS = REGISTRY.counter(
+    "bomb_broadcast_failed_sends_total", "Broadcast sends that failed (the player is dropped)."
+)
+GAME_COMMAND_WAIT_SECONDS = REGISTRY.histogram(
+    "bomb_game_command_wait_seconds", "Actor mode: time a command waited in its game's inbox."
+)
+SCHEDULER_LAG_SECONDS = REGISTRY.histogram(
+    "bomb_scheduler_lag_seconds", "Delay between a timer's deadline and its callback running."
+)
+INBOUND_REJECTED = REGISTRY.counter(
+    "bomb_inbound_rejected_total", "Client frames refused before handling, by reason.", ("reason",)
+)
+INBOUND_DISCONNECTS = REGISTRY.counter(
+    "bomb_inbound_disconnects_total", "Clients disconnected for sending too many refused frames."
+)
+HEARTBEAT_REAPED = REGISTRY.counter(
+    "bomb_heartbeat_reaped_total", "Connections closed for not answering PING."
+)
+LATE_ANSWERS = REGISTRY.counter(
+    "bomb_late_answers_total", "SUBMITs handled after the fuse deadline, by outcome.", ("outcome",)
+)
+CONNECTIONS = REGISTRY.gauge("bomb_connections", "Open WebSocket connections.")
+ROOMS = REGISTRY.gauge("bomb_rooms", "Rooms, by state.", ("state",))
+PLAYERS = REGISTRY.gauge("bomb_players", "Players seated in a room.")
+SPECTATORS = REGISTRY.gauge("bomb_spectators", "Connections watching a room.")
+DICTIONARY_BYTES = REGISTRY.gauge(
+    "bomb_dictionary_bytes", "Estimated memory footprint of a loaded dictionary.", ("dictionary",)
+)
+DICTIONARY_LOAD_SECONDS = REGISTRY.gauge(
+    "bomb_dictionary_load_seconds", "Time it took to load and prepare a dictionary.", ("dictionary",)
+)
+SCHEDULER_TIMERS = REGISTRY.gauge("bomb_scheduler_timers", "Pending timers.")
+TYPING_FRAMES = REGISTRY.gauge("bomb_typing_frames", "TYPING relay counters since start.", ("kind",))
+
+_connections = 0
+_connections_lock = threading.Lock()
+
+
+def connection_opened():
+    global _connections
+    with _connections_lock:
+        _connections += 1
+
+
+def connection_closed():
+    global _connections
+    with _connections_lock:
+        _connections -= 1
+
+
+CONNECTIONS.set_function(lambda: _connections)
+
+
+def track(rooms):
+    """Register the scrape-time gauges of a RoomManager and its scheduler."""
+
+    def room_states():
+        listing = rooms.list_rooms()
+        running = sum(1 for room in listing if room["running"])
+        return {"running": running, "waiting": len(listing) - running}
+
+    ROOMS.set_function(room_states)
+    PLAYERS.set_function(lambda: sum(room["players"] for room in rooms.list_rooms()))
+    SPECTATORS.set_function(lambda: sum(room["spectators"] for room in rooms.list_rooms()))
+    DICTIONARY_BYTES.set_function(lambda: {d["name"]: d["bytes"] for d in rooms.dictionary_stats()})
+    DICTIONARY_LOAD_SECONDS.set_function(
+        lambda: {d["name"]: d["loadSeconds"] for d in rooms.dictionary_stats() if d["loadSeconds"] is not None}
+    )
+    SCHEDULER_TIMERS.set_function(lambda: len(rooms.scheduler))
+    TYPING_FRAMES.set_function(rooms.typing_stats)
+
+
+class InstrumentedLock:
+    """threading.Lock that records wait and hold times while metrics are on."""
+
+    __slots__ = ("_lock", "_acquired_at")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._acquired_at = None
+
+    def acquire(self, blocking=True, timeout=-1):
+        if not REGISTRY.enabled:
+            return self._lock.acquire(blocking, timeout)
+        t0 = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            self._acquired_at = now = time.perf_counter()
+            LOCK_WAIT_SECONDS.observe(now - t0)
+        return acquired
+
+    def release(self):
+        acquired_at, self._acquired_at = self._acquired_at, None
+        self._lock.release()
+        if acquired_at is not None:
+            LOCK_HOLD_SECONDS.observe(time.perf_counter() - acquired_at)
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
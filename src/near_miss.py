@@ -0,0 +1,249 @@
+"""Near-miss index: why a wrong answer was wrong, in a few microseconds.
+
+Covers every normalized spelling of the dictionary. For a guess it can tell
+the words at most one edit away (insertion, deletion, substitution or
+transposition), SymSpell-style: each word is stored under itself and each
+of its one-character deletions, so the neighbours of a guess are found by
+looking up the guess and its own deletions, then checked exactly. It also
+knows which sound (question) a word belongs to.
+
+The index is built offline next to the dictionary (``<stem>.near``, by
+``make dictionary``, build_lexique or ``python -m src.near_miss``) and
+mmap-ed on first use. Layout (little-endian, 4-byte aligned sections)::
+
+    header      magic "PTBN", version, n_words, n_strings, n_entries,
+                then the byte offset of each section below
+    str_offsets u32[n_strings + 1]   slices of str_pool
+    str_pool    utf-8 bytes          words (sorted), then question keys
+    word_key    u32[n_words]         string id of one question of each word
+    del_hash    u64[n_entries]       sorted hashes of words and their deletions
+    del_word    u32[n_entries]       word id of each hash
+"""
+
+import argparse
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from src.utils import normalize_answer
+
+MAGIC = b"PTBN"
+VERSION = 1
+NEAR_MISS_SUFFIX = ".near"
+
+_HEADER = struct.Struct("<4sIIII6Q")
+
+# Reasons sent with an Invalid frame
+NEAR = "near"  # one edit away from an accepted spelling
+OTHER_SOUND = "other_sound"  # a real word, for another question
+UNKNOWN = "unknown"
+
+
+def near_miss_path_for(path):
+    """Path of the near-miss index that sits next to a JSON or compiled dictionary."""
+    return os.path.splitext(path)[0] + NEAR_MISS_SUFFIX
+
+
+def _hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _variants(word):
+    """The word and its one-character deletions."""
+    yield word
+    for i in range(len(word)):
+        yield word[:i] + word[i + 1 :]
+
+
+def within_one_edit(a, b):
+    """Optimal string alignment distance(a, b) <= 1."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1 :] == b[i + 1 :] or (
+            i + 1 < la and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2 :] == b[i + 2 :]
+        )
+    if la > lb:
+        return a[i + 1 :] == b[i:]
+    return a[i:] == b[i + 1 :]
+
+
+# ── Writer ────────────────────────────────────────────────────────
+
+def build_near_miss_index(spelling_dict):
+    """Return the index for spelling_dict ({ipa: [spellings]}) as bytes."""
+    word_keys = {}
+    for key in spelling_dict:
+        for spelling in spelling_dict[key]:
+            word_keys.setdefault(normalize_answer(spelling), key)
+    words = sorted(word_keys, key=lambda w: w.encode("utf-8"))
+
+    strings = list(words)
+    key_ids = {}
+    word_key = []
+    for word in words:
+        key = word_keys[word]
+        if key not in key_ids:
+            key_ids[key] = len(strings)
+            strings.append(key)
+        word_key.append(key_ids[key])
+
+    entries = sorted(
+        {(_hash(variant), word_id) for word_id, word in enumerate(words) for variant in _variants(word)}
+    )
+
+    encoded = [s.encode("utf-8") for s in strings]
+    str_offsets = [0]
+    for b in encoded:
+        str_offsets.append(str_offsets[-1] + len(b))
+
+    sections = [
+        struct.pack(f"<{len(str_offsets)}I", *str_offsets),
+        b"".join(encoded),
+        struct.pack(f"<{len(word_key)}I", *word_key),
+        struct.pack(f"<{len(entries)}Q", *(h for h, _ in entries)),
+        struct.pack(f"<{len(entries)}I", *(w for _, w in entries)),
+    ]
+    offsets = []
+    pos = _HEADER.size
+    for section in sections:
+        pos = (pos + 7) & ~7
+        offsets.append(pos)
+        pos += len(section)
+    offsets.append(pos)
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(words), len(strings), len(entries), *offsets))
+    for offset, section in zip(offsets, sections):
+        out += b"\0" * (offset - len(out))
+        out += section
+    return bytes(out)
+
+
+def write_near_miss_index(spelling_dict, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(build_near_miss_index(spelling_dict))
+    os.replace(tmp_path, path)
+    return path
+
+
+# ── Reader ────────────────────────────────────────────────────────
+
+class NearMissIndex:
+    """Read-only index over bytes (built in memory) or an mmap-ed .near file."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        magic, version, n_words, n_strings, n_entries, *offsets = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a near-miss index (version {VERSION})")
+
+        self.n_words = n_words
+        self._str_offsets = self._array(offsets[0], "I", n_strings + 1)
+        self._pool_base = offsets[1]
+        self._word_key = self._array(offsets[2], "I", n_words)
+        self._del_hash = self._array(offsets[3], "Q", n_entries)
+        self._del_word = self._array(offsets[4], "I", n_entries)
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _array(self, offset, fmt, count):
+        size = struct.calcsize(fmt)
+        view = memoryview(self._buffer)[offset : offset + size * count]
+        if sys.byteorder == "little":
+            return view.cast(fmt)
+        return struct.unpack(f"<{count}{fmt}", view)
+
+    def _string(self, sid):
+        start = self._pool_base + self._str_offsets[sid]
+        end = self._pool_base + self._str_offsets[sid + 1]
+        return bytes(self._buffer[start:end]).decode("utf-8")
+
+    def neighbours(self, word):
+        """Dictionary words within one edit of word (normalized), word itself included."""
+        found = set()
+        hashes = self._del_hash
+        for variant in set(_variants(word)):
+            h = _hash(variant)
+            i = bisect.bisect_left(hashes, h)
+            while i < len(hashes) and hashes[i] == h:
+                candidate = self._string(self._del_word[i])
+                if within_one_edit(word, candidate):
+                    found.add(candidate)
+                i += 1
+        return found
+
+    def sound_of(self, word):
+        """A question (ipa) that word answers, or None if it is not a dictionary word."""
+        lo, hi = 0, self.n_words
+        target = word.encode("utf-8")
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._pool_base + self._str_offsets[mid]
+            end = self._pool_base + self._str_offsets[mid + 1]
+            if bytes(self._buffer[start:end]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_words and self._string(lo) == word:
+            return self._string(self._word_key[lo])
+        return None
+
+    def classify(self, guess, accepted):
+        """Why guess (normalized) is not in accepted: (reason, detail).
+
+        NEAR with the accepted spelling it nearly is, OTHER_SOUND with the
+        question it does answer, or UNKNOWN.
+        """
+        near = sorted(self.neighbours(guess) & accepted)
+        if near:
+            return NEAR, near[0]
+        sound = self.sound_of(guess)
+        if sound is not None:
+            return OTHER_SOUND, sound
+        return UNKNOWN, None
+
+    def close(self):
+        for attr in ("_str_offsets", "_word_key", "_del_hash", "_del_word"):
+            view = getattr(self, attr)
+            if isinstance(view, memoryview):
+                view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+# ── CLI ───────────────────────────────────────────────────────────
+
+def main(argv=None):
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the near-miss index of a JSON dictionary")
+    parser.add_argument("json_file", help="dictionary in {ipa: [spellings]} JSON format")
+    parser.add_argument("-o", "--output", help="output path (default: next to the JSON file)")
+    args = parser.parse_args(argv)
+
+    output = args.output or near_miss_path_for(args.json_file)
+    with open(args.json_file, "r", encoding="utf-8") as f:
+        spelling_dict = json.load(f)
+
+    t0 = time.perf_counter()
+    write_near_miss_index(spelling_dict, output)
+    elapsed = time.perf_counter() - t0
+    print(f"Wrote {output}: {os.path.getsize(output) / 1024:.0f} KiB in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Per-connection outbound queues.
+
+Game logic must never wait for the network: GameState calls ``send()``
+while holding its lock. An OutboundQueue takes the pre-serialized frame,
+appends it to a bounded queue and returns; a writer (thread or coroutine,
+depending on the server mode) drains it onto the real socket.
+
+Overflow policy, when a client does not keep up:
+
+* TYPING frames are stale as soon as the next one exists, so they are the
+  first to go (``outbound_drop_typing``);
+* other frames are kept, but a client whose queue stays full for longer
+  than ``outbound_max_lag_seconds`` (or reaches twice the bound) is
+  disconnected, and ``send()`` raises so the game drops the player.
+"""
+
+import abc
+import threading
+import time
+from collections import deque
+
+from src.config import AppConfig
+
+# GameState serializes dicts whose first key is "type".
+TYPING_PREFIX = '{"type": "TYPING"'
+
+
+class OutboundQueue(abc.ABC):
+    """Bounded, thread-safe frame queue. Subclasses provide the writer."""
+
+    def __init__(self, config: AppConfig):
+        self.max_frames = config.outbound_queue_frames
+        self.max_lag_seconds = config.outbound_max_lag_seconds
+        self.drop_typing = config.outbound_drop_typing
+
+        self._frames = deque()
+        self._lock = threading.Lock()
+        self._behind_since = None  # monotonic time the queue first overflowed
+        self.closed = False
+        self.dropped_frames = 0
+
+    # ── Called by game logic (any thread) ─────────────────────────
+
+    def send(self, frame):
+        with self._lock:
+            if self.closed:
+                raise ConnectionError("connection closed")
+
+            if len(self._frames) >= self.max_frames and not self._make_room(frame):
+                self.dropped_frames += 1
+                return
+
+            self._frames.append(frame)
+            overflowing = self._check_lag()
+
+        if overflowing:
+            self.close()
+            raise ConnectionError("client too slow, disconnected")
+        self._wake()
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._frames.clear()
+        self._wake()
+
+    # ── Called by the writer ──────────────────────────────────────
+
+    def take_all(self):
+        """Pop every queued frame (may be empty)."""
+        with self._lock:
+            frames = list(self._frames)
+            self._frames.clear()
+            self._behind_since = None
+            return frames
+
+    # ── Internal (must hold self._lock) ───────────────────────────
+
+    def _make_room(self, frame):
+        """Queue is full. Returns False if frame itself should be dropped."""
+        if not self.drop_typing:
+            return True
+        for i, queued in enumerate(self._frames):
+            if queued.startswith(TYPING_PREFIX):
+                del self._frames[i]
+                self.dropped_frames += 1
+                return True
+        # Only state frames queued: a new TYPING frame is the cheapest loss.
+        return not frame.startswith(TYPING_PREFIX)
+
+    def _check_lag(self):
+        """Track how long the queue has been over its bound; True → disconnect."""
+        if len(self._frames) <= self.max_frames:
+            return False
+        now = time.monotonic()
+        if self._behind_since is None:
+            self._behind_since = now
+        return (
+            now - self._behind_since > self.max_lag_seconds
+            or len(self._frames) >= 2 * self.max_frames
+        )
+
+    @abc.abstractmethod
+    def _wake(self):
+        """Tell the writer there is something to drain (or that we closed)."""
+
+
+class ThreadedOutbound(OutboundQueue):
+    """Outbound queue drained by a dedicated writer thread (threaded server)."""
+
+    def __init__(self, ws, config: AppConfig):
+        super().__init__(config)
+        self.ws = ws
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def _wake(self):
+        self._ready.set()
+
+    def _writer(self):
+        try:
+            while True:
+                self._ready.wait()
+                self._ready.clear()
+                for frame in self.take_all():
+                    self.ws.send(frame)
+                if self.closed:
+                    break
+        except Exception:
+            self.closed = True
+        try:
+            self.ws.close()
+        except Exception:
+            pass
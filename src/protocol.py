@@ -0,0 +1,206 @@
+"""WebSocket protocol handling shared by the threaded and asyncio servers."""
+
+import json
+import math
+import time
+
+from src import metrics
+from src.config import AppConfig
+from src.dictionary_registry import DictionaryUnavailable, UnknownDictionary
+from src.inbound import MALFORMED, InboundLimiter, message_type
+from src.rooms import RoomFull, RoomManager, clean_room_id
+
+MESSAGE_TYPES = frozenset(
+    ("LIST_ROOMS", "CREATE_ROOM", "JOIN", "RESUME", "SUBMIT", "PASS", "TYPING", "VOTE_START", "RESYNC", "PONG", "CLOCK")
+)
+
+# May take seconds (CREATE_ROOM can load a dictionary): async_server.py
+# handles these off the event loop, see Session.may_block
+BLOCKING_TYPES = frozenset(("CREATE_ROOM",))
+
+MAX_TEXT_LENGTH = 64  # SUBMIT answer, TYPING text: longer than any word
+
+
+class Session:
+    """Protocol state of one /ws connection.
+
+    ``ws`` is anything with a ``send(str)`` method; it is also the player's
+    identity inside GameState.
+    """
+
+    def __init__(self, ws, rooms: RoomManager, config: AppConfig):
+        self.ws = ws
+        self.rooms = rooms
+        self.config = config
+        self.room_id = None
+        self.game = None
+        self.spectating = False
+        self.limiter = InboundLimiter(config, MESSAGE_TYPES)
+        self.last_seen = time.monotonic()  # any frame counts as a heartbeat
+        self.reaped = False  # closed by the heartbeat: the client is gone for good
+
+    def may_block(self, data):
+        """True if handling this frame may take seconds; threaded servers don't care."""
+        return isinstance(data, str) and message_type(data) in BLOCKING_TYPES
+
+    def handle_message(self, data):
+        """Handle one client frame; False once the client must be disconnected (flooding)."""
+        self.last_seen = time.monotonic()
+        _, rejected = self.limiter.check(data)
+        if rejected is not None:
+            return self._reject(rejected)
+        t0 = time.perf_counter() if metrics.REGISTRY.enabled else None
+        try:
+            msg = json.loads(data)
+        except ValueError:
+            msg = None
+        msg_type = self._dispatch(msg) if isinstance(msg, dict) else None
+        if msg_type is None:
+            return self._reject(MALFORMED)  # past the prefix check, but not valid
+        if t0 is not None:
+            label = msg_type if msg_type in MESSAGE_TYPES else "other"  # bounded label set
+            metrics.HANDLER_SECONDS.labels(label).observe(time.perf_counter() - t0)
+        return True
+
+    def _reject(self, reason):
+        """Count a refused frame; False once the client must be disconnected (flooding)."""
+        metrics.INBOUND_REJECTED.labels(reason).inc()
+        if self.limiter.violation():
+            metrics.INBOUND_DISCONNECTS.inc()
+            self._reply({"type": "ERROR", "reason": "flooding"})
+            return False
+        return True
+
+    def _dispatch(self, msg):
+        """Handle one decoded frame; returns its message type, or None if a field is invalid."""
+        msg_type = msg.get("type")
+        ws = self.ws
+        game = self.game
+
+        if msg_type == "PONG":
+            pass  # last_seen is all the heartbeat needs
+
+        elif msg_type == "CLOCK":
+            # Clock sync: the client derives its offset to the fuse deadlines
+            # (scheduler clock, ms) and the round trip from t0 and its own clock.
+            t0 = msg.get("t0")
+            self._reply(
+                {
+                    "type": "CLOCK",
+                    "t0": t0 if _is_number(t0) else None,
+                    "server": round(self.rooms.scheduler.time() * 1000),
+                }
+            )
+
+        elif msg_type == "LIST_ROOMS":
+            # Named dictionaries a new room can pick (CREATE_ROOM settings)
+            dictionaries = sorted(self.config.dictionaries)
+            self._reply({"type": "ROOMS", "rooms": self.rooms.lobby(), "dictionaries": dictionaries})
+
+        elif msg_type == "CREATE_ROOM":
+            room_id = clean_room_id(msg.get("room"), None)
+            redirect = self.rooms.redirect(room_id) if room_id is not None else None
+            if redirect is not None:
+                self._reply(redirect)
+                return msg_type
+            try:
+                new_id = self.rooms.create_room(room_id, msg.get("settings"))
+            except RoomFull:
+                self._reply({"type": "ERROR", "reason": "too_many_rooms"})
+            except UnknownDictionary:
+                self._reply({"type": "ERROR", "reason": "unknown_dictionary"})
+            except DictionaryUnavailable:
+                self._reply({"type": "ERROR", "reason": "dictionary_unavailable"})
+            else:
+                self._reply({"type": "ROOM_CREATED", "room": new_id})
+
+        elif msg_type == "JOIN":
+            game = self._enter_room(msg.get("room"))
+            if game is None:
+                return msg_type
+            self.spectating = msg.get("spectate") is True
+            self._reply({"type": "JOINED", "room": self.room_id, "spectator": self.spectating})
+            if self.spectating:
+                game.add_spectator(ws)
+            else:
+                game.add_player(ws, msg.get("name", "Anonyme"))
+
+        elif msg_type == "RESUME":
+            # Reconnect with the WELCOME token; the game answers RESUMED or RESUME_FAILED.
+            game = self._enter_room(msg.get("room"))
+            if game is None:
+                return msg_type
+            token = msg.get("token")
+            game.resume(ws, token if isinstance(token, str) else "", msg.get("lastSeq"))
+
+        elif game is None:
+            pass
+
+        elif msg_type == "RESYNC":
+            game.resync(ws)
+
+        elif self.spectating:
+            pass  # watchers can't play
+
+        elif msg_type == "SUBMIT":
+            answer = msg.get("answer")
+            if not isinstance(answer, str) or len(answer) > MAX_TEXT_LENGTH:
+                return None
+            sent_at = msg.get("at")  # client's estimate of the scheduler clock, ms
+            if answer:
+                game.submit_answer(ws, answer, sent_at / 1000 if _is_number(sent_at) else None)
+
+        elif msg_type == "PASS":
+            game.pass_turn(ws)
+
+        elif msg_type == "TYPING":
+            text = msg.get("text", "")
+            if not isinstance(text, str):
+                return None
+            game.broadcast_typing(ws, text[:MAX_TEXT_LENGTH])
+
+        elif msg_type == "VOTE_START":
+            game.vote_start(ws)
+
+        return msg_type
+
+    def close(self):
+        """Connection is gone: release the room; the seat waits resume_grace_seconds,
+        unless the heartbeat found the client dead (then it is freed at once)."""
+        self._leave_room(disconnected=not self.reaped)
+
+    def _enter_room(self, room):
+        """Leave the current room and join another; None if the server is full
+        or if another worker of the cluster hosts it (the client is redirected).
+        """
+        self._leave_room()
+        new_id = clean_room_id(room, self.config.default_room)
+        redirect = self.rooms.redirect(new_id)
+        if redirect is not None:
+            self._reply(redirect)
+            return None
+        try:
+            game = self.rooms.join(new_id)
+        except RoomFull:
+            self._reply({"type": "ERROR", "reason": "too_many_rooms"})
+            return None
+        self.room_id, self.game, self.spectating = new_id, game, False
+        return game
+
+    def _leave_room(self, disconnected=False):
+        if self.game is not None:
+            if self.spectating:
+                self.game.remove_spectator(self.ws)
+            elif disconnected:
+                self.game.disconnect_player(self.ws)
+            else:
+                self.game.remove_player(self.ws)
+            self.rooms.leave(self.room_id)
+            self.room_id = self.game = None
+
+    def _reply(self, message):
+        self.ws.send(json.dumps(message))
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
@@ -0,0 +1,299 @@
+import random
+import string
+import threading
+import time
+
+from src.analytics import AnalyticsLog
+from src.config import AppConfig, room_config
+from src.dictionary import Dictionary
+from src.dictionary_registry import DEFAULT, DictionaryRegistry
+from src.game_loop import GameActor, GameLoop
+from src.game_state import GameState
+from src.heartbeat import Heartbeat
+from src.scheduler import Scheduler, get_scheduler
+
+ROOM_ID_MAX_LENGTH = 32
+_ROOM_ID_ALPHABET = string.ascii_uppercase + string.digits
+
+
+class RoomFull(Exception):
+    """Raised when creating a room would exceed AppConfig.max_rooms."""
+
+
+class Room:
+    def __init__(self, room_id, game, handle=None, dictionary=DEFAULT):
+        self.id = room_id
+        self.game = game
+        self.dictionary = dictionary  # name in the DictionaryRegistry
+        self.handle = handle or game  # what sessions call: the GameState, or its GameActor
+        self.connections = 0  # sockets that joined (or are joining) this room
+        self.idle_since = time.monotonic()
+
+
+class RoomManager:
+    """Owns every game of the server: one GameState (and lock) per room.
+
+    Rooms share read-only Dictionaries from a DictionaryRegistry, through
+    DictionaryHandles so that they can be reloaded while they play. The
+    default one is ``dictionary``; it may also be a ready-made registry.
+    The manager lock only
+    guards the room table; game logic runs under each room's own lock, or,
+    in actor mode, on the GameLoop the room is assigned to.
+    """
+
+    def __init__(self, dictionary, config: AppConfig | None = None, scheduler: Scheduler | None = None):
+        if config is None:
+            config = AppConfig()
+        if scheduler is None:
+            scheduler = get_scheduler()
+        if not isinstance(dictionary, DictionaryRegistry):
+            dictionary = DictionaryRegistry(config, default=dictionary)
+
+        self.lock = threading.Lock()
+        self.rooms = {}  # room id → Room
+        self.registry = dictionary
+        self.registry.prepare = self._prepare
+        self.dictionary = dictionary.default  # DictionaryHandle, see reload_dictionary
+        self.config = config
+        self.scheduler = scheduler
+        self.heartbeat = Heartbeat(config, scheduler)  # the servers register each connection
+        self._periodic = []
+        self.cluster = None  # ClusterWorker when run by src.cluster
+        self.analytics = None  # shared by every game, see analytics.py
+        if config.analytics_file:
+            self.analytics = AnalyticsLog(
+                config.analytics_file, config.analytics_flush_seconds, config.analytics_buffer_events
+            )
+        self.loops = []
+        if config.game_mode == "actor":
+            self.loops = [
+                GameLoop(name=f"game-loop-{i}", batch_size=config.game_loop_batch)
+                for i in range(config.game_loops)
+            ]
+        self._next_loop = 0
+
+    def start(self):
+        """Schedule the periodic jobs shared by every room: typing and spectator flush, idle GC."""
+        if self._periodic:
+            return
+        # Build the shared lookup tables now rather than under self.lock on
+        # the first JOIN (the answer index takes seconds on a full dictionary).
+        self._prepare(self.dictionary.current, wait_near_miss=False)
+        self.registry.measure()
+        for loop in self.loops:
+            loop.start()
+        if self.analytics is not None:
+            self.analytics.start()
+        self.heartbeat.start()
+        if self.config.typing_flush_hz > 0:
+            self._periodic.append(
+                self.scheduler.call_every(1.0 / self.config.typing_flush_hz, self._flush_typing)
+            )
+        self._periodic.append(
+            self.scheduler.call_every(1.0 / self.config.spectator_flush_hz, self._flush_spectators)
+        )
+        gc_interval = min(60.0, max(1.0, self.config.room_idle_timeout_seconds / 2))
+        self._periodic.append(self.scheduler.call_every(gc_interval, self.collect_idle))
+
+    def stop(self):
+        for handle in self._periodic:
+            handle.cancel()
+        self._periodic = []
+        self.heartbeat.stop()
+        for loop in self.loops:
+            loop.stop()
+        if self.analytics is not None:
+            self.analytics.stop()
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def create_room(self, room_id=None, settings=None):
+        """Create a room (random id if none given) and return its id.
+
+        ``settings`` are per-room config overrides, see config.room_config(),
+        plus ``dictionary``, a name from config.dictionaries (raises
+        UnknownDictionary). They only apply if the room does not exist yet.
+        """
+        name = settings.get("dictionary") if isinstance(settings, dict) else None
+        if not isinstance(name, str) or not name:
+            name = DEFAULT
+        # Loading a dictionary takes seconds: not under self.lock
+        handle = self.registry.acquire(name)
+        try:
+            with self.lock:
+                self._collect_idle()
+                if room_id is None:
+                    room_id = self._new_room_id()
+                if room_id not in self.rooms:
+                    self._get_or_create(room_id, settings, name, handle)
+                    handle = None  # now the room's
+                return room_id
+        finally:
+            if handle is not None:
+                self.registry.release(name)
+
+    def join(self, room_id):
+        """Attach a connection to a room, creating it if needed.
+
+        Returns the GameState, or in actor mode the GameActor that posts to it.
+        """
+        with self.lock:
+            self._collect_idle()
+            room = self._get_or_create(room_id)
+            room.connections += 1
+            return room.handle
+
+    def leave(self, room_id):
+        """Detach a connection; the room becomes collectable once empty and idle."""
+        with self.lock:
+            room = self.rooms.get(room_id)
+            if room is None:
+                return
+            room.connections -= 1
+            if room.connections <= 0:
+                room.connections = 0
+                room.idle_since = time.monotonic()
+            self._collect_idle()
+
+    def list_rooms(self):
+        with self.lock:
+            self._collect_idle()
+            return [
+                {
+                    "id": room.id,
+                    "players": len(room.game.players),
+                    "spectators": len(room.game.spectators),
+                    "dictionary": room.dictionary,
+                    "running": room.game.is_running,
+                }
+                for room in self.rooms.values()
+            ]
+
+    def lobby(self):
+        """Rooms of the whole cluster for LIST_ROOMS; list_rooms() when not clustered."""
+        local = self.list_rooms()
+        if self.cluster is None:
+            return local
+        return self.cluster.rooms(local)
+
+    def publish(self):
+        """Share this worker's rooms with the cluster (scheduled by src.cluster)."""
+        if self.cluster is not None:
+            self.cluster.publish(self.list_rooms())
+
+    def redirect(self, room_id):
+        """REDIRECT frame if another worker hosts room_id, else None."""
+        if self.cluster is None:
+            return None
+        return self.cluster.redirect(room_id)
+
+    def reload_dictionary(self, filename):
+        """Load src/data/<filename> in the background and switch every room to it.
+
+        Idle rooms switch at once, running games at their next turn. Returns
+        False if the previous version is still in use or a reload is loading.
+        """
+
+        def load():
+            dictionary = Dictionary.from_file(filename)
+            self._prepare(dictionary)
+            return dictionary
+
+        def on_swap(dictionary):
+            self.registry.measure()
+            self._refresh_idle_games(dictionary)
+
+        return self.dictionary.reload(load, on_swap=on_swap) is not None
+
+    def dictionary_stats(self):
+        """Footprint and load time of every loaded dictionary, see DictionaryRegistry.stats()."""
+        return self.registry.stats()
+
+    def typing_stats(self):
+        """TYPING counters summed over every room."""
+        with self.lock:
+            games = [room.game for room in self.rooms.values()]
+        totals = {"received": 0, "flushed": 0, "frames_sent": 0, "frames_saved": 0}
+        for game in games:
+            for key, value in game.typing_stats.items():
+                totals[key] += value
+        return totals
+
+    def collect_idle(self):
+        with self.lock:
+            self._collect_idle()
+
+    def _flush_typing(self):
+        with self.lock:
+            handles = [room.handle for room in self.rooms.values()]
+        for handle in handles:
+            handle.flush_typing()
+
+    def _prepare(self, dictionary, wait_near_miss=True):
+        dictionary.answer_index(self.config.normalize_spellings)
+        dictionary.sampler_table(self.config.question_sampler, self.config.question_band)
+        if self.config.near_miss_feedback:
+            # _reject_answer() classifies against the accent-folded index.
+            dictionary.answer_index(True)
+            # May have to be built in memory; without wait_near_miss, startup
+            # goes on and games skip near-miss feedback until it is ready.
+            dictionary.near_miss_index(wait=wait_near_miss)
+
+    def _refresh_idle_games(self, dictionary):
+        with self.lock:
+            handles = [room.handle for room in self.rooms.values()]
+        for handle in handles:
+            handle.refresh_dictionary()
+
+    def _flush_spectators(self):
+        with self.lock:
+            handles = [room.handle for room in self.rooms.values()]
+        for handle in handles:
+            handle.flush_spectators()
+
+    # ── Internal (must hold self.lock) ────────────────────────────
+
+    def _get_or_create(self, room_id, settings=None, dictionary=DEFAULT, handle=None):
+        """The room, created if needed; a new room takes over the registry reference ``handle``."""
+        room = self.rooms.get(room_id)
+        if room is None:
+            if len(self.rooms) >= self.config.max_rooms:
+                raise RoomFull(room_id)
+            if handle is None:
+                handle = self.registry.acquire(dictionary)  # loaded already: no wait
+            config = room_config(self.config, settings)
+            game = GameState(handle, config=config, scheduler=self.scheduler, analytics=self.analytics)
+            actor = None
+            if self.loops:
+                # Round robin: rooms are long-lived, so this spreads them evenly enough.
+                actor = GameActor(game, self.loops[self._next_loop % len(self.loops)])
+                self._next_loop += 1
+            room = Room(room_id, game, actor, dictionary)
+            self.rooms[room_id] = room
+        return room
+
+    def _new_room_id(self):
+        while True:
+            room_id = "".join(random.choices(_ROOM_ID_ALPHABET, k=5))
+            if room_id not in self.rooms and (self.cluster is None or self.cluster.owns(room_id)):
+                return room_id
+
+    def _collect_idle(self):
+        """Drop rooms nobody has been connected to for room_idle_timeout_seconds."""
+        deadline = time.monotonic() - self.config.room_idle_timeout_seconds
+        idle = [
+            room_id
+            for room_id, room in self.rooms.items()
+            if room.connections == 0 and room.idle_since <= deadline and room_id != self.config.default_room
+        ]
+        for room_id in idle:
+            room = self.rooms.pop(room_id)
+            self.registry.release(room.dictionary)
+
+
+def clean_room_id(value, default):
+    """Validate a client-supplied room id; fall back to default."""
+    if not isinstance(value, str):
+        return default
+    value = value.strip()[:ROOM_ID_MAX_LENGTH]
+    return value or default
@@ -0,0 +1,171 @@
+"""Question sampling: shared weight tables, per-room no-repeat decks.
+
+A SamplerTable says which questions can be drawn and how likely each one
+is. It is built once per (dictionary, sampler, band) and shared by every
+room; an AliasTable makes weighted draws O(1). Each room owns a
+QuestionDeck on top of it, whose only per-room memory is what has already
+been drawn this game.
+
+Samplers (``AppConfig.question_sampler``):
+
+* ``uniform``   every question equally likely;
+* ``frequency`` log-damped word frequency (``<dictionary>.freq.json``,
+  written by build_lexique), so common words come up more often;
+* ``spellings`` number of accepted spellings.
+
+Bands (``AppConfig.question_band``) keep the easiest, middle or hardest
+third of the questions, ranked by measured difficulty when there is some
+(``<dictionary>.difficulty.json``, from analytics.py), then by frequency
+when known, else by spelling count; ``all`` keeps everything.
+"""
+
+import math
+import random
+from array import array
+
+QUESTION_SAMPLERS = ("uniform", "frequency", "spellings")
+QUESTION_BANDS = ("all", "easy", "medium", "hard")
+
+_MAX_REJECTIONS = 64  # weighted no-repeat draws, before rebuilding over what is left
+
+
+class AliasTable:
+    """Vose's alias method: O(n) build, O(1) weighted draw."""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+
+        scaled = [w * n / total for w in weights]
+        self.prob = array("d", [0.0]) * n
+        self.alias = array("I", [0]) * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:  # numerical leftovers
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.prob)
+
+    def draw(self, rng):
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class SamplerTable:
+    """Read-only: the drawable key indices and, if weighted, their weights and alias table."""
+
+    def __init__(self, population, weights=None):
+        self.population = population  # array of key indices into Dictionary.keys
+        self.weights = None if weights is None else array("d", weights)  # per position
+        self.alias = None if weights is None else AliasTable(self.weights)  # None → uniform
+
+    def __len__(self):
+        return len(self.population)
+
+
+def build_sampler_table(dictionary, sampler="uniform", band="all"):
+    """Build the shared table for one (sampler, band) of a Dictionary."""
+    n = len(dictionary)
+    population = array("I", range(n))
+
+    if band != "all":
+        ease = dictionary.frequencies_by_index() or dictionary.spelling_counts()
+        ranked = sorted(range(n), key=lambda i: ease[i], reverse=True)  # easiest first
+        measured = dictionary.difficulties_by_index()
+        if measured is not None:
+            ranked.sort(key=lambda i: measured[i])  # stable: unplayed ties keep the order above
+        third = max(1, n // 3)
+        start = {"easy": 0, "medium": third, "hard": 2 * third}[band]
+        end = n if band == "hard" else start + third
+        population = array("I", sorted(ranked[start:end]))
+
+    if sampler == "uniform":
+        return SamplerTable(population)
+
+    if sampler == "frequency":
+        frequencies = dictionary.frequencies_by_index()
+        if frequencies is None:
+            print("question_sampler 'frequency': no frequency data, weighting by spellings")
+            sampler = "spellings"
+        else:
+            weights = [math.log1p(frequencies[i]) for i in population]
+    if sampler == "spellings":
+        counts = dictionary.spelling_counts()
+        weights = [counts[i] for i in population]
+
+    # Zero-weight questions are never drawn: leave them out of the table, so
+    # the no-repeat deck knows when everything drawable has been drawn.
+    drawable = [(i, w) for i, w in zip(population, weights) if w > 0]
+    if not drawable:
+        return SamplerTable(population)
+    return SamplerTable(array("I", (i for i, _ in drawable)), [w for _, w in drawable])
+
+
+class QuestionDeck:
+    """One room's view of a SamplerTable.
+
+    With no_repeat, a question comes back only once the whole table has been
+    drawn. The uniform deck is a lazy Fisher-Yates shuffle; the weighted one
+    redraws on repeats, and once most of the weight has been drawn it
+    rebuilds an alias table over the questions left, so the end of a cycle
+    keeps the table's weights. Until then the per-room memory is
+    proportional to the questions drawn, not to the dictionary.
+    """
+
+    def __init__(self, table: SamplerTable, no_repeat=True, rng=None):
+        self.table = table
+        self.no_repeat = no_repeat
+        self.rng = rng or random.Random()
+        self.reset()
+
+    def reset(self):
+        """Start a new game: every question is available again."""
+        self._swaps = {}  # lazy Fisher-Yates: position → index it now holds
+        self._remaining = len(self.table)
+        self._drawn = set()  # weighted decks: table positions drawn this cycle
+        self._alias = self.table.alias  # weighted decks: what draw() samples from,
+        self._positions = None  # over these table positions (None → all of them)
+
+    def draw(self):
+        """Index (into Dictionary.keys) of the next question."""
+        table = self.table
+        if table.alias is None:
+            if not self.no_repeat:
+                return table.population[self.rng.randrange(len(table))]
+            if self._remaining == 0:
+                self.reset()
+            j = self.rng.randrange(self._remaining)
+            last = self._remaining - 1
+            picked = self._swaps.get(j, j)
+            self._swaps[j] = self._swaps.pop(last, last)
+            self._remaining -= 1
+            return table.population[picked]
+
+        if not self.no_repeat:
+            return table.population[table.alias.draw(self.rng)]
+        if len(self._drawn) == len(table):
+            self.reset()
+        while True:
+            positions = self._positions
+            for _ in range(_MAX_REJECTIONS):
+                picked = self._alias.draw(self.rng)
+                if positions is not None:
+                    picked = positions[picked]
+                if picked not in self._drawn:
+                    self._drawn.add(picked)
+                    return table.population[picked]
+            # Most of the weight left is already drawn: rebuild over the rest,
+            # O(n) and only a few times per cycle as the rest shrinks.
+            left = range(len(table)) if positions is None else positions
+            rest = array("I", (i for i in left if i not in self._drawn))
+            self._alias = AliasTable([table.weights[i] for i in rest])
+            self._positions = rest
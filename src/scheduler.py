@@ -0,0 +1,187 @@
+"""One timer thread for the whole server.
+
+Bomb fuses, turn transitions and periodic maintenance (typing flushes, room
+collection) are entries in a heap ordered by monotonic deadline, run by a
+single thread. Scheduling costs O(log n), cancelling O(1), and no OS
+thread, however many games are running.
+
+Callbacks run on the scheduler thread and must be short: they take a game
+lock, mutate state and enqueue frames, nothing that waits on the network.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+
+from src import metrics
+
+
+class TimerHandle:
+    """Returned by call_later()/call_every(); cancel() is idempotent."""
+
+    __slots__ = ("when", "callback", "args", "interval", "cancelled")
+
+    def __init__(self, when, callback, args, interval=None):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Heap-based timer queue driven by one daemon thread (time.monotonic)."""
+
+    def __init__(self, name="scheduler"):
+        self._heap = []  # (when, seq, handle)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._name = name
+        self._thread = None
+        self._stopped = False
+        self.max_lag = 0.0  # worst observed delay between deadline and run
+
+    def time(self):
+        return time.monotonic()
+
+    def call_later(self, delay, callback, *args):
+        return self._push(TimerHandle(self.time() + max(0.0, delay), callback, args))
+
+    def call_every(self, interval, callback, *args):
+        return self._push(TimerHandle(self.time() + interval, callback, args, interval))
+
+    def __len__(self):
+        with self._cond:
+            return sum(1 for entry in self._heap if not entry[2].cancelled)
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # ── Internal ──────────────────────────────────────────────────
+
+    def _push(self, handle):
+        with self._cond:
+            heapq.heappush(self._heap, (handle.when, next(self._seq), handle))
+            if self._heap[0][2] is handle:
+                self._cond.notify()
+        self.start()
+        return handle
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    when, _, handle = self._heap[0]
+                    if handle.cancelled:
+                        # Dropped lazily; a cancelled fuse never outlives its deadline.
+                        heapq.heappop(self._heap)
+                        continue
+                    delay = when - self.time()
+                    if delay <= 0:
+                        heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(delay)
+                if self._stopped:
+                    return
+                if handle.interval is not None:
+                    handle.when = max(when + handle.interval, self.time())
+                    heapq.heappush(self._heap, (handle.when, next(self._seq), handle))
+
+            lag = self.time() - when
+            self.max_lag = max(self.max_lag, lag)
+            if metrics.REGISTRY.enabled:
+                metrics.SCHEDULER_LAG_SECONDS.observe(lag)
+            try:
+                handle.callback(*handle.args)
+            except Exception:
+                print(traceback.format_exc())
+
+
+class VirtualScheduler:
+    """Same interface on a simulated clock, for headless games (simulation.py).
+
+    Nothing runs until run(), which jumps from one deadline to the next on
+    the calling thread: a game that lasts minutes takes milliseconds, and
+    with seeded RNGs it plays out the same way every time.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self._heap = []  # (when, seq, handle)
+        self._seq = itertools.count()
+        self.max_lag = 0.0  # never late
+
+    def time(self):
+        return self.now
+
+    def call_later(self, delay, callback, *args):
+        return self._push(TimerHandle(self.now + max(0.0, delay), callback, args))
+
+    def call_every(self, interval, callback, *args):
+        return self._push(TimerHandle(self.now + interval, callback, args, interval))
+
+    def __len__(self):
+        return sum(1 for entry in self._heap if not entry[2].cancelled)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        self._heap.clear()
+
+    def run(self, until=None):
+        """Run callbacks in deadline order until none is left, or up to virtual time ``until``."""
+        heap = self._heap
+        while heap:
+            when, _, handle = heap[0]
+            if handle.cancelled:
+                heapq.heappop(heap)
+                continue
+            if until is not None and when > until:
+                break
+            heapq.heappop(heap)
+            self.now = when
+            if handle.interval is not None:
+                handle.when = when + handle.interval
+                self._push(handle)
+            handle.callback(*handle.args)
+        if until is not None:
+            self.now = max(self.now, until)
+
+    def _push(self, handle):
+        heapq.heappush(self._heap, (handle.when, next(self._seq), handle))
+        return handle
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Process-wide scheduler shared by every room."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Scheduler()
+        return _default
@@ -1,22 +1,81 @@
 /* global React, ReactDOM */
 const { useState, useEffect, useRef, useCallback } = React;
 
+const TYPING_INTERVAL_MS = 50;
+const RECONNECT_DELAY_MS = 1000;
+const SESSION_KEY = "ptb-session";  // {room, token} of our seat, for RESUME
+const CLOCK_SAMPLES = 5;  // CLOCK round trips per sync; the fastest one wins
+const CLOCK_RESYNC_MS = 60000;
+
 // ── WebSocket Hook ───────────────────────────────────────────────
 
-function useWebSocket() {
+// Every message goes through onMessage in arrival order (a state update per
+// message would let React batch several into one render and lose deltas).
+// A dropped socket is reopened after RECONNECT_DELAY_MS. redirect(port)
+// moves to another server process of a cluster (REDIRECT) right away.
+// serverNow() is the server's clock (fuse deadlines), estimated from CLOCK
+// round trips: null until the first reply.
+function useWebSocket(onMessage) {
     const [connected, setConnected] = useState(false);
-    const [lastMsg, setLastMsg] = useState(null);
     const ws = useRef(null);
+    const port = useRef(location.port);
+    const moving = useRef(false);
+    const clock = useRef({ offset: null, rtt: Infinity, samples: 0 });
+    const handler = useRef(onMessage);
+    handler.current = onMessage;
 
     useEffect(() => {
         const proto = location.protocol === "https:" ? "wss" : "ws";
-        ws.current = new WebSocket(`${proto}://${location.host}/ws`);
-
-        ws.current.onopen = () => setConnected(true);
-        ws.current.onclose = () => setConnected(false);
-        ws.current.onmessage = (e) => setLastMsg(JSON.parse(e.data));
-
-        return () => ws.current.close();
+        let retry = null;
+        let unmounted = false;
+
+        const sample = (sock) => sock.send(JSON.stringify({ type: "CLOCK", t0: performance.now() }));
+        const sync = (sock) => {
+            clock.current = { ...clock.current, rtt: Infinity, samples: 0 };
+            sample(sock);
+        };
+        const onClock = (sock, msg) => {
+            // The server read its clock somewhere within the round trip: take
+            // the middle. The fastest round trip leaves the least doubt.
+            const t1 = performance.now();
+            const c = clock.current;
+            if (t1 - msg.t0 <= c.rtt) {
+                c.rtt = t1 - msg.t0;
+                c.offset = msg.server - (msg.t0 + t1) / 2;
+            }
+            if (++c.samples < CLOCK_SAMPLES) sample(sock);
+        };
+
+        const connect = () => {
+            const host = port.current ? `${location.hostname}:${port.current}` : location.hostname;
+            const sock = new WebSocket(`${proto}://${host}/ws`);
+            let resync = null;
+            ws.current = sock;
+            sock.onopen = () => {
+                sync(sock);
+                resync = setInterval(() => sync(sock), CLOCK_RESYNC_MS);  // clocks drift
+                setConnected(true);
+            };
+            sock.onclose = () => {
+                clearInterval(resync);
+                setConnected(false);
+                if (unmounted) return;
+                retry = setTimeout(connect, moving.current ? 0 : RECONNECT_DELAY_MS);
+                moving.current = false;
+            };
+            sock.onmessage = (e) => {
+                const msg = JSON.parse(e.data);
+                if (msg.type === "CLOCK") onClock(sock, msg);
+                else handler.current(msg);
+            };
+        };
+        connect();
+
+        return () => {
+            unmounted = true;
+            clearTimeout(retry);
+            ws.current.close();
+        };
     }, []);
 
     const send = useCallback((obj) => {
@@ -25,18 +84,125 @@ function useWebSocket() {
         }
     }, []);
 
-    return { connected, send, lastMsg };
+    const redirect = useCallback((to) => {
+        port.current = String(to);
+        moving.current = true;
+        ws.current.close();
+    }, []);
+
+    const serverNow = useCallback(() => {
+        const { offset } = clock.current;
+        return offset === null ? null : Math.round(performance.now() + offset);
+    }, []);
+
+    return { connected, send, redirect, serverNow };
+}
+
+// ── Game state deltas ────────────────────────────────────────────
+
+const EMPTY_WORLD = {
+    running: false,
+    players: [],
+    startVotes: [],
+    activePlayer: null,
+    question: "···",
+    previousQuestion: "",
+    previousQuestionAnswers: [],
+    deadline: null,  // when the bomb goes off, server clock (ms); null between turns
+    fuse: null,  // length of the fuse when it was lit (ms)
+};
+
+function fromSnapshot(msg) {
+    return {
+        running: msg.running,
+        players: msg.players,
+        startVotes: msg.startVotes,
+        activePlayer: msg.activePlayer,
+        question: msg.question || "···",
+        previousQuestion: msg.previousQuestion || "",
+        previousQuestionAnswers: msg.previousQuestionAnswers || [],
+        deadline: msg.deadline ?? null,
+        fuse: msg.fuse ?? null,
+    };
+}
+
+function applyDelta(world, msg) {
+    switch (msg.type) {
+        case "PLAYER_JOINED":
+            return { ...world, players: [...world.players, msg.player] };
+        case "PLAYER_LEFT":
+            return {
+                ...world,
+                players: world.players.filter((p) => p.id !== msg.id),
+                startVotes: world.startVotes.filter((id) => id !== msg.id),
+            };
+        case "VOTE":
+            return { ...world, startVotes: [...world.startVotes, msg.id] };
+        case "LIVES":
+            return {
+                ...world,
+                players: world.players.map((p) => (p.id === msg.id ? { ...p, lives: msg.lives } : p)),
+            };
+        case "EXPLODE":
+            return {
+                ...world,
+                players: world.players.map((p) => (p.id === msg.player ? { ...p, lives: msg.lives } : p)),
+                deadline: null,
+            };
+        case "FUSE":
+            return { ...world, deadline: msg.deadline, fuse: msg.fuse };
+        case "NEW_TURN":
+            return {
+                ...world,
+                running: true,
+                startVotes: [],
+                activePlayer: msg.activePlayer,
+                question: msg.question,
+                previousQuestion: world.running ? world.question : "",
+                previousQuestionAnswers: msg.reveal || [],
+                deadline: msg.deadline,
+                fuse: msg.fuse,
+            };
+        case "GAME_OVER":
+            return { ...world, running: false, activePlayer: null, deadline: null };
+        default:
+            return world;
+    }
+}
+
+// Why an answer was refused (near_miss_feedback) and what it cost.
+function invalidText(msg) {
+    let text = "✗ Mot invalide";
+    if (msg.reason === "near") text = "✗ Presque ! Vérifie l'orthographe";
+    else if (msg.reason === "other_sound") text = `✗ Ce mot se prononce /${msg.sound}/`;
+    else if (msg.reason === "unknown") text = "✗ Mot inconnu";
+    if (msg.penalty) text += ` (−${msg.penalty} s)`;
+    return text;
+}
+
+function playerName(world, id) {
+    return world.players.find((p) => p.id === id)?.name ?? "?";
 }
 
 // ── Lobby ────────────────────────────────────────────────────────
 
-function Lobby({ onJoin }) {
+// Why the server would not create or join a room: back to the lobby.
+const ROOM_ERRORS = {
+    too_many_rooms: "Trop de salles ouvertes, réessaie plus tard",
+    unknown_dictionary: "Dictionnaire inconnu",
+    dictionary_unavailable: "Dictionnaire indisponible pour le moment",
+};
+
+function Lobby({ onJoin, rooms, dictionaries, error, onRefreshRooms }) {
     const [name, setName] = useState("");
+    const [room, setRoom] = useState(decodeURIComponent(location.hash.slice(1)) || "main");
+    const [dictionary, setDictionary] = useState("");  // "" → the server's default
 
     const submit = (e) => {
         e.preventDefault();
-        if (name.trim()) onJoin(name.trim());
+        if (name.trim()) onJoin(name.trim(), room.trim() || "main", false, dictionary);
     };
+    const watch = () => onJoin(name.trim(), room.trim() || "main", true, "");
 
     return (
         <div className="card lobby">
@@ -50,22 +216,60 @@ function Lobby({ onJoin }) {
                     onChange={(e) => setName(e.target.value)}
                     autoFocus
                 />
+                <input
+                    type="text"
+                    className="room-input"
+                    placeholder="Salle"
+                    value={room}
+                    maxLength={32}
+                    onChange={(e) => setRoom(e.target.value)}
+                />
+                {dictionaries.length > 0 && (
+                    <select
+                        className="dictionary-select"
+                        title="Seulement pour une nouvelle salle"
+                        value={dictionary}
+                        onChange={(e) => setDictionary(e.target.value)}
+                    >
+                        <option value="">Dictionnaire par défaut</option>
+                        {dictionaries.map((d) => (
+                            <option key={d} value={d}>{d}</option>
+                        ))}
+                    </select>
+                )}
                 <button disabled={!name.trim()}>Rejoindre</button>
+                <button type="button" className="btn-watch" onClick={watch}>Regarder</button>
             </form>
+            {error && <p className="lobby-error">{error}</p>}
+            <div className="room-list">
+                {rooms.map((r) => (
+                    <button
+                        key={r.id}
+                        type="button"
+                        className={`room-tag ${r.id === room ? "selected" : ""}`}
+                        onClick={() => setRoom(r.id)}
+                    >
+                        {r.id} · {r.players} {r.spectators ? `👀 ${r.spectators}` : ""} {r.running ? "▶" : ""}
+                        {r.dictionary && r.dictionary !== "default" ? ` · ${r.dictionary}` : ""}
+                    </button>
+                ))}
+                <button type="button" className="room-tag" onClick={onRefreshRooms}>↻</button>
+            </div>
         </div>
     );
 }
 
 // ── Waiting Room ─────────────────────────────────────────────────
 
-function WaitingRoom({ lobby, myName, onVoteStart }) {
+function WaitingRoom({ lobby, myId, room, spectator, onVoteStart }) {
     const voted = lobby.startVotes || [];
-    const hasVoted = voted.includes(myName);
+    const hasVoted = voted.includes(myId);
     const allVoted = voted.length === lobby.count && lobby.count > 0;
 
     return (
         <div className="card waiting">
             <h2>⏳ En attente de joueurs…</h2>
+            <p className="waiting-room-id">Salle <strong>{room}</strong></p>
             <p className="waiting-hint">La partie commence quand tout le monde a voté</p>
             <div className="waiting-count">
                 {lobby.count} {lobby.count === 1 ? "joueur" : "joueurs"}
@@ -75,7 +279,8 @@ function WaitingRoom({ lobby, myName, onVoteStart }) {
                     <span key={i} className="waiting-tag">{name}</span>
                 ))}
             </div>
-            {lobby.count > 0 && (
+            {spectator && <p className="spectator-badge">👀 Tu regardes cette salle</p>}
+            {lobby.count > 0 && !spectator && (
                 <div className="waiting-vote">
                     <p className="vote-count">{voted.length} / {lobby.count} ont voté</p>
                     <button
@@ -106,31 +311,37 @@ function GameOver({ winner }) {
 
 // ── Game ─────────────────────────────────────────────────────────
 
-function Game({ gameState, myName, onSubmit, onPass, feedback, onTyping, typing }) {
+function Game({ gameState, myId, spectator, serverNow, onSubmit, onPass, feedback, onTyping, typing }) {
     const [answer, setWord] = useState("");
     const inputRef = useRef(null);
     const timerRef = useRef(null);
 
-    const isMyTurn = gameState.activePlayer === myName;
+    const isMyTurn = gameState.activePlayer === myId;
 
     // Reset on new question
     useEffect(() => {
         setWord("");
         if (isMyTurn) inputRef.current?.focus();
+    }, [gameState.question, gameState.activePlayer]);
 
-        if (timerRef.current) {
-            timerRef.current.style.transition = "none";
-            timerRef.current.style.width = "100%";
+    // The fuse burns down to the server's deadline, whatever the latency.
+    // Without a clock estimate yet, assume it was just lit.
+    useEffect(() => {
+        if (!timerRef.current) return;
+        const { deadline, fuse } = gameState;
+        const now = serverNow();
+        const left = deadline === null ? 0 : Math.max(0, now === null ? fuse : deadline - now);
+        timerRef.current.style.transition = "none";
+        timerRef.current.style.width = `${fuse ? Math.min(100, (100 * left) / fuse) : 0}%`;
+        requestAnimationFrame(() => {
             requestAnimationFrame(() => {
-                requestAnimationFrame(() => {
-                    if (timerRef.current) {
-                        timerRef.current.style.transition = "width 25s linear";
-                        timerRef.current.style.width = "0%";
-                    }
-                });
+                if (timerRef.current) {
+                    timerRef.current.style.transition = `width ${left}ms linear`;
+                    timerRef.current.style.width = "0%";
+                }
             });
-        }
-    }, [gameState.question, gameState.activePlayer]);
+        });
+    }, [gameState.deadline, gameState.fuse]);
 
     const submit = (e) => {
         e.preventDefault();
@@ -154,32 +365,42 @@ function Game({ gameState, myName, onSubmit, onPass, feedback, onTyping, typing
         <div className="game-container">
             <div className="game-main">
                 <div className="card game">
+                    <div className="timer-track">
+                        <div className="timer-fill" ref={timerRef} />
+                    </div>
+
                     <div className="turn-info">
                         {isMyTurn
                             ? <span className="your-turn">🎯 C'est ton tour !</span>
-                            : <span className="other-turn">⏳ Tour de <strong>{gameState.activePlayer}</strong></span>
+                            : <span className="other-turn">⏳ Tour de <strong>{gameState.activeName}</strong></span>
                         }
                     </div>
 
                     <div className="question">{gameState.question}</div>
 
-                    <form onSubmit={submit}>
-                        <input
-                            ref={inputRef}
-                            type="text"
-                            value={answer}
-                            onChange={(e) => {
-                                const value = e.target.value;
-                                setWord(value);
-                                if (isMyTurn && onTyping) onTyping(value);
-                            }}
-                            placeholder={isMyTurn ? "Tape un mot…" : "Ce n'est pas ton tour"}
-                            disabled={!isMyTurn}
-                            autoFocus
-                        />
-                        <button disabled={!answer.trim() || !isMyTurn}>Envoyer</button>
-                    </form>
-                    <button onClick={pass} disabled={!isMyTurn}>Pass</button>
+                    {spectator ? (
+                        <p className="spectator-badge">👀 Spectateur</p>
+                    ) : (
+                        <>
+                            <form onSubmit={submit}>
+                                <input
+                                    ref={inputRef}
+                                    type="text"
+                                    value={answer}
+                                    onChange={(e) => {
+                                        const value = e.target.value;
+                                        setWord(value);
+                                        if (isMyTurn && onTyping) onTyping(value);
+                                    }}
+                                    placeholder={isMyTurn ? "Tape un mot…" : "Ce n'est pas ton tour"}
+                                    disabled={!isMyTurn}
+                                    autoFocus
+                                />
+                                <button disabled={!answer.trim() || !isMyTurn}>Envoyer</button>
+                            </form>
+                            <button onClick={pass} disabled={!isMyTurn}>Pass</button>
+                        </>
+                    )}
 
                     {typing?.text && (
                         <div className="typing-indicator">
@@ -193,8 +414,8 @@ function Game({ gameState, myName, onSubmit, onPass, feedback, onTyping, typing
                 </div>
 
                 <div className="players">
-                    {gameState.players.map((p, i) => (
-                        <div key={i} className={`player ${p.name === gameState.activePlayer ? "active" : ""}`}>
+                    {gameState.players.map((p) => (
+                        <div key={p.id} className={`player ${p.id === gameState.activePlayer ? "active" : ""}`}>
                             <div className="name">{p.name}</div>
                             <div className="lives">{"♥".repeat(Math.max(0, p.lives))}</div>
                         </div>
@@ -221,63 +442,162 @@ function Game({ gameState, myName, onSubmit, onPass, feedback, onTyping, typing
 // ── App ──────────────────────────────────────────────────────────
 
 function App() {
-    const { connected, send, lastMsg } = useWebSocket();
-    const [myName, setMyName] = useState("");
+    const [myId, setMyId] = useState(null);
     const [joined, setJoined] = useState(false);
-    const [gameStarted, setGameStarted] = useState(false);
+    const [spectator, setSpectator] = useState(false);
     const [gameOver, setGameOver] = useState(null);
-    const [lobby, setLobby] = useState({ count: 0, players: [] });
-    const [gameState, setGameState] = useState({ question: "···", players: [], activePlayer: "", previousQuestion: "", previousQuestionAnswers: [] });
+    const [world, setWorld] = useState(EMPTY_WORLD);
+    const worldRef = useRef(EMPTY_WORLD);  // latest state, readable inside onMessage
     const [feedback, setFeedback] = useState(null);
     const [typing, setTyping] = useState(null);
+    const [room, setRoom] = useState("");
+    const lastJoin = useRef(null);  // JOIN to replay on reconnect when there is no seat to resume
+    const redirected = useRef(false);  // that JOIN went to the wrong server process: send it again
+    const [rooms, setRooms] = useState([]);
+    const [dictionaries, setDictionaries] = useState([]);
+    const [lobbyError, setLobbyError] = useState(null);
+
+    // Last applied delta; null until the first SNAPSHOT. A gap means we missed
+    // something: ask for a snapshot and drop deltas until it arrives.
+    const seq = useRef(null);
+    const resyncing = useRef(false);
+
+    const onMessage = (msg) => {
+        if (msg.type === "SNAPSHOT") {
+            seq.current = msg.seq;
+            resyncing.current = false;
+            if (msg.you != null) setMyId(msg.you);
+            worldRef.current = fromSnapshot(msg);
+            setWorld(worldRef.current);
+            return;
+        }
 
-    useEffect(() => {
-        if (!lastMsg) return;
-
-        switch (lastMsg.type) {
-            case "LOBBY":
-                setLobby({
-                    count: lastMsg.count,
-                    players: lastMsg.players,
-                    startVotes: lastMsg.startVotes || [],
-                });
+        // Feedback below may name a player this delta removes: keep the old state.
+        const before = worldRef.current;
+        if (msg.seq !== undefined) {
+            if (seq.current === null || resyncing.current || msg.seq <= seq.current) return;
+            if (msg.seq !== seq.current + 1) {
+                resyncing.current = true;
+                send({ type: "RESYNC" });
+                return;
+            }
+            seq.current = msg.seq;
+            worldRef.current = applyDelta(before, msg);
+            setWorld(worldRef.current);
+        }
+
+        switch (msg.type) {
+            case "PING":
+                send({ type: "PONG" });  // heartbeat: we are still here
+                break;
+            case "ROOMS":
+                setRooms(msg.rooms);
+                setDictionaries(msg.dictionaries || []);
+                break;
+            case "ROOM_CREATED":
+                // Created with the chosen dictionary (or it already existed): join it.
+                if (lastJoin.current) {
+                    lastJoin.current.room = msg.room;
+                    send(lastJoin.current);
+                }
+                break;
+            case "ERROR":
+                if (msg.reason in ROOM_ERRORS) {
+                    setLobbyError(ROOM_ERRORS[msg.reason]);
+                    setJoined(false);
+                }
+                break;
+            case "BATCH":
+                // Spectators: everything since the last tick in one frame,
+                // then the latest typing of the current turn.
+                msg.events.forEach(onMessage);
+                if (msg.typing) setTyping(msg.typing);
+                break;
+            case "REDIRECT":
+                // The room lives in another server process: reconnect there.
+                redirected.current = true;
+                redirect(msg.port);
+                break;
+            case "JOINED":
+                redirected.current = false;
+                setRoom(msg.room);
+                setSpectator(!!msg.spectator);
+                if (lastJoin.current) lastJoin.current.room = msg.room;
+                location.hash = encodeURIComponent(msg.room);
+                break;
+            case "WELCOME":
+                sessionStorage.setItem(SESSION_KEY, JSON.stringify({ room: lastJoin.current.room, token: msg.token }));
+                break;
+            case "RESUMED":
+                setMyId(msg.you);
+                break;
+            case "RESUME_FAILED":
+                // Seat gone (grace expired, server restarted): back to the lobby.
+                sessionStorage.removeItem(SESSION_KEY);
+                seq.current = null;
+                worldRef.current = EMPTY_WORLD;
+                setWorld(EMPTY_WORLD);
+                setJoined(false);
                 break;
             case "NEW_TURN":
-                setGameStarted(true);
-                setGameState({
-                    question: lastMsg.question,
-                    players: lastMsg.players,
-                    activePlayer: lastMsg.activePlayer,
-                    previousQuestion: lastMsg.previousQuestion || "",
-                    previousQuestionAnswers: lastMsg.previousQuestionAnswers || [],
-                });
-                setFeedback({
-                    previousAnswers: lastMsg.previousAnswers,
-                });
+                setFeedback(null);
                 setTyping(null);
                 break;
             case "TYPING":
-                setTyping({ player: lastMsg.player, text: lastMsg.text });
+                setTyping({ player: msg.player, text: msg.text });
                 break;
             case "Valid":
-                setFeedback({ cls: "valid", text: `✓ ${lastMsg.anwser}` });
+                setFeedback({ cls: "valid", text: `✓ ${msg.answer}` });
                 break;
             case "Invalid":
-                setFeedback({ cls: "invalid", text: "✗ Mot invalide" });
+                setFeedback({ cls: "invalid", text: invalidText(msg) });
                 break;
-            case "EXPLODE":
+            case "EXPLODE": {
+                const name = playerName(before, msg.player);
                 setFeedback({
                     cls: "explode",
-                    text: lastMsg.eliminated
-                        ? `💥 ${lastMsg.player} éliminé !`
-                        : `💥 ${lastMsg.player} perd une vie !`,
+                    text: msg.eliminated ? `💥 ${name} éliminé !` : `💥 ${name} perd une vie !`,
                 });
                 break;
+            }
             case "GAME_OVER":
-                setGameOver(lastMsg.winner);
+                sessionStorage.removeItem(SESSION_KEY);
+                setGameOver(msg.winner);
                 break;
         }
-    }, [lastMsg]);
+    };
+
+    const { connected, send, redirect, serverNow } = useWebSocket(onMessage);
+
+    // TYPING is throttled to the server's flush rate (typing_flush_hz = 20):
+    // at most one message per tick, always carrying the latest text.
+    const typingText = useRef(null);
+    const typingTimer = useRef(null);
+    const sendTyping = useCallback((text) => {
+        typingText.current = text;
+        if (typingTimer.current) return;
+        typingTimer.current = setTimeout(() => {
+            typingTimer.current = null;
+            send({ type: "TYPING", text: typingText.current });
+        }, TYPING_INTERVAL_MS);
+    }, [send]);
+
+    // On every (re)connection: take our seat back if we have one (the server
+    // replays the deltas after lastSeq), or watch again, or send the JOIN
+    // we were redirected with.
+    useEffect(() => {
+        if (!connected) return;
+        send({ type: "LIST_ROOMS" });
+        const saved = JSON.parse(sessionStorage.getItem(SESSION_KEY) || "null");
+        if (saved) {
+            resyncing.current = false;  // the replay starts right after seq.current
+            send({ type: "RESUME", room: saved.room, token: saved.token, lastSeq: seq.current });
+            setRoom(saved.room);
+            setJoined(true);
+        } else if (lastJoin.current && (lastJoin.current.spectate || redirected.current)) {
+            send(lastJoin.current);
+        }
+    }, [connected]);
 
     // Not connected yet
     if (!connected) {
@@ -296,35 +616,53 @@ function App() {
     // Step 1: Lobby — enter name
     if (!joined) {
         return (
-            <Lobby onJoin={(name) => {
-                setMyName(name);
-                send({ type: "JOIN", name });
-                setJoined(true);
-            }} />
+            <Lobby
+                rooms={rooms}
+                dictionaries={dictionaries}
+                error={lobbyError}
+                onRefreshRooms={() => send({ type: "LIST_ROOMS" })}
+                onJoin={(name, roomId, spectate, dictionary) => {
+                    lastJoin.current = { type: "JOIN", name, room: roomId, spectate };
+                    // A dictionary can only be picked by creating the room; JOIN follows ROOM_CREATED.
+                    send(dictionary ? { type: "CREATE_ROOM", room: roomId, settings: { dictionary } } : lastJoin.current);
+                    setLobbyError(null);
+                    setJoined(true);
+                }}
+            />
         );
     }
 
     // Step 2: Waiting room
-    if (!gameStarted) {
+    if (!world.running) {
+        const lobby = {
+            count: world.players.length,
+            players: world.players.map((p) => p.name),
+            startVotes: world.startVotes,
+        };
         return (
             <WaitingRoom
                 lobby={lobby}
-                myName={myName}
+                myId={myId}
+                room={room}
+                spectator={spectator}
                 onVoteStart={() => send({ type: "VOTE_START" })}
             />
         );
     }
 
     // Step 3: Game
+    const gameState = { ...world, activeName: playerName(world, world.activePlayer) };
     return (
         <Game
             gameState={gameState}
-            myName={myName}
-            onSubmit={(answer) => send({ type: "SUBMIT", answer })}
+            myId={myId}
+            spectator={spectator}
+            serverNow={serverNow}
+            onSubmit={(answer) => send({ type: "SUBMIT", answer, at: serverNow() })}
             onPass={() => send({ type: "PASS" })}
             feedback={feedback}
             typing={typing}
-            onTyping={(text) => send({ type: "TYPING", text })}
+            onTyping={sendTyping}
         />
     );
 }
@@ -1,13 +1,35 @@
 import random
 import unicodedata
+from functools import lru_cache
+
+
+def data_path(filename):
+    """Absolute path of a file in src/data."""
+    import os
+
+    return os.path.join(os.path.dirname(__file__), "data", filename)
 
 
 def load_dictionary_from_file(filename):
-    """Load words from a json file, return a set."""
+    """Load the {ipa: [spellings]} dictionary from src/data.
+
+    Prefers the compiled, memory-mapped ``.ptbd`` artifact next to the JSON
+    file when it is at least as recent; falls back to parsing the JSON.
+    """
     import json
     import os
 
-    filepath = os.path.join(os.path.dirname(__file__), "data", filename)
+    from src.dictionary import COMPILED_SUFFIX, CompiledDictionary, compiled_path_for
+
+    filepath = data_path(filename)
+    if filepath.endswith(COMPILED_SUFFIX):
+        return CompiledDictionary(filepath)
+
+    compiled = compiled_path_for(filepath)
+    if os.path.exists(compiled) and (
+        not os.path.exists(filepath) or os.path.getmtime(compiled) >= os.path.getmtime(filepath)
+    ):
+        return CompiledDictionary(compiled)
 
     with open(filepath, "r", encoding="utf-8") as f:
         d = json.load(f)
@@ -15,8 +37,74 @@ def load_dictionary_from_file(filename):
     return d
 
 
+def load_frequencies_from_file(filename):
+    """Load the {ipa: word frequency} sidecar of a dictionary, or None if absent."""
+    import json
+
+    from src.dictionary import frequencies_path_for
+
+    filepath = frequencies_path_for(data_path(filename))
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_difficulties_from_file(filename):
+    """Load the {ipa: difficulty} sidecar of a dictionary (analytics.py), or None if absent."""
+    import json
+
+    from src.dictionary import difficulty_path_for
+
+    filepath = difficulty_path_for(data_path(filename))
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
 def remove_accents(text):
     """Remove diacritics (é → e, ê → e, …)."""
     nfkd = unicodedata.normalize("NFKD", text)
     return "".join(c for c in nfkd if not unicodedata.combining(c))
 
+
+def _build_accent_table():
+    """Per-character fold table equivalent to remove_accents() on its own."""
+    table = {}
+    for codepoint in range(0x80, 0x2000):
+        char = chr(codepoint)
+        folded = remove_accents(char)
+        if folded != char:
+            table[codepoint] = folded or None
+    return table
+
+
+_ACCENT_TABLE = _build_accent_table()
+
+
+@lru_cache(maxsize=4096)
+def fold_accents(text):
+    """Fast remove_accents(): one str.translate, NFKD only for exotic input."""
+    folded = text.translate(_ACCENT_TABLE)
+    if folded.isascii():
+        return folded
+    return remove_accents(folded)
+
+
+def normalize_answer(text, normalize_spellings=True):
+    """Canonical form used to compare a player's answer with the spellings."""
+    text = text.lower().strip()
+    if normalize_spellings:
+        return fold_accents(text)
+    return text
+
+
+def build_answer_index(spelling_dict, normalize_spellings=True):
+    """Compile {question: [spellings]} into {question: frozenset(normalized)}."""
+    return {
+        question: frozenset(normalize_answer(s, normalize_spellings) for s in spellings)
+        for question, spellings in spelling_dict.items()
+    }
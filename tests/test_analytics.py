@@ -0,0 +1,104 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from dataclasses import replace
+
+from src.analytics import AnalyticsLog, difficulty_scores, question_stats
+from src.config import AppConfig
+from src.dictionary import Dictionary
+from src.game_state import GameState
+from src.sampler import build_sampler_table
+from src.scheduler import Scheduler
+
+SPELLINGS = {"ʁobo": ["robots", "robot"], "vɛʁ": ["vert", "verre"], "maʃwaʁ": ["mâchoire"]}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        self.log = AnalyticsLog(self.path, flush_seconds=60)
+        self.scheduler = Scheduler()
+        config = replace(AppConfig(), turn_transition_delay_seconds=60, wrong_answer_penalty_seconds=0)
+        self.game = GameState(SPELLINGS, config=config, scheduler=self.scheduler, analytics=self.log)
+        self.ws1, self.ws2 = MockWS(), MockWS()
+        self.game.add_player(self.ws1, "A")
+        self.game.add_player(self.ws2, "B")
+
+    def tearDown(self):
+        self.log.stop()
+        self.scheduler.stop()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def events(self):
+        self.log.start()
+        self.log.stop()  # flushes
+        db = sqlite3.connect(self.path)
+        try:
+            return db, [row[2:] for row in db.execute("SELECT * FROM events ORDER BY rowid")]
+        except Exception:
+            db.close()
+            raise
+
+    def test_turn_events(self):
+        with self.game.lock:
+            self.game._start_game()
+        first = self.game.question
+        self.game.submit_answer(self.ws1, "zzz")
+        self.game.submit_answer(self.ws1, SPELLINGS[first][0])
+        second = self.game.question
+        self.game._handle_timeout(self.game.fuse_id)
+
+        db, events = self.events()
+        db.close()
+        self.assertEqual(
+            [(kind, question, player, detail) for kind, question, player, _, detail in events],
+            [
+                ("turn", first, 1, None),
+                ("invalid", first, 1, None),
+                ("valid", first, 1, None),
+                ("turn", second, 2, None),
+                ("explode", second, 2, None),
+            ],
+        )
+        self.assertTrue(all(seconds >= 0 for _, _, _, seconds, _ in events))
+
+    def test_recording_does_no_io(self):
+        with self.game.lock:
+            self.game._start_game()
+        self.assertEqual(len(self.log.buffer), 1)
+        self.assertFalse(os.path.getsize(self.path))
+
+    def test_difficulty_scores(self):
+        for _ in range(4):
+            self.log.record("g", "turn", "ʁobo", 1, 0.0)
+            self.log.record("g", "explode", "ʁobo", 1, 10.0)
+            self.log.record("g", "turn", "vɛʁ", 1, 0.0)
+            self.log.record("g", "valid", "vɛʁ", 1, 2.0)
+        db, _ = self.events()
+        stats = question_stats(db)
+        db.close()
+        self.assertEqual(stats["vɛʁ"]["solveSeconds"], 2.0)
+        scores = difficulty_scores(stats, prior_turns=4)
+        self.assertEqual(scores, {"ʁobo": 0.75, "vɛʁ": 0.25})
+
+        dictionary = Dictionary(SPELLINGS, difficulties=scores)  # maʃwaʁ unplayed: in the middle
+        for band, expected in (("easy", "vɛʁ"), ("medium", "maʃwaʁ"), ("hard", "ʁobo")):
+            table = build_sampler_table(dictionary, band=band)
+            self.assertEqual([dictionary.keys[i] for i in table.population], [expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from jinja2 import Environment, FileSystemLoader
+
+from src.assets import Assets, accepted_encodings
+from src.build_frontend import build, content_name
+
+try:
+    import esbuild_py  # noqa: F401
+    import rjsmin  # noqa: F401
+except ImportError:
+    esbuild_py = None
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "templates")
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.body = b"body { color: red }"
+        self.name = content_name("styles.css", self.body)
+        files = {self.name: self.body, self.name + ".gz": gzip.compress(self.body)}
+        for filename, data in files.items():
+            with open(os.path.join(self.dir, filename), "wb") as f:
+                f.write(data)
+        with open(os.path.join(self.dir, "manifest.json"), "w") as f:
+            json.dump({"styles.css": self.name}, f)
+        self.assets = Assets(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings("gzip, deflate, br;q=0"), {"gzip", "deflate"})
+        self.assertEqual(accepted_encodings(""), set())
+
+    def test_urls(self):
+        self.assertEqual(self.assets.urls(), {"styles.css": "/assets/" + self.name})
+        self.assertIsNone(Assets(os.path.join(self.dir, "missing")).urls())
+
+    def test_page_without_a_build_loads_nothing_remote(self):
+        templates = Environment(loader=FileSystemLoader(TEMPLATES))
+        html = templates.get_template("index.html").render(assets=None)
+        self.assertIn("make frontend", html)
+        self.assertNotIn("<script", html)
+        self.assertNotIn("https://", html)
+
+    def test_precompressed_variant(self):
+        status, body, headers = self.assets.response(self.name, "br, gzip")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")  # no .br was built
+        self.assertEqual(gzip.decompress(body), self.body)
+        self.assertIn("immutable", headers["Cache-Control"])
+
+        status, body, headers = self.assets.response(self.name, "identity")
+        self.assertEqual(body, self.body)
+        self.assertNotIn("Content-Encoding", headers)
+
+    def test_etag(self):
+        _, _, headers = self.assets.response(self.name, "gzip")
+        status, body, _ = self.assets.response(self.name, "gzip", headers["ETag"])
+        self.assertEqual((status, body), (304, b""))
+        status, _, _ = self.assets.response(self.name, "", headers["ETag"])  # other variant
+        self.assertEqual(status, 200)
+
+    def test_unknown_file(self):
+        self.assertIsNone(self.assets.response("manifest.json"))
+        self.assertIsNone(self.assets.response("../app.py"))
+
+
+@unittest.skipIf(esbuild_py is None, "needs requirements-build.txt")
+class TestBuild(unittest.TestCase):
+    def test_build(self):
+        out_dir = tempfile.mkdtemp()
+        try:
+            manifest = build(out_dir=out_dir)
+            self.assertRegex(manifest["app.js"], r"^app\.[0-9a-f]{12}\.js$")
+            with open(os.path.join(out_dir, manifest["app.js"]), "rb") as f:
+                bundle = f.read()
+            self.assertIn(b"React.createElement", bundle)
+            self.assertNotIn(b"<Lobby", bundle)
+            self.assertTrue(os.path.exists(os.path.join(out_dir, manifest["app.js"] + ".gz")))
+        finally:
+            shutil.rmtree(out_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
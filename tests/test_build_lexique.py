@@ -0,0 +1,62 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.build_lexique import build, build_spelling_dict
+
+try:
+    import pandas  # noqa: F401
+except ImportError:
+    pandas = None
+
+# Columns the builder ignores are kept, as in the real Lexique4.tsv.
+TSV = """1_Mot\t2_Lemme\t3_Phono_IPA\t10_FreqMot
+robot\trobot\tʁobo\t12.5
+robots\trobot\tʁobo\t3.25
+vert\tvert\tvɛʁ\t40.0
+ver\tver\tvɛʁ\t0.05
+rare\trare\tʁaʁ\t0.01
+vert\tvert\tvɛʁ\t40.0
+verre\tverre\tvɛʁ\t
+\tvide\tvid\t5.0
+robot\trobot\tʁobo\t7.0
+mâchoire\tmâchoire\tmaʃwaʁ\tn/a
+"""
+
+
+@unittest.skipIf(pandas is None, "needs requirements-build.txt")
+class TestBuildLexique(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.tsv = os.path.join(self.dir, "Lexique4.tsv")
+        with open(self.tsv, "w", encoding="utf-8") as f:
+            f.write(TSV)
+        self.output = os.path.join(self.dir, "dict.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_spelling_dict(self):
+        for chunksize in (2, 50_000):  # pairs split across chunks fold the same way
+            spelling_dict, frequencies = build_spelling_dict(self.tsv, 0.1, chunksize=chunksize)
+            self.assertEqual(spelling_dict, {"ʁobo": ["robot", "robots"], "vɛʁ": ["vert", "ver", "verre"]})
+            self.assertEqual(frequencies, {"ʁobo": 15.75, "vɛʁ": 40.05})  # one frequency per spelling
+
+    def test_skipped_when_up_to_date(self):
+        self.assertIsNotNone(build(self.tsv, self.output, 0.1))
+        mtime = os.path.getmtime(self.output)
+        self.assertIsNone(build(self.tsv, self.output, 0.1))
+        self.assertEqual(os.path.getmtime(self.output), mtime)
+
+        self.assertIsNotNone(build(self.tsv, self.output, 1.0))  # new parameters
+        with open(self.tsv, "a", encoding="utf-8") as f:
+            f.write("robo\trobo\tʁobo\t0.5\n")
+        self.assertIn("robo", build(self.tsv, self.output, 1.0)["ʁobo"])  # new TSV content
+        with open(self.output, encoding="utf-8") as f:
+            self.assertIn("robo", json.load(f)["ʁobo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
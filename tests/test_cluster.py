@@ -0,0 +1,75 @@
+import json
+import unittest
+
+from src.cluster import ClusterWorker, room_owner
+from src.config import AppConfig
+from src.protocol import Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+SPELLINGS = {"ʁobo": ["robot"]}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+def room_on(worker, workers=2):
+    return next(f"R{i}" for i in range(100) if room_owner(f"R{i}", workers) == worker)
+
+
+class TestCluster(unittest.TestCase):
+    def setUp(self):
+        self.config = AppConfig()
+        self.directory = {}  # the launcher shares a manager dict instead
+        self.scheduler = Scheduler()
+        self.managers = []
+        for index in range(2):
+            rooms = RoomManager(SPELLINGS, config=self.config, scheduler=self.scheduler)
+            rooms.cluster = ClusterWorker(index, 2, self.config, self.directory)
+            self.managers.append(rooms)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_every_room_has_one_owner(self):
+        for room_id in ("main", "A", "R1", "R2", "salle"):
+            owners = [rooms.cluster.owns(room_id) for rooms in self.managers]
+            self.assertEqual(owners.count(True), 1)
+
+    def test_join_elsewhere_is_redirected(self):
+        room_id = room_on(1)
+        ws = MockWS()
+        session = Session(ws, self.managers[0], self.config)
+        session.handle_message(json.dumps({"type": "JOIN", "name": "A", "room": room_id}))
+        self.assertEqual(ws.sent, [{"type": "REDIRECT", "room": room_id, "port": self.config.port + 2}])
+        self.assertIsNone(session.game)
+        self.assertEqual(self.managers[0].rooms, {})
+
+        ws = MockWS()
+        Session(ws, self.managers[1], self.config).handle_message(
+            json.dumps({"type": "JOIN", "name": "A", "room": room_id})
+        )
+        self.assertEqual(ws.sent[0]["type"], "JOINED")
+
+    def test_generated_room_ids_are_owned(self):
+        for _ in range(20):
+            room_id = self.managers[1].create_room()
+            self.assertTrue(self.managers[1].cluster.owns(room_id))
+
+    def test_lobby_lists_every_worker(self):
+        self.managers[0].join(room_on(0))
+        self.managers[1].join(room_on(1))
+        for rooms in self.managers:
+            rooms.publish()
+        self.managers[0].publish()  # sees worker 1's rooms from now on
+        ids = {room["id"] for room in self.managers[0].lobby()}
+        self.assertEqual(ids, {room_on(0), room_on(1)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from src.dictionary import CompiledDictionary, compile_dictionary
+from src.utils import build_answer_index
+
+SPELLINGS = {
+    "ʁobo": ["robots", "robot"],
+    "maʃwaʁ": ["mâchoire", "mâchoires"],
+    "table": ["tablez", "tablées", "tablés", "tabler", "tablé", "tablée"],
+}
+
+
+class TestCompiledDictionary(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".ptbd")
+        os.close(fd)
+        compile_dictionary(SPELLINGS, self.path)
+        self.compiled = CompiledDictionary(self.path)
+
+    def tearDown(self):
+        self.compiled.close()
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        self.assertEqual(dict(self.compiled), SPELLINGS)
+        self.assertNotIn("bizaʁ", self.compiled)
+        with self.assertRaises(KeyError):
+            self.compiled["bizaʁ"]
+
+    def test_answer_index_matches_json_path(self):
+        expected = build_answer_index(SPELLINGS)
+        index = self.compiled.answer_index()
+        for key in SPELLINGS:
+            self.assertEqual(index[key], expected[key])
+
+    def test_key_sequence(self):
+        keys = self.compiled.key_sequence()
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(sorted(keys), sorted(SPELLINGS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.dictionary import Dictionary
+from src.dictionary_registry import DictionaryRegistry, DictionaryUnavailable, UnknownDictionary
+from src.protocol import Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+FILES = {
+    "kids": {"ʃa": ["chat"]},
+    "themed": {"vɛʁ": ["vert", "verre"]},
+}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+class TestDictionaryRegistry(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+        config = replace(AppConfig(), dictionaries={"kids": "kids", "themed": "themed", "broken": "broken"})
+        self.registry = DictionaryRegistry(config, default={"ʁobo": ["robot"]}, load=self._load)
+
+    def _load(self, filename):
+        self.loads.append(filename)
+        return Dictionary(FILES[filename])
+
+    def test_loaded_once_and_shared(self):
+        a = self.registry.acquire("kids")
+        b = self.registry.acquire("kids")
+        self.assertIs(a, b)
+        self.assertEqual(self.loads, ["kids"])
+        stats = {d["name"]: d for d in self.registry.stats()}
+        self.assertEqual(stats["kids"]["rooms"], 2)
+        self.assertGreater(stats["kids"]["bytes"], 0)
+        self.assertIsNotNone(stats["kids"]["loadSeconds"])
+
+    def test_lru_eviction_under_budget(self):
+        self.registry.acquire("kids")
+        self.registry.acquire("themed")
+        self.registry.release("kids")
+        self.registry.release("themed")
+        names = {d["name"] for d in self.registry.stats()}
+        self.assertEqual(names, {"default", "kids", "themed"})  # within the default budget
+
+        self.registry.budget_bytes = sum(d["bytes"] for d in self.registry.stats()) - 1
+        self.registry.acquire("themed")
+        self.registry.release("themed")
+        names = {d["name"] for d in self.registry.stats()}
+        self.assertEqual(names, {"default", "themed"})  # kids was the least recently used
+
+        self.registry.budget_bytes = 0
+        self.registry.acquire("themed")
+        self.registry.release("themed")  # themed is now the most recently used
+        self.assertEqual([d["name"] for d in self.registry.stats()], ["default"])
+
+    def test_in_use_is_never_evicted(self):
+        self.registry.budget_bytes = 0
+        handle = self.registry.acquire("kids")
+        self.assertIn("kids", {d["name"] for d in self.registry.stats()})
+        self.assertIs(self.registry.acquire("kids"), handle)
+
+    def test_errors(self):
+        with self.assertRaises(UnknownDictionary):
+            self.registry.acquire("nope")
+        with self.assertRaises(DictionaryUnavailable):
+            self.registry.acquire("broken")
+
+
+class TestRoomsWithDictionaries(unittest.TestCase):
+    def test_room_picks_a_dictionary(self):
+        config = replace(AppConfig(), dictionaries={"kids": "kids"})
+        registry = DictionaryRegistry(config, default={"ʁobo": ["robot"]}, load=lambda f: Dictionary(FILES[f]))
+        rooms = RoomManager(registry, config=config, scheduler=Scheduler())
+        ws = MockWS()
+        session = Session(ws, rooms, config)
+        session.handle_message('{"type": "CREATE_ROOM", "room": "k", "settings": {"dictionary": "kids"}}')
+        session.handle_message('{"type": "CREATE_ROOM", "settings": {"dictionary": "adults"}}')
+        self.assertEqual([m.get("reason") for m in ws.sent], [None, "unknown_dictionary"])
+        session.handle_message('{"type": "LIST_ROOMS"}')
+        self.assertEqual(ws.sent[-1]["dictionaries"], ["kids"])  # for the lobby's picker
+
+        self.assertEqual(list(rooms.rooms["k"].game.spelling_dict_keys), ["ʃa"])
+        self.assertEqual(rooms.list_rooms()[0]["dictionary"], "kids")
+        self.assertEqual({d["name"]: d["rooms"] for d in rooms.dictionary_stats()}, {"default": 0, "kids": 1})
+
+        rooms.rooms["k"].idle_since = float("-inf")
+        rooms.collect_idle()
+        self.assertEqual({d["name"]: d["rooms"] for d in rooms.dictionary_stats()}, {"default": 0, "kids": 0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import json
 import unittest
 
-from backend.game_state import GameState
+from src.game_state import GameState
 
 
 class MockWS:
@@ -38,12 +39,32 @@ class TestGameState(unittest.TestCase):
         self.ws2 = MockWS()
 
     def tearDown(self):
-        if self.game.timer:
-            self.game.timer.cancel()
+        with self.game.lock:
+            self.game._end_game()
 
-    def test_add_player_sends_lobby(self):
+    def test_add_player_sends_snapshot(self):
         self.game.add_player(self.ws1, "Alice")
-        self.assertTrue(any('"LOBBY"' in m for m in self.ws1.sent))
+        self.assertTrue(any('"SNAPSHOT"' in m for m in self.ws1.sent))
+
+    def test_player_lists_after_joins(self):
+        """SNAPSHOT then deltas, applied as app.js does, list each player once."""
+
+        def world(ws):
+            names, seq = None, None
+            for frame in map(json.loads, ws.sent):
+                if frame["type"] == "SNAPSHOT":
+                    names, seq = [p["name"] for p in frame["players"]], frame["seq"]
+                elif "seq" in frame and seq is not None and frame["seq"] > seq:
+                    self.assertEqual(frame["seq"], seq + 1)
+                    seq = frame["seq"]
+                    if frame["type"] == "PLAYER_JOINED":
+                        names.append(frame["player"]["name"])
+            return names
+
+        self.game.add_player(self.ws1, "Alice")
+        self.game.add_player(self.ws2, "Bob")
+        self.assertEqual(world(self.ws1), ["Alice", "Bob"])
+        self.assertEqual(world(self.ws2), ["Alice", "Bob"])
 
     def test_no_start_missing_vote(self):
         self.game.add_player(self.ws1, "A")
@@ -63,8 +84,8 @@ class TestGameState(unittest.TestCase):
         self.game.add_player(self.ws2, "B")
         self.game._start_game()
         
-        self.game.ipa_word = "ʁobo"
-        self.game.spellings = self.game.spelling_dict[self.game.ipa_word]
+        self.game.question = "ʁobo"
+        self.game.answers = self.game.spelling_dict[self.game.question]
 
         # Determine who is active (current_turn=0 → ws1)
         active = self.game.player_order[self.game.current_turn]
@@ -72,11 +93,11 @@ class TestGameState(unittest.TestCase):
 
         # Inactive player submit should be ignored
         inactive.sent.clear()
-        self.game.submit_word(inactive, "robot")
+        self.game.submit_answer(inactive, "robot")
         self.assertFalse(any('"Valid"' in m for m in inactive.sent))
 
         # Active player submit should work
-        self.game.submit_word(active, "robot")
+        self.game.submit_answer(active, "robot")
         self.assertTrue(any('"Valid"' in m for m in active.sent))
 
     def test_turn_advances_after_valid(self):
@@ -86,11 +107,11 @@ class TestGameState(unittest.TestCase):
 
         initial_turn = self.game.current_turn
 
-        self.game.ipa_word = "ʁobo"
-        self.game.spellings = self.game.spelling_dict[self.game.ipa_word]
+        self.game.question = "ʁobo"
+        self.game.answers = self.game.spelling_dict[self.game.question]
         
         active = self.game.player_order[self.game.current_turn]
-        self.game.submit_word(active, "robot")
+        self.game.submit_answer(active, "robot")
 
         self.assertNotEqual(self.game.current_turn, initial_turn)
 
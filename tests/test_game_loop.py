@@ -0,0 +1,111 @@
+import json
+import time
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.game_loop import GameActor, GameLoop
+from src.game_state import GameState
+from src.protocol import Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+SPELLINGS = {"ʁobo": ["robots", "robot"]}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(msg)
+
+    def types(self):
+        return [json.loads(m)["type"] for m in self.sent]
+
+
+class TestGameLoop(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.loop = GameLoop(batch_size=64)
+        config = replace(AppConfig(), latency_grace_seconds=0.0)  # fuses fire at their deadline
+        self.game = GameState(SPELLINGS, config=config, scheduler=self.scheduler)
+        self.actor = GameActor(self.game, self.loop)
+
+    def tearDown(self):
+        with self.game.lock:
+            self.game._end_game()
+        self.scheduler.stop()
+
+    def test_commands_apply_in_order_on_the_loop(self):
+        ws1, ws2 = MockWS(), MockWS()
+        self.actor.add_player(ws1, "A")
+        self.actor.add_player(ws2, "B")
+        self.actor.vote_start(ws1)
+        self.actor.vote_start(ws2)
+        self.assertEqual(self.game.players, {})  # nothing applied yet
+
+        self.assertEqual(self.loop.run_pending(), 4)
+        self.assertTrue(self.game.is_running)
+        self.assertEqual(ws1.types(), ["WELCOME", "SNAPSHOT", "PLAYER_JOINED", "VOTE", "VOTE", "NEW_TURN"])
+
+        self.actor.submit_answer(ws1, "robot")
+        self.loop.run_pending()
+        self.assertEqual(self.game.current_turn, 1)
+
+    def test_timers_post_to_the_loop(self):
+        ws = MockWS()
+        self.actor.add_player(ws, "A")
+        self.actor.vote_start(ws)
+        self.loop.run_pending()
+
+        with self.game.lock:
+            self.game._light_fuse(0.01)
+        time.sleep(0.1)
+        self.assertEqual(self.game.players[ws]["lives"], 3)  # fired, but only queued
+
+        self.loop.run_pending()
+        self.assertEqual(self.game.players[ws]["lives"], 2)
+        self.assertEqual(ws.types()[-1], "EXPLODE")
+
+    def test_batches_alternate_between_rooms(self):
+        loop = GameLoop(batch_size=1)
+        a = GameActor(GameState(SPELLINGS, scheduler=self.scheduler), loop)
+        b = GameActor(GameState(SPELLINGS, scheduler=self.scheduler), loop)
+        order = []
+        for name in ("a1", "a2", "a3"):
+            a.post(order.append, name)
+        b.post(order.append, "b1")
+        loop.run_pending()
+        self.assertEqual(order, ["a1", "b1", "a2", "a3"])
+
+    def test_thread_drains_queue(self):
+        self.loop.start()
+        try:
+            ws = MockWS()
+            self.actor.add_player(ws, "A")
+            deadline = time.monotonic() + 2
+            while not ws.sent and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(ws.types()[0], "WELCOME")
+        finally:
+            self.loop.stop()
+
+
+class TestActorRooms(unittest.TestCase):
+    def test_sessions_post_to_actors(self):
+        config = replace(AppConfig(), game_mode="actor", game_loops=2)
+        rooms = RoomManager(SPELLINGS, config=config, scheduler=Scheduler())
+        ws = MockWS()
+        session = Session(ws, rooms, config)
+        session.handle_message('{"type": "JOIN", "room": "x", "name": "A"}')
+        self.assertIsInstance(session.game, GameActor)
+        self.assertEqual(ws.types(), ["JOINED"])
+        for loop in rooms.loops:
+            loop.run_pending()
+        self.assertEqual(ws.types(), ["JOINED", "WELCOME", "SNAPSHOT"])
+        self.assertEqual(rooms.list_rooms()[0]["players"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
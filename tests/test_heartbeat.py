@@ -0,0 +1,151 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.heartbeat import Heartbeat
+from src.protocol import Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+class Conn:
+    def __init__(self, last_seen):
+        self.ws = MockWS()
+        self.last_seen = last_seen
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+
+class TestHeartbeat(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        config = replace(AppConfig(), heartbeat_interval_seconds=15.0, heartbeat_timeout_seconds=10.0)
+        self.heartbeat = Heartbeat(config, scheduler=None, clock=self.clock)
+
+    def watch(self):
+        conn = Conn(self.clock.now)
+        self.heartbeat.watch(conn, conn.close)
+        return conn
+
+    def advance(self, seconds):
+        self.clock.now += seconds
+        self.heartbeat.sweep()
+
+    def test_silent_connection_pinged_then_closed(self):
+        conn = self.watch()
+        self.advance(14)
+        self.assertEqual(conn.ws.sent, [])
+        self.advance(1)
+        self.assertEqual(conn.ws.sent, [{"type": "PING"}])
+        self.advance(5)
+        self.assertEqual(len(conn.ws.sent), 1)  # one ping per silence
+        self.assertEqual(conn.closed, 0)
+        self.advance(5)
+        self.assertEqual(conn.closed, 1)
+        self.assertEqual(len(self.heartbeat), 0)
+        self.assertEqual(self.heartbeat.reaped, 1)
+        self.advance(30)
+        self.assertEqual(conn.closed, 1)
+
+    def test_activity_postpones_the_deadline(self):
+        conn = self.watch()
+        self.advance(15)
+        self.advance(2)
+        conn.last_seen = self.clock.now  # PONG
+        self.advance(15)
+        self.assertEqual(conn.ws.sent, [{"type": "PING"}, {"type": "PING"}])
+        self.advance(9)
+        conn.last_seen = self.clock.now  # any frame counts
+        self.advance(10)
+        self.assertEqual((len(conn.ws.sent), conn.closed), (2, 0))
+        self.advance(5)
+        self.assertEqual((len(conn.ws.sent), conn.closed), (3, 0))
+        self.advance(10)
+        self.assertEqual(conn.closed, 1)
+
+    def test_forget(self):
+        conn = self.watch()
+        self.heartbeat.forget(conn)
+        self.heartbeat.forget(conn)
+        self.advance(60)
+        self.assertEqual((conn.ws.sent, conn.closed), ([], 0))
+
+    def test_sweep_only_visits_due_slots(self):
+        self.watch()
+        self.advance(3)
+        late = self.watch()
+        self.advance(12)  # the first one is due, the second not yet
+        self.assertEqual(late.ws.sent, [])
+        self.assertEqual(sum(len(slot) for slot in self.heartbeat._slots), 2)
+        self.advance(3)
+        self.assertEqual(late.ws.sent, [{"type": "PING"}])
+
+    def test_disabled(self):
+        heartbeat = Heartbeat(replace(AppConfig(), heartbeat_interval_seconds=0), scheduler=None, clock=self.clock)
+        conn = Conn(self.clock.now)
+        heartbeat.watch(conn, conn.close)
+        self.assertEqual(len(heartbeat), 0)
+
+
+class TestReapedPlayer(unittest.TestCase):
+    def test_reaped_bomb_holder_is_removed_and_the_bomb_moves_on(self):
+        config = replace(AppConfig(), resume_grace_seconds=30)
+        scheduler = Scheduler()
+        rooms = RoomManager({"ʁobo": ["robot"]}, config=config, scheduler=scheduler)
+        clock = Clock()
+        heartbeat = Heartbeat(config, scheduler=None, clock=clock)
+        a, b = Session(MockWS(), rooms, config), Session(MockWS(), rooms, config)
+        for session, name in ((a, "A"), (b, "B")):
+            session.handle_message(json.dumps({"type": "JOIN", "room": "r", "name": name}))
+            session.handle_message('{"type": "VOTE_START"}')
+        game = a.game
+        self.assertIs(game.player_order[game.current_turn], a.ws)  # A holds the bomb
+
+        a.last_seen, b.last_seen = clock.now, clock.now + 60
+        heartbeat.watch(a, a.close)  # as the servers do, the socket's end runs Session.close()
+        clock.now += 15
+        heartbeat.sweep()  # PING, never answered
+        self.assertIn(a.ws, game.players)
+        clock.now += 10
+        heartbeat.sweep()
+
+        self.assertNotIn(a.ws, game.players)
+        self.assertEqual(game.player_order, [b.ws])
+        self.assertEqual(b.ws.sent[-1]["type"], "NEW_TURN")
+        self.assertEqual(b.ws.sent[-1]["activePlayer"], game.players[b.ws]["id"])
+        with game.lock:
+            game._end_game()
+        scheduler.stop()
+
+
+class TestSessionLastSeen(unittest.TestCase):
+    def test_pong_is_accepted_and_counts_as_activity(self):
+        rooms = RoomManager({"ʁobo": ["robot"]}, scheduler=Scheduler())
+        session = Session(MockWS(), rooms, AppConfig())
+        session.last_seen = 0.0
+        self.assertTrue(session.handle_message('{"type": "PONG"}'))
+        self.assertGreater(session.last_seen, 0.0)
+        self.assertEqual(session.ws.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
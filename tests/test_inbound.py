@@ -0,0 +1,119 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src import metrics
+from src.config import AppConfig
+from src.inbound import MALFORMED, RATE_LIMITED, TOO_LARGE, InboundLimiter
+from src.protocol import MESSAGE_TYPES, Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+class TestInboundLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        config = replace(
+            AppConfig(), inbound_max_frame_bytes=256, inbound_rates={"SUBMIT": (2.0, 3.0)}, inbound_max_violations=3
+        )
+        self.limiter = InboundLimiter(config, MESSAGE_TYPES, clock=self.clock)
+
+    def test_rejected_before_decoding(self):
+        self.assertEqual(self.limiter.check('{"type": "PASS"}'), ("PASS", None))
+        self.assertEqual(self.limiter.check('{"type":"TYPING","text":"a"}'), ("TYPING", None))
+        self.assertEqual(self.limiter.check('{"type": "TYPING", "text": "%s"}' % ("a" * 300)), (None, TOO_LARGE))
+        self.assertEqual(self.limiter.check('{"text": "a", "type": "TYPING"}'), (None, MALFORMED))
+        self.assertEqual(self.limiter.check(b'{"type": "PASS"}'), (None, MALFORMED))
+        self.assertEqual(self.limiter.check('{"type": "SHUTDOWN"}'), (None, MALFORMED))
+        self.assertEqual(self.limiter.check("[1, 2"), (None, MALFORMED))
+
+    def test_token_bucket(self):
+        submit = '{"type": "SUBMIT", "answer": "x"}'
+        self.assertEqual([self.limiter.check(submit)[1] for _ in range(4)], [None, None, None, RATE_LIMITED])
+        self.clock.now += 0.5  # one token back
+        self.assertEqual([self.limiter.check(submit)[1] for _ in range(2)], [None, RATE_LIMITED])
+
+    def test_violations_expire(self):
+        self.assertFalse(self.limiter.violation())
+        self.assertFalse(self.limiter.violation())
+        self.clock.now += 11
+        self.assertFalse(self.limiter.violation())
+        self.assertFalse(self.limiter.violation())
+        self.assertTrue(self.limiter.violation())
+
+
+class TestFlooding(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        config = replace(AppConfig(), inbound_max_violations=5)
+        self.rooms = RoomManager({"ʁobo": ["robot"]}, config=config, scheduler=self.scheduler)
+        self.ws = MockWS()
+        self.session = Session(self.ws, self.rooms, config)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_spammer_is_disconnected(self):
+        self.assertTrue(self.session.handle_message('{"type": "JOIN", "room": "r", "name": "A"}'))
+        frames = len(self.ws.sent)
+        sent = 0
+        while self.session.handle_message('{"type": "SUBMIT", "answer": "x"}'):
+            sent += 1
+        self.assertEqual(sent, 10 + 5 - 1)  # the burst, then violations
+        # Dropped frames get no answer, only the final ERROR: nothing to amplify
+        self.assertEqual(self.ws.sent[frames:], [{"type": "ERROR", "reason": "flooding"}])
+
+    def test_slow_frames_are_flagged_for_the_executor(self):
+        self.assertTrue(self.session.may_block('{"type": "CREATE_ROOM", "settings": {"dictionary": "en"}}'))
+        self.assertFalse(self.session.may_block('{"type": "SUBMIT", "answer": "x"}'))
+        self.assertFalse(self.session.may_block('garbage'))
+
+    def test_bad_json_is_a_violation(self):
+        before = metrics.INBOUND_REJECTED.labels(MALFORMED).value
+        self.assertTrue(self.session.handle_message('{"type": "JOIN", oops'))
+        self.assertTrue(self.session.handle_message('{"type": "JOIN"} []'))
+        self.assertEqual(metrics.INBOUND_REJECTED.labels(MALFORMED).value, before + 2)
+        self.assertEqual(self.ws.sent, [])
+
+    def test_fields_must_be_short_strings(self):
+        self.session.handle_message('{"type": "JOIN", "room": "r", "name": "A"}')
+        game = self.session.game
+        with game.lock:
+            game._start_game()
+        frames = len(self.ws.sent)
+        before = metrics.INBOUND_REJECTED.labels(MALFORMED).value
+        self.assertTrue(self.session.handle_message('{"type": "SUBMIT", "answer": 123}'))
+        self.assertTrue(self.session.handle_message(json.dumps({"type": "SUBMIT", "answer": "a" * 65})))
+        self.assertTrue(self.session.handle_message('{"type": "TYPING", "text": ["x"]}'))
+        self.assertEqual(metrics.INBOUND_REJECTED.labels(MALFORMED).value, before + 3)
+        self.assertEqual(len(self.ws.sent), frames)  # never reached the game
+
+        self.session.handle_message(json.dumps({"type": "TYPING", "text": "a" * 500}))
+        self.assertEqual(game.pending_typing, "a" * 64)
+        with game.lock:
+            game._end_game()
+
+    def test_binary_frames_are_violations(self):
+        for _ in range(4):
+            self.assertTrue(self.session.handle_message(b"\x00\x01"))
+        self.assertFalse(self.session.handle_message(b'{"type": "PASS"}'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.game_state import GameState
+from src.protocol import Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler, VirtualScheduler
+
+SPELLINGS = {"ʁobo": ["robot"], "vɛʁ": ["vert"]}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+    def last(self, msg_type):
+        return [m for m in self.sent if m["type"] == msg_type][-1]
+
+
+class TestServerFuse(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = VirtualScheduler(start=100.0)
+        config = replace(
+            AppConfig(),
+            timer_min_seconds=10,
+            timer_max_seconds=10,
+            latency_grace_seconds=0.5,
+            wrong_answer_penalty_seconds=2.0,
+        )
+        self.game = GameState(SPELLINGS, config=config, scheduler=self.scheduler)
+        self.a, self.b = MockWS(), MockWS()
+        self.game.add_player(self.a, "A")
+        self.game.add_player(self.b, "B")
+        with self.game.lock:
+            self.game._start_game()
+
+    def answer(self):
+        return SPELLINGS[self.game.question][0]
+
+    def lives(self, ws):
+        return self.game.players[ws]["lives"]
+
+    def test_new_turn_and_snapshot_carry_the_deadline(self):
+        turn = self.b.last("NEW_TURN")
+        self.assertEqual((turn["deadline"], turn["fuse"]), (110_000, 10_000))
+        self.assertEqual(self.game._snapshot()["deadline"], 110_000)
+
+        self.scheduler.run(until=103.0)
+        self.game.submit_answer(self.a, self.answer())
+        self.assertEqual(self.b.last("NEW_TURN")["deadline"], 110_000)  # same bomb, same fuse
+
+    def test_penalty_moves_the_deadline_for_everyone(self):
+        self.scheduler.run(until=103.0)
+        self.game.submit_answer(self.a, "zzz")
+        self.assertEqual(self.a.last("Invalid")["penalty"], 2.0)
+        fuse = self.b.last("FUSE")
+        self.assertEqual((fuse["deadline"], fuse["fuse"]), (108_000, 5_000))  # relit: full bar again
+
+    def test_explosion_waits_for_the_grace_window(self):
+        self.scheduler.run(until=110.4)
+        self.assertEqual(self.lives(self.a), 3)
+        self.scheduler.run(until=110.5)
+        self.assertEqual(self.lives(self.a), 2)
+        self.assertIsNone(self.game._snapshot()["deadline"])
+
+    def test_late_answer_sent_in_time_counts(self):
+        self.scheduler.run(until=110.3)
+        self.game.submit_answer(self.a, self.answer(), sent_at=109.9)
+        self.assertEqual(self.b.last("Valid")["type"], "Valid")
+        turn = self.b.last("NEW_TURN")
+        self.assertEqual((turn["deadline"], turn["fuse"]), (111_300, 1_000))  # a second, at least
+        self.scheduler.run(until=111.7)
+        self.assertEqual((self.lives(self.a), self.lives(self.b)), (3, 3))
+        self.scheduler.run(until=111.8)
+        self.assertEqual(self.lives(self.b), 2)
+
+    def test_late_answers_that_do_not_count(self):
+        self.scheduler.run(until=110.3)
+        self.game.submit_answer(self.a, self.answer())  # no timestamp
+        self.game.submit_answer(self.a, self.answer(), sent_at=110.1)  # after the deadline
+        self.game.submit_answer(self.a, self.answer(), sent_at=109.7)  # claims more latency than the grace
+        self.game.submit_answer(self.a, "zzz", sent_at=110.0)  # in time, but wrong: no penalty, no new fuse
+        self.game.pass_turn(self.a)
+        self.assertEqual([m["type"] for m in self.b.sent].count("Valid"), 0)
+        self.assertNotIn("penalty", self.a.last("Invalid"))
+        self.scheduler.run(until=110.5)
+        self.assertEqual(self.lives(self.a), 2)
+
+
+class TestClockSync(unittest.TestCase):
+    def test_clock_reply(self):
+        scheduler = Scheduler()
+        session = Session(MockWS(), RoomManager(SPELLINGS, scheduler=scheduler), AppConfig())
+        before = scheduler.time() * 1000
+        session.handle_message('{"type": "CLOCK", "t0": 1234.5}')
+        reply = session.ws.sent[-1]
+        self.assertEqual((reply["type"], reply["t0"]), ("CLOCK", 1234.5))
+        self.assertGreaterEqual(reply["server"], round(before))
+        self.assertLessEqual(reply["server"], round(scheduler.time() * 1000))
+
+        session.handle_message('{"type": "CLOCK", "t0": "x"}')
+        self.assertIsNone(session.ws.sent[-1]["t0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from dataclasses import replace
+
+from src import metrics
+from src.config import AppConfig
+from src.game_state import GameState
+from src.protocol import Session
+from src.rooms import RoomManager
+
+
+class MockWS:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    def send(self, msg):
+        if self.fail:
+            raise ConnectionError("gone")
+        self.sent.append(msg)
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = metrics.Registry()
+
+    def test_histogram_exposition(self):
+        hist = self.registry.histogram("h_seconds", "help", ("type",), buckets=(0.1, 1.0))
+        hist.labels("A").observe(0.05)
+        hist.labels("A").observe(0.5)
+        text = self.registry.render()
+        self.assertIn('h_seconds_bucket{type="A",le="0.1"} 1', text)
+        self.assertIn('h_seconds_bucket{type="A",le="+Inf"} 2', text)
+        self.assertIn('h_seconds_count{type="A"} 2', text)
+
+    def test_scrape_enables_and_idle_disables(self):
+        self.assertFalse(self.registry.enabled)
+        self.registry.render()
+        self.assertTrue(self.registry.enabled)
+        self.registry.idle_seconds = 0
+        self.registry.last_scrape -= 1
+        self.registry.expire()
+        self.assertFalse(self.registry.enabled)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        metrics.REGISTRY.enabled = False
+
+    def _count(self, histogram, *labels):
+        return sum(histogram.labels(*labels).counts)
+
+    def test_nothing_recorded_while_disabled(self):
+        metrics.REGISTRY.enabled = False
+        before = self._count(metrics.LOCK_HOLD_SECONDS)
+        game = GameState({"ʁobo": ["robot"]})
+        game.add_player(MockWS(), "A")
+        self.assertEqual(self._count(metrics.LOCK_HOLD_SECONDS), before)
+
+    def test_lock_broadcast_and_handler(self):
+        metrics.REGISTRY.enabled = True
+        rooms = RoomManager({"ʁobo": ["robot"]})
+        session = Session(MockWS(), rooms, rooms.config)
+        holds = self._count(metrics.LOCK_HOLD_SECONDS)
+        broadcasts = self._count(metrics.BROADCAST_SECONDS)
+        handled = self._count(metrics.HANDLER_SECONDS, "JOIN")
+
+        session.handle_message('{"type": "JOIN", "room": "metrics", "name": "A"}')
+        self.assertGreater(self._count(metrics.LOCK_HOLD_SECONDS), holds)
+        self.assertGreater(self._count(metrics.BROADCAST_SECONDS), broadcasts)
+        self.assertEqual(self._count(metrics.HANDLER_SECONDS, "JOIN"), handled + 1)
+
+        # Unknown types are refused before decoding (inbound.py)
+        rejected = metrics.INBOUND_REJECTED.labels("malformed").value
+        session.handle_message('{"type": "made-up"}')
+        self.assertEqual(metrics.INBOUND_REJECTED.labels("malformed").value, rejected + 1)
+
+    def test_failed_sends_are_counted(self):
+        failed = metrics.BROADCAST_FAILED_SENDS.labels().value
+        game = GameState({"ʁobo": ["robot"]}, config=replace(AppConfig(), resume_grace_seconds=0))
+        game.add_player(MockWS(fail=True), "A")
+        game.add_player(MockWS(), "B")  # PLAYER_JOINED to A fails
+        self.assertEqual(metrics.BROADCAST_FAILED_SENDS.labels().value, failed + 1)
+        self.assertEqual(len(game.players), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
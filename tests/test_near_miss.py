@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.dictionary import Dictionary
+from src.game_state import GameState
+from src.near_miss import (
+    NEAR,
+    OTHER_SOUND,
+    UNKNOWN,
+    NearMissIndex,
+    build_near_miss_index,
+    within_one_edit,
+    write_near_miss_index,
+)
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+SPELLINGS = {
+    "ʁobo": ["robots", "robot"],
+    "vɛʁ": ["vert", "verre", "vers", "ver"],
+    "maʃwaʁ": ["mâchoire", "mâchoires"],
+}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+class TestNearMissIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NearMissIndex(build_near_miss_index(SPELLINGS))
+
+    def test_within_one_edit(self):
+        self.assertTrue(within_one_edit("robot", "robto"))  # transposition
+        self.assertTrue(within_one_edit("robot", "robt"))
+        self.assertTrue(within_one_edit("robot", "rabot"))
+        self.assertFalse(within_one_edit("robot", "rbto"))
+
+    def test_neighbours(self):
+        self.assertEqual(self.index.neighbours("vere"), {"vert", "verre", "vers", "ver"})
+        self.assertEqual(self.index.neighbours("machoir"), {"machoire"})
+
+    def test_classify(self):
+        robot = {"robots", "robot"}
+        self.assertEqual(self.index.classify("robott", robot), (NEAR, "robot"))
+        self.assertEqual(self.index.classify("verre", robot), (OTHER_SOUND, "vɛʁ"))
+        self.assertEqual(self.index.classify("zzz", robot), (UNKNOWN, None))
+
+    def test_file_round_trip(self):
+        fd, path = tempfile.mkstemp(suffix=".near")
+        os.close(fd)
+        try:
+            write_near_miss_index(SPELLINGS, path)
+            index = NearMissIndex.open(path)
+            self.assertEqual(index.sound_of("machoires"), "maʃwaʁ")
+            index.close()
+        finally:
+            os.remove(path)
+
+
+class TestFeedback(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        config = self.game_config()
+        self.dictionary = Dictionary(SPELLINGS)
+        self.dictionary.near_miss_index()  # as RoomManager._prepare does
+        self.game = GameState(self.dictionary, config=config, scheduler=self.scheduler)
+        self.ws = MockWS()
+        self.game.add_player(self.ws, "A")
+        with self.game.lock:
+            self.game._start_game()
+            self.game.question = "ʁobo"
+
+    def game_config(self):
+        return replace(AppConfig(), near_miss_feedback=True, near_miss_free_retries=1, wrong_answer_penalty_seconds=3)
+
+    def tearDown(self):
+        with self.game.lock:
+            self.game._end_game()
+        self.scheduler.stop()
+
+    def test_first_near_miss_is_free(self):
+        self.game.submit_answer(self.ws, "robott")
+        self.assertEqual(self.ws.sent[-1], {"type": "Invalid", "reason": "near"})
+        self.game.submit_answer(self.ws, "robott")
+        self.assertEqual(self.ws.sent[-1], {"type": "Invalid", "reason": "near", "penalty": 3})
+
+    def test_other_sound(self):
+        self.game.submit_answer(self.ws, "Verre")
+        self.assertEqual(self.ws.sent[-1], {"type": "Invalid", "reason": "other_sound", "sound": "vɛʁ", "penalty": 3})
+
+    def test_no_feedback_while_the_index_is_built(self):
+        dictionary = Dictionary(SPELLINGS)
+        with dictionary._near_miss_lock:  # a build in progress
+            game = GameState(dictionary, config=self.game_config(), scheduler=self.scheduler)
+            dictionary.sampler_table()  # not held up by it either
+            ws = MockWS()
+            game.add_player(ws, "A")
+            with game.lock:
+                game._start_game()
+                game.question = "ʁobo"
+            game.submit_answer(ws, "robott")
+            self.assertEqual(ws.sent[-1], {"type": "Invalid", "penalty": 3})
+            with game.lock:
+                game._end_game()
+        dictionary._near_miss_thread.join()
+        self.assertIsNotNone(dictionary.near_miss_index(wait=False))
+
+    def test_prepare_builds_the_folded_answer_index(self):
+        config = replace(self.game_config(), normalize_spellings=False)
+        dictionary = Dictionary(SPELLINGS)
+        RoomManager(dictionary, config=config, scheduler=self.scheduler)._prepare(dictionary)
+        self.assertEqual(set(dictionary._answer_indexes), {False, True})  # none left to build under the game lock
+
+
+if __name__ == "__main__":
+    unittest.main()
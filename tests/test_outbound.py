@@ -0,0 +1,69 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.outbound import OutboundQueue
+
+
+class ManualOutbound(OutboundQueue):
+    """Queue whose writer is the test itself."""
+
+    def _wake(self):
+        pass
+
+
+def frame(msg_type, **fields):
+    return json.dumps({"type": msg_type, **fields})
+
+
+class TestOutboundQueue(unittest.TestCase):
+    def make(self, **overrides):
+        return ManualOutbound(replace(AppConfig(), outbound_queue_frames=3, **overrides))
+
+    def test_send_does_not_block_and_keeps_order(self):
+        q = self.make()
+        q.send(frame("A"))
+        q.send(frame("B"))
+        self.assertEqual(q.take_all(), [frame("A"), frame("B")])
+        self.assertEqual(q.take_all(), [])
+
+    def test_stale_typing_dropped_first(self):
+        q = self.make()
+        q.send(frame("TYPING", text="a"))
+        q.send(frame("NEW_TURN"))
+        q.send(frame("TYPING", text="ab"))
+        q.send(frame("EXPLODE"))
+        self.assertEqual(
+            q.take_all(), [frame("NEW_TURN"), frame("TYPING", text="ab"), frame("EXPLODE")]
+        )
+        self.assertEqual(q.dropped_frames, 1)
+
+    def test_new_typing_dropped_when_only_state_queued(self):
+        q = self.make()
+        for t in "ABC":
+            q.send(frame(t))
+        q.send(frame("TYPING", text="x"))
+        self.assertEqual(len(q.take_all()), 3)
+
+    def test_slow_client_disconnected(self):
+        q = self.make(outbound_max_lag_seconds=0)
+        for t in "ABC":
+            q.send(frame(t))
+        q.send(frame("D"))  # over the bound: lag clock starts
+        with self.assertRaises(ConnectionError):
+            q.send(frame("E"))
+        self.assertTrue(q.closed)
+        with self.assertRaises(ConnectionError):
+            q.send(frame("F"))
+
+    def test_hard_bound(self):
+        q = self.make(outbound_max_lag_seconds=3600)
+        with self.assertRaises(ConnectionError):
+            for i in range(10):
+                q.send(frame("S", i=i))
+        self.assertTrue(q.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
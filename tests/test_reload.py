@@ -0,0 +1,85 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src import admin
+from src.config import AppConfig
+from src.dictionary import Dictionary, DictionaryHandle
+from src.game_state import GameState
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+OLD = {"ʁobo": ["robot"]}
+NEW = {"vɛʁ": ["vert"]}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+class TestDictionaryReload(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.handle = DictionaryHandle(Dictionary(OLD))
+        self.game = GameState(self.handle, scheduler=self.scheduler)
+        self.ws = MockWS()
+        self.game.add_player(self.ws, "A")
+        self.game.vote_start(self.ws)
+
+    def tearDown(self):
+        with self.game.lock:
+            self.game._end_game()
+        self.scheduler.stop()
+
+    def test_turn_in_flight_keeps_the_old_version(self):
+        self.handle.swap(Dictionary(NEW))
+        self.assertEqual(self.game.question, "ʁobo")
+        self.game.submit_answer(self.ws, "robot")  # checked against the old version
+        self.assertEqual(self.ws.sent[-2]["type"], "Valid")
+        self.assertEqual(self.game.question, "vɛʁ")  # next turn: new version
+        self.assertIs(self.game.dictionary, self.handle.current)
+
+    def test_at_most_two_versions(self):
+        self.handle.reload(lambda: Dictionary(NEW)).join()
+        self.assertEqual(self.handle.version, 2)
+        self.assertTrue(self.handle.previous_in_use())  # the game is mid-turn
+        self.assertIsNone(self.handle.reload(lambda: Dictionary(OLD)))
+
+        self.game.submit_answer(self.ws, "robot")
+        self.assertFalse(self.handle.previous_in_use(collect=True))
+        self.assertFalse(self.handle.status()["previousInUse"])
+        self.handle.reload(lambda: Dictionary(OLD)).join()
+        self.assertEqual(self.handle.version, 3)
+
+    def test_failed_load_keeps_current(self):
+        def load():
+            raise FileNotFoundError("nope.json")
+
+        current = self.handle.current
+        self.handle.reload(load).join()
+        self.assertIs(self.handle.current, current)
+        self.assertFalse(self.handle.status()["loading"])
+
+
+class TestRoomsReload(unittest.TestCase):
+    def test_idle_rooms_switch_at_once(self):
+        rooms = RoomManager(OLD, scheduler=Scheduler())
+        rooms.join("x")
+        game = rooms.rooms["x"].game
+        rooms.dictionary.reload(lambda: Dictionary(NEW), on_swap=rooms._refresh_idle_games).join()
+        self.assertIs(game.dictionary, rooms.dictionary.current)
+        self.assertEqual(list(game.spelling_dict_keys), ["vɛʁ"])
+
+    def test_admin_token(self):
+        config = replace(AppConfig(), admin_token="s3cret")
+        self.assertTrue(admin.authorized(config, "Bearer s3cret"))
+        self.assertFalse(admin.authorized(config, "Bearer nope"))
+        self.assertFalse(admin.authorized(AppConfig(), "Bearer "))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.game_state import GameState
+from src.protocol import Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler, VirtualScheduler
+
+SPELLINGS = {"ʁobo": ["robots", "robot"], "vɛʁ": ["vert", "verre"]}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+    def types(self):
+        return [m["type"] for m in self.sent]
+
+
+class TestResume(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.config = replace(AppConfig(), resume_grace_seconds=30, resume_history=8)
+        self.game = GameState(SPELLINGS, config=self.config, scheduler=self.scheduler)
+        self.a, self.b = MockWS(), MockWS()
+        self.game.add_player(self.a, "A")
+        self.game.add_player(self.b, "B")
+        self.token = self.b.sent[0]["token"]
+        self.game.vote_start(self.a)
+        self.game.vote_start(self.b)
+
+    def tearDown(self):
+        with self.game.lock:
+            self.game._end_game()
+        self.scheduler.stop()
+
+    def test_seat_survives_a_drop(self):
+        turn = self.game.current_turn
+        self.game.disconnect_player(self.b)
+        self.assertIn(self.b, self.game.players)
+        last_seq = self.game.seq
+        self.game.submit_answer(self.a, "robot" if self.game.question == "ʁobo" else "vert")
+        sent_to_a = len(self.a.sent)
+
+        new_b = MockWS()
+        self.game.resume(new_b, self.token, last_seq)
+        self.assertEqual(new_b.types(), ["RESUMED", "NEW_TURN"])
+        self.assertEqual(new_b.sent[0]["you"], 2)
+        self.assertEqual(new_b.sent[1]["seq"], self.game.seq)
+        self.assertEqual(self.game.player_order, [self.a, new_b])
+        self.assertEqual(self.game.current_turn, turn)  # B's turn was skipped while away
+        self.assertEqual(len(self.a.sent), sent_to_a)  # nothing rebroadcast
+
+    def test_old_history_falls_back_to_snapshot(self):
+        self.game.disconnect_player(self.b)
+        for _ in range(10):
+            with self.game.lock:
+                self.game._broadcast_state({"type": "VOTE", "id": 1})
+        new_b = MockWS()
+        self.game.resume(new_b, self.token, 1)
+        self.assertEqual(new_b.types(), ["RESUMED", "SNAPSHOT"])
+
+    def test_grace_expiry_frees_the_seat(self):
+        self.game.disconnect_player(self.b)
+        self.game._expire_seat(self.b)
+        self.assertNotIn(self.b, self.game.players)
+        new_b = MockWS()
+        self.game.resume(new_b, self.token, 0)
+        self.assertEqual(new_b.types(), ["RESUME_FAILED"])
+
+    def test_dropped_seat_gets_no_frames(self):
+        self.game.disconnect_player(self.b)
+        sent = len(self.b.sent)
+        with self.game.lock:
+            self.game._broadcast_state({"type": "VOTE", "id": 1})
+        self.assertEqual(len(self.b.sent), sent)
+
+
+class TestHeldSeatsSkipped(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = VirtualScheduler()
+        config = replace(AppConfig(), resume_grace_seconds=30, timer_min_seconds=20, timer_max_seconds=20)
+        self.game = GameState(SPELLINGS, config=config, scheduler=self.scheduler)
+        self.a, self.b, self.c = MockWS(), MockWS(), MockWS()
+        for ws, name in ((self.a, "A"), (self.b, "B"), (self.c, "C")):
+            self.game.add_player(ws, name)
+        with self.game.lock:
+            self.game._start_game()
+
+    def active(self):
+        return self.game.player_order[self.game.current_turn]
+
+    def answer(self):
+        return SPELLINGS[self.game.question][1]
+
+    def test_held_seat_loses_its_turn_until_it_resumes(self):
+        self.game.disconnect_player(self.b)
+        self.game.submit_answer(self.a, self.answer())
+        self.assertIs(self.active(), self.c)
+        self.game.submit_answer(self.c, self.answer())
+        self.assertIs(self.active(), self.a)
+
+        new_b = MockWS()
+        self.game.resume(new_b, self.b.sent[0]["token"], self.game.seq)
+        self.game.submit_answer(self.a, self.answer())
+        self.assertIs(self.active(), new_b)
+
+    def test_dropped_holder_passes_the_bomb(self):
+        self.scheduler.run(until=5.0)
+        self.game.disconnect_player(self.a)
+        self.scheduler.run(until=5.0)
+        self.assertIs(self.active(), self.b)
+        self.assertEqual(self.game.players[self.a]["lives"], 3)
+        self.assertEqual(self.game._fuse()["deadline"], 20_000)  # same bomb, same fuse
+
+
+class TestResumeSession(unittest.TestCase):
+    def test_reconnect_through_sessions(self):
+        config = replace(AppConfig(), resume_grace_seconds=30)
+        scheduler = Scheduler()
+        rooms = RoomManager(SPELLINGS, config=config, scheduler=scheduler)
+        ws = MockWS()
+        session = Session(ws, rooms, config)
+        session.handle_message('{"type": "JOIN", "room": "x", "name": "A"}')
+        token = ws.sent[1]["token"]
+        session.close()
+        self.assertEqual(rooms.list_rooms()[0]["players"], 1)
+
+        ws2 = MockWS()
+        Session(ws2, rooms, config).handle_message(
+            json.dumps({"type": "RESUME", "room": "x", "token": token, "lastSeq": ws.sent[2]["seq"]})
+        )
+        self.assertEqual(ws2.types(), ["RESUMED"])  # the snapshot already had our own join
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
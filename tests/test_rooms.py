@@ -0,0 +1,62 @@
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.rooms import RoomFull, RoomManager, clean_room_id
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(msg)
+
+
+class TestRoomManager(unittest.TestCase):
+    def setUp(self):
+        config = replace(AppConfig(), max_rooms=3, room_idle_timeout_seconds=0)
+        self.rooms = RoomManager({"ʁobo": ["robots", "robot"]}, config=config)
+
+    def test_rooms_are_independent(self):
+        a = self.rooms.join("a")
+        b = self.rooms.join("b")
+        self.assertIsNot(a, b)
+        self.assertIsNot(a.lock, b.lock)
+        self.assertIs(a.answer_index, b.answer_index)
+
+        a.add_player(MockWS(), "Alice")
+        listing = {r["id"]: r["players"] for r in self.rooms.list_rooms()}
+        self.assertEqual(listing["a"], 1)
+        self.assertEqual(listing["b"], 0)
+
+    def test_join_same_room(self):
+        self.assertIs(self.rooms.join("a"), self.rooms.join("a"))
+
+    def test_idle_rooms_are_collected(self):
+        self.rooms.join("a")
+        self.rooms.create_room("b")
+        self.rooms.leave("a")
+        ids = [r["id"] for r in self.rooms.list_rooms()]
+        self.assertEqual(ids, [])
+
+    def test_default_room_is_kept(self):
+        self.rooms.join("main")
+        self.rooms.leave("main")
+        self.assertEqual([r["id"] for r in self.rooms.list_rooms()], ["main"])
+
+    def test_max_rooms(self):
+        for room_id in "abc":
+            self.rooms.join(room_id)
+        with self.assertRaises(RoomFull):
+            self.rooms.join("d")
+
+    def test_clean_room_id(self):
+        self.assertEqual(clean_room_id("  x ", "main"), "x")
+        self.assertEqual(clean_room_id("", "main"), "main")
+        self.assertEqual(clean_room_id(42, "main"), "main")
+        self.assertEqual(len(clean_room_id("x" * 100, "main")), 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+from array import array
+from collections import Counter
+from dataclasses import replace
+
+from src.config import AppConfig, room_config
+from src.dictionary import Dictionary
+from src.game_state import GameState
+from src.sampler import AliasTable, QuestionDeck, SamplerTable
+
+SPELLINGS = {f"k{i}": ["x"] * (i % 4 + 1) for i in range(30)}
+FREQUENCIES = {f"k{i}": float(i) for i in range(30)}
+SPELLINGS_KEYS = list(SPELLINGS)
+
+
+class MockWS:
+    def send(self, msg):
+        pass
+
+
+class TestAliasTable(unittest.TestCase):
+    def test_matches_weights(self):
+        table = AliasTable([1, 0, 3])
+        rng = random.Random(1)
+        counts = Counter(table.draw(rng) for _ in range(20000))
+        self.assertEqual(counts[1], 0)
+        self.assertAlmostEqual(counts[2] / counts[0], 3, delta=0.3)
+
+    def test_rejects_empty_weights(self):
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0])
+
+
+class TestQuestionDeck(unittest.TestCase):
+    def setUp(self):
+        self.dictionary = Dictionary(SPELLINGS, frequencies=FREQUENCIES)
+
+    def test_no_repeat_until_exhausted(self):
+        for sampler in ("uniform", "frequency", "spellings"):
+            deck = QuestionDeck(self.dictionary.sampler_table(sampler), rng=random.Random(2))
+            size = len(deck.table)
+            drawn = [deck.draw() for _ in range(size)]
+            self.assertEqual(sorted(drawn), sorted(deck.table.population))
+            self.assertIn(deck.draw(), drawn)  # next cycle
+
+    def test_weights_hold_until_the_end_of_a_cycle(self):
+        # Once the heavy questions are drawn, the last two still come out 3:1.
+        table = SamplerTable(array("I", range(52)), [1000.0] * 50 + [3.0, 1.0])
+        deck = QuestionDeck(table, rng=random.Random(3))
+        first = Counter()
+        for _ in range(2000):
+            cycle = [deck.draw() for _ in range(len(table))]
+            self.assertEqual(sorted(cycle), list(range(52)))
+            first[min((50, 51), key=cycle.index)] += 1
+        self.assertAlmostEqual(first[50] / 2000, 0.75, delta=0.04)
+
+    def test_tables_are_shared(self):
+        self.assertIs(self.dictionary.sampler_table("frequency"), self.dictionary.sampler_table("frequency"))
+
+    def test_band(self):
+        table = self.dictionary.sampler_table("uniform", "easy")
+        keys = {self.dictionary.keys[i] for i in table.population}
+        self.assertEqual(keys, {f"k{i}" for i in range(20, 30)})
+
+    def test_zero_weight_is_never_drawn(self):
+        table = self.dictionary.sampler_table("frequency")
+        self.assertEqual(len(table), len(SPELLINGS) - 1)
+        self.assertNotIn(SPELLINGS_KEYS.index("k0"), table.population)
+
+    def test_frequency_falls_back_to_spellings(self):
+        table = Dictionary(SPELLINGS).sampler_table("frequency")
+        self.assertIsNotNone(table.alias)
+
+
+class TestRoomSettings(unittest.TestCase):
+    def test_room_config(self):
+        config = room_config(AppConfig(), {"question_band": "hard", "question_sampler": "bogus"})
+        self.assertEqual(config.question_band, "hard")
+        self.assertEqual(config.question_sampler, "uniform")
+
+    def test_game_draws_from_deck(self):
+        config = replace(AppConfig(), question_band="easy")
+        game = GameState(Dictionary(SPELLINGS, frequencies=FREQUENCIES), config=config, rng=random.Random(3))
+        game.add_player(MockWS(), "Alice")
+        game._start_game()
+        seen = {game.question}
+        for _ in range(9):
+            game._start_turn()
+            seen.add(game.question)
+        game._end_game()
+        self.assertEqual(seen, {f"k{i}" for i in range(20, 30)})
+
+
+if __name__ == "__main__":
+    unittest.main()
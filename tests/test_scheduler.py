@@ -0,0 +1,112 @@
+import threading
+import time
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.game_state import GameState
+from src.scheduler import Scheduler, VirtualScheduler
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(msg)
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_runs_in_deadline_order(self):
+        done = threading.Event()
+        calls = []
+        self.scheduler.call_later(0.03, calls.append, "b")
+        self.scheduler.call_later(0.01, calls.append, "a")
+        self.scheduler.call_later(0.05, done.set)
+        self.assertTrue(done.wait(1))
+        self.assertEqual(calls, ["a", "b"])
+
+    def test_cancel(self):
+        done = threading.Event()
+        calls = []
+        handle = self.scheduler.call_later(0.01, calls.append, "x")
+        handle.cancel()
+        self.scheduler.call_later(0.03, done.set)
+        self.assertTrue(done.wait(1))
+        self.assertEqual(calls, [])
+
+    def test_call_every(self):
+        calls = []
+        handle = self.scheduler.call_every(0.01, calls.append, 1)
+        time.sleep(0.1)
+        handle.cancel()
+        self.assertGreaterEqual(len(calls), 3)
+
+    def test_single_thread(self):
+        before = threading.active_count()
+        for _ in range(100):
+            self.scheduler.call_later(10, lambda: None)
+        self.assertLessEqual(threading.active_count(), before + 1)
+
+
+class TestVirtualScheduler(unittest.TestCase):
+    def test_jumps_from_deadline_to_deadline(self):
+        scheduler = VirtualScheduler()
+        calls = []
+        scheduler.call_later(30, lambda: calls.append(("b", scheduler.time())))
+        scheduler.call_later(10, lambda: calls.append(("a", scheduler.time())))
+        scheduler.call_later(20, lambda: None).cancel()
+        scheduler.run()
+        self.assertEqual(calls, [("a", 10), ("b", 30)])
+
+    def test_run_until(self):
+        scheduler = VirtualScheduler()
+        calls = []
+        scheduler.call_every(1, calls.append, 1)
+        scheduler.run(until=5.5)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(scheduler.time(), 5.5)
+
+
+class TestBombFuse(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        config = replace(
+            AppConfig(), timer_min_seconds=1, timer_max_seconds=1, turn_transition_delay_seconds=0
+        )
+        self.game = GameState({"ʁobo": ["robots", "robot"]}, config=config, scheduler=self.scheduler)
+        self.ws1, self.ws2 = MockWS(), MockWS()
+        self.game.add_player(self.ws1, "A")
+        self.game.add_player(self.ws2, "B")
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_fuse_lit_on_start(self):
+        self.game._start_game()
+        self.assertIsNotNone(self.game.timer)
+        self.assertAlmostEqual(self.game.timer_ends_at - self.scheduler.time(), 1, delta=0.1)
+
+    def test_timeout_costs_a_life_and_passes_turn(self):
+        self.game._start_game()
+        self.game._handle_timeout(self.game.fuse_id)
+        self.assertEqual(self.game.players[self.ws1]["lives"], self.game.lives_per_player - 1)
+        self.assertEqual(self.game.current_turn, 1)
+        self.assertTrue(any('"EXPLODE"' in m for m in self.ws2.sent))
+
+    def test_stale_fuse_ignored(self):
+        self.game._start_game()
+        stale = self.game.fuse_id
+        self.game._reduce_timer_by_seconds(0)
+        self.game._handle_timeout(stale)
+        self.assertEqual(self.game.players[self.ws1]["lives"], self.game.lives_per_player)
+
+
+if __name__ == "__main__":
+    unittest.main()
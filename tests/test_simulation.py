@@ -0,0 +1,46 @@
+import unittest
+from dataclasses import replace
+
+from src import simulation
+from src.config import AppConfig
+from src.dictionary import Dictionary
+
+SPELLINGS = {
+    "ʁobo": ["robots", "robot"],
+    "vɛʁ": ["vert", "verre", "vers", "ver"],
+    "maʃwaʁ": ["mâchoire", "mâchoires"],
+}
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        simulation._dictionary = Dictionary(SPELLINGS)
+        self.config = replace(AppConfig(), lives_per_player=2, timer_min_seconds=5, timer_max_seconds=10)
+
+    def tearDown(self):
+        simulation._dictionary = None
+
+    def play(self, profile=simulation.BotProfile(), games=20, seed="s"):
+        return simulation.simulate_games(self.config, profile, 3, seed, 0, games)
+
+    def test_games_play_to_the_end(self):
+        raw = self.play()
+        self.assertEqual(len(raw["turns"]), 20)
+        # Every bot is eliminated in the end: one elimination per life lost twice
+        self.assertEqual(raw["eliminations"], 20 * 3)
+        self.assertEqual(raw["explosions"], 20 * 3 * 2)
+        self.assertEqual(sum(raw["drawn"].values()), sum(raw["turns"]))
+
+    def test_seeded(self):
+        self.assertEqual(self.play(), self.play())
+        self.assertNotEqual(self.play(seed="a")["seconds"], self.play(seed="b")["seconds"])
+
+    def test_skill_makes_games_longer(self):
+        weak = simulation.summarize(self.play(replace(simulation.BotProfile(), skill=0.1)))
+        strong = simulation.summarize(self.play(replace(simulation.BotProfile(), skill=0.9, latency=1.0)))
+        self.assertGreater(strong["solveRate"], weak["solveRate"])
+        self.assertGreater(strong["turns"]["mean"], weak["turns"]["mean"])
+
+
+if __name__ == "__main__":
+    unittest.main()
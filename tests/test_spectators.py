@@ -0,0 +1,110 @@
+import json
+import unittest
+from dataclasses import replace
+
+from src.config import AppConfig
+from src.game_loop import GameActor
+from src.game_state import GameState
+from src.protocol import Session
+from src.rooms import RoomManager
+from src.scheduler import Scheduler
+
+SPELLINGS = {"ʁobo": ["robots", "robot"], "vɛʁ": ["vert", "verre"]}
+
+
+class MockWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+    def types(self):
+        return [m["type"] for m in self.sent]
+
+
+class TestSpectators(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        config = replace(AppConfig(), typing_flush_hz=0)
+        self.game = GameState(SPELLINGS, config=config, scheduler=self.scheduler)
+        self.player = MockWS()
+        self.watcher = MockWS()
+        self.game.add_player(self.player, "A")
+        self.game.add_spectator(self.watcher)
+
+    def tearDown(self):
+        with self.game.lock:
+            self.game._end_game()
+        self.scheduler.stop()
+
+    def test_spectators_are_not_players(self):
+        snapshot = self.watcher.sent[0]
+        self.assertEqual(snapshot["type"], "SNAPSHOT")
+        self.assertIsNone(snapshot["you"])
+        self.assertTrue(snapshot["spectator"])
+        self.assertEqual(self.game.player_order, [self.player])
+
+        self.game.vote_start(self.watcher)
+        self.assertFalse(self.game.is_running)
+
+    def test_events_are_batched(self):
+        self.game.vote_start(self.player)
+        self.game.broadcast_typing(self.player, "ro")
+        self.game.broadcast_typing(self.player, "rob")
+        self.assertEqual(self.watcher.types(), ["SNAPSHOT"])  # nothing until the tick
+
+        self.game.flush_spectators()
+        batch = self.watcher.sent[-1]
+        self.assertEqual(batch["type"], "BATCH")
+        self.assertEqual([e["type"] for e in batch["events"]], ["VOTE", "NEW_TURN"])
+        self.assertEqual([e["seq"] for e in batch["events"]], [2, 3])
+        self.assertEqual(batch["typing"], {"player": 1, "text": "rob"})
+
+        self.game.flush_spectators()  # nothing new: no frame
+        self.assertEqual(len(self.watcher.sent), 2)
+
+    def test_one_frame_shared_by_every_spectator(self):
+        others = [MockWS() for _ in range(3)]
+        for ws in others:
+            self.game.add_spectator(ws)
+        self.game.vote_start(self.player)
+        self.game.flush_spectators()
+        self.assertTrue(all(ws.sent[-1] == self.watcher.sent[-1] for ws in others))
+
+    def test_failed_spectator_is_dropped(self):
+        class DeadWS:
+            def send(self, msg):
+                raise OSError
+
+        dead = DeadWS()
+        self.game.add_spectator(dead)
+        self.game.vote_start(self.player)
+        self.game.flush_spectators()
+        self.assertEqual(self.game.spectators, {self.watcher})
+        self.assertTrue(self.game.is_running)
+
+
+class TestSpectatorSessions(unittest.TestCase):
+    def test_join_as_spectator(self):
+        config = replace(AppConfig(), game_mode="actor")
+        rooms = RoomManager(SPELLINGS, config=config, scheduler=Scheduler())
+        ws = MockWS()
+        session = Session(ws, rooms, config)
+        session.handle_message('{"type": "JOIN", "room": "x", "spectate": true}')
+        session.handle_message('{"type": "VOTE_START"}')
+        for loop in rooms.loops:
+            loop.run_pending()
+        self.assertIsInstance(session.game, GameActor)
+        self.assertEqual(ws.types(), ["JOINED", "SNAPSHOT"])
+        self.assertEqual(rooms.list_rooms()[0]["spectators"], 1)
+        self.assertEqual(rooms.list_rooms()[0]["players"], 0)
+
+        session.close()
+        for loop in rooms.loops:
+            loop.run_pending()
+        self.assertEqual(rooms.list_rooms()[0]["spectators"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from src.utils import build_answer_index, fold_accents, normalize_answer, remove_accents
+
+
+class TestAnswerNormalization(unittest.TestCase):
+    def test_fold_accents_matches_remove_accents(self):
+        for word in ["mâchoire", "agglomération", "noël", "cañon", "œuvre", "m²", "ﬁn", "été"]:
+            self.assertEqual(fold_accents(word), remove_accents(word))
+
+    def test_normalize_answer(self):
+        self.assertEqual(normalize_answer("  Mâchoire "), "machoire")
+        self.assertEqual(normalize_answer("  Mâchoire ", normalize_spellings=False), "mâchoire")
+
+    def test_build_answer_index(self):
+        index = build_answer_index({"maʃwaʁ": ["mâchoire", "mâchoires", "mâchoire"]})
+        self.assertEqual(index["maʃwaʁ"], frozenset({"machoire", "machoires"}))
+
+
+if __name__ == "__main__":
+    unittest.main()